@@ -2,7 +2,7 @@ import os
 import sys
 import logging
 from datetime import datetime
-from flask import Flask, jsonify
+from flask import Flask, jsonify, Response
 from flask_cors import CORS
 
 # 설정 import
@@ -13,6 +13,12 @@ from routes.database import database_bp
 from routes.custom_sql import custom_sql_bp
 from routes.ai_sql import ai_sql_bp
 from routes.task import task_bp  
+from services.registry import init_services
+from services.metrics import init_metrics, render_metrics, CONTENT_TYPE
+from services.tracing import init_tracing
+from services.json_provider import create_json_provider
+from services.compression import init_compression
+from services.admission import init_admission
 
 # 로깅 설정
 logging.basicConfig(
@@ -22,16 +28,38 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def create_app():
-    """Flask 앱 팩토리"""
+def create_app(warmup=False):
+    """Flask 앱 팩토리
+
+    warmup: False (서비스는 첫 사용 시 생성) | True (임베딩 행렬/메타데이터/색인을 미리 적재)
+            | "background" (서버 시작 후 백그라운드 적재, 완료 여부는 /api/v1/ready)
+    """
     app = Flask(__name__)
 
     # 설정
     app.secret_key = app_config.secret_key
 
+    # JSON 직렬화 (orjson 사용 가능 시 orjson, 날짜는 ISO 8601 / Decimal은 문자열)
+    app.json = create_json_provider(app, app_config.json_provider)
+
     # CORS 설정
     CORS(app)
 
+    # 공유 서비스 레지스트리 (임베딩 저장소, 과제 인덱스, HTTP 클라이언트 - 지연 생성)
+    registry = init_services(app, warmup=warmup)
+
+    # 응답 압축 (다른 after_request 훅 이후 마지막에 실행되도록 먼저 등록)
+    init_compression(app)
+
+    # 라우트별 요청 처리 시간 기록 (/metrics)
+    init_metrics(app)
+
+    # 요청별 구간 추적 (Server-Timing 헤더, 느린 요청 로그)
+    init_tracing(app)
+
+    # 외부 호출(ABC Lab, OpenAI, DB) 동시 처리 한도 초과 시 503 + Retry-After
+    init_admission(app)
+
     # Blueprint 등록
     app.register_blueprint(database_bp)
     app.register_blueprint(custom_sql_bp)
@@ -101,12 +129,48 @@ def create_app():
             "timestamp": datetime.now().isoformat()
         })
 
+    # 준비 상태 엔드포인트 (워밍업 중이거나 필수 단계가 실패하면 503)
+    @app.route('/api/v1/ready')
+    def ready():
+        status = registry.warmup_status
+        state = status["state"]
+        if state == "failed":
+            failed = ", ".join(name for name, error in status["errors"].items() if error["required"])
+            message = f"워밍업에 실패했습니다. ({failed}, 재시도 중)"
+        elif state == "degraded":
+            message = f"요청을 처리할 준비가 되었습니다. (외부 연결 재시도 중: {', '.join(status['errors'])})"
+        elif registry.ready:
+            message = "요청을 처리할 준비가 되었습니다."
+        else:
+            message = "워밍업 중입니다."
+        return jsonify({
+            "success": registry.ready,
+            "data": {
+                "ready": registry.ready,
+                "warmup": status
+            },
+            "message": message,
+            "timestamp": datetime.now().isoformat()
+        }), 200 if registry.ready else 503
+
+    # Prometheus 메트릭 (워커 프로세스별 값)
+    @app.route('/metrics')
+    def metrics():
+        return Response(render_metrics(), content_type=CONTENT_TYPE)
+
     return app
 
 
+def warmup_option(value):
+    """APP_WARMUP 설정값 → create_app(warmup=...)"""
+    if value == "background":
+        return "background"
+    return value in ("true", "1", "yes")
+
+
 def main():
     """메인 실행 함수"""
-    app = create_app()
+    app = create_app(warmup=warmup_option(app_config.warmup))
 
     # 개발 환경 체크
     if os.environ.get('WERKZEUG_RUN_MAIN') != 'true':
@@ -120,6 +184,8 @@ def main():
         print("\n📋 API Endpoints:")
         print(f"  • GET    / - 서비스 정보")
         print(f"  • GET    /api/v1/health - 헬스체크")
+        print(f"  • GET    /api/v1/ready - 준비 상태 (워밍업)")
+        print(f"  • GET    /metrics - Prometheus 메트릭")
         print(f"  • POST   /api/v1/database/connect - DB 연결")
         print(f"  • POST   /api/v1/sql/custom/generate - 커스텀 SQL 생성")
         print(f"  • POST   /api/v1/sql/ai/generate - AI SQL 생성")
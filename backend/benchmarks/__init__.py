@@ -0,0 +1,10 @@
+"""백엔드 주요 경로 벤치마크 (합성 데이터, 가짜 DB 커서/임베딩 백엔드 사용)
+
+backend 디렉터리에서 실행한다.
+
+    python -m benchmarks                    # 전체 실행 후 baseline.json과 비교
+    python -m benchmarks --quick            # 작은 크기만
+    python -m benchmarks -k rag             # 이름에 rag가 포함된 항목만
+    python -m benchmarks --save-baseline    # 결과를 기준값으로 저장
+    python -m benchmarks --check            # 기준값 대비 회귀 시 종료 코드 1
+"""
@@ -0,0 +1,63 @@
+import os
+import sys
+import logging
+import argparse
+
+from benchmarks.runner import run, load_baseline, save_baseline, compare, format_result, host_mismatch
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="백엔드 주요 경로 벤치마크")
+    parser.add_argument('-k', dest='name_filter', help="이름에 포함된 항목만 실행")
+    parser.add_argument('--quick', action='store_true', help="항목별 작은 크기만 실행")
+    parser.add_argument('--min-time', type=float, default=1.0, help="항목별 최소 측정 시간(초)")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="기준값 파일 (장비별로 --save-baseline으로 생성)")
+    parser.add_argument('--save-baseline', action='store_true', help="실행 결과를 기준값으로 저장 (기존 항목은 유지)")
+    parser.add_argument('--check', action='store_true', help="기준값 대비 회귀가 있으면 종료 코드 1")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="회귀 판정 비율 (기본 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    # 서비스 INFO 로그가 측정값에 섞이지 않도록
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+
+    from benchmarks.cases import CASES, environment
+
+    print(f"{'항목':<44} {'처리량':>16}  {'중앙값':>13}  {'편차':>6}  {'최대 메모리':>11}")
+    results = run(CASES, quick=args.quick, name_filter=args.name_filter, min_time=args.min_time)
+    if not results:
+        print("실행된 항목이 없습니다.")
+        return 1
+
+    saved = load_baseline(args.baseline)
+    baseline = saved["results"] if saved else {}
+    mismatch = host_mismatch(saved.get("environment"), environment()) if saved else []
+    if mismatch:
+        # 다른 장비의 절대값과 비교하면 장비 차이가 회귀로 보이므로 비교하지 않고, 저장 시에도 덮어쓴다
+        print(f"\n기준값이 다른 장비에서 저장되어 비교하지 않습니다 ({', '.join(mismatch)}). "
+              f"--save-baseline으로 이 장비의 기준값을 저장하세요.")
+        baseline = {}
+    if baseline:
+        print("\n기준값 대비 (baseline.json)")
+        for name, result in results.items():
+            if name in baseline:
+                print(format_result(name, result, baseline[name]))
+
+    if args.save_baseline:
+        save_baseline(args.baseline, {**baseline, **results}, environment())
+        print(f"\n기준값 저장: {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n⚠️ 회귀 ({args.tolerance:.0%} 기준):")
+        for line in regressions:
+            print(f"  - {line}")
+        if args.check:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""벤치마크 항목 정의 (항목별 setup(size) → 측정 함수)"""
+import os
+import atexit
+import shutil
+import tempfile
+from config import rag_config
+from services.sql_service import SQLService
+from services.row_transformer import RowTransformer
+from services.abc_lab_service import ABCLabService
+from services.rag_service import RAGService
+from services.task_service import TaskService
+from services.task_store import FileTaskStore, SQLiteTaskStore
+from benchmarks import data, fakes
+from benchmarks.runner import Case
+
+# 임베딩 차원 (text-embedding-3-small 기본 차원)
+EMBEDDING_DIMENSIONS = 1536
+
+_workdir = tempfile.mkdtemp(prefix="mzn-bench-")
+atexit.register(shutil.rmtree, _workdir, ignore_errors=True)
+
+
+def _workpath(*parts):
+    path = os.path.join(_workdir, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def render_inserts(size):
+    """DB 조회 결과 → INSERT문 문자열 (SQLService.execute_and_generate_inserts)"""
+    rows = data.db_rows(size)
+    colnames = [name for name, _ in data.COLUMNS]
+
+    def run():
+        with fakes.fake_database(rows, colnames):
+            SQLService.execute_and_generate_inserts("SELECT 1", "kmznmst", "tb_cdrcoll_base_info")
+    return run
+
+
+def custom_sql_template(size):
+    """컬럼 수별 커스텀 SQL 템플릿 생성 (SQLService.generate_custom_sql)"""
+    columns = data.wide_columns(size)
+    form = data.custom_sql_form(columns)
+    return lambda: SQLService.generate_custom_sql("kmznmst", "tb_cdrcoll_base_info", columns, form)
+
+
+def custom_rows_python(size):
+    """커스텀 SQL python 방식: 조회 행 → 옵션 적용 INSERT문 (SQLService.generate_custom_rows)
+
+    SQL 템플릿 방식은 같은 변환을 PostgreSQL이 하므로 DB 연결 후 부하 생성기(--engine sql/python)로 비교한다.
+    """
+    form = data.custom_sql_form(data.COLUMNS)
+    transformer = RowTransformer("kmznmst", "tb_cdrcoll_base_info", data.COLUMNS, form)
+    names = [name for name, _ in data.COLUMNS]
+    positions = [names.index(name) for name in transformer.columns]
+    rows = [tuple(row[i] for i in positions) for row in data.db_rows(size)]
+
+    def run():
+        with fakes.fake_database(rows, transformer.columns):
+            SQLService.generate_custom_rows("kmznmst", "tb_cdrcoll_base_info", data.COLUMNS, form)
+    return run
+
+
+def parse_abc_response(size):
+    """ABC Lab 응답(MB) → INSERT문 목록 (ABCLabService.parse_insert_statements)"""
+    text = data.abc_lab_response(size * 1024 * 1024)
+    return lambda: ABCLabService.parse_insert_statements(text)
+
+
+def find_similar_tasks(size):
+    """과제 size개 임베딩 집합에서 유사 과제 Top 5 (RAGService.find_similar_tasks)"""
+    tasks = data.tasks(size)
+    store = fakes.FakeTaskStore(tasks)
+    vectors = data.embeddings([task["task_id"] for task in tasks], EMBEDDING_DIMENSIONS)
+    embedding_service = fakes.embedding_service(vectors, EMBEDDING_DIMENSIONS, _workpath(f"rag-{size}", "x"))
+    task_service = TaskService(embedding_service=embedding_service, store=store)
+    rag = RAGService(embedding_service=embedding_service, task_service=task_service)
+    user_sql = tasks[size // 2]["sql"]
+    return lambda: rag.find_similar_tasks(user_sql, top_k=5, include_sql=False)
+
+
+def _task_service(store):
+    return TaskService(embedding_service=fakes.embedding_service({}, EMBEDDING_DIMENSIONS, _workdir), store=store)
+
+
+def get_all_tasks_files(size):
+    """과제 JSON 파일 size개 전체 조회 (FileTaskStore)"""
+    store = FileTaskStore(os.path.join(_workdir, f"files-{size}"))
+    for task in data.tasks(size):
+        store.insert(task)
+    service = _task_service(store)
+    return lambda: service.get_all_tasks()
+
+
+def get_all_tasks_sqlite(size):
+    """과제 size개 전체 조회 (SQLiteTaskStore)"""
+    store = SQLiteTaskStore(_workpath(f"sqlite-{size}", "tasks.db"))
+    for task in data.tasks(size):
+        store.insert(task)
+    service = _task_service(store)
+    return lambda: service.get_all_tasks()
+
+
+CASES = [
+    Case("sql.render_inserts", (10_000, 100_000, 1_000_000), render_inserts, quick_sizes=(10_000,)),
+    Case("sql.custom_template_columns", (20, 200), custom_sql_template),
+    Case("sql.custom_rows_python", (10_000, 100_000), custom_rows_python, quick_sizes=(10_000,)),
+    Case("abc_lab.parse_response_mb", (2, 8), parse_abc_response, quick_sizes=(2,)),
+    Case("rag.find_similar_tasks", (1_000, 10_000, 100_000), find_similar_tasks, quick_sizes=(1_000,)),
+    Case("tasks.get_all_tasks_files", (10_000,), get_all_tasks_files, quick_sizes=(1_000,)),
+    Case("tasks.get_all_tasks_sqlite", (10_000,), get_all_tasks_sqlite, quick_sizes=(1_000,)),
+]
+
+
+def _cpu_model():
+    """CPU 모델명 (/proc/cpuinfo, 없으면 platform.processor())"""
+    import platform
+    try:
+        with open("/proc/cpuinfo", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def environment():
+    """측정 환경 (기준값과 함께 저장)"""
+    import platform
+    import numpy
+    return {
+        "host": platform.node(),
+        "cpu": _cpu_model(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "embedding_dimensions": EMBEDDING_DIMENSIONS,
+        "rag_prefilter_limit": rag_config.prefilter_limit,
+    }
@@ -0,0 +1,113 @@
+"""벤치마크용 합성 데이터 생성 (고정 시드로 실행마다 같은 데이터)"""
+import random
+import decimal
+from datetime import datetime, timedelta
+import numpy as np
+
+SEED = 20240101
+
+# kmznmst.tb_cdrcoll_base_info 형태의 컬럼 (이름, udt_name)
+COLUMNS = [
+    ("ne_id", "varchar"), ("coll_id", "varchar"), ("coll_seq", "numeric"), ("srvr_id", "varchar"),
+    ("in_dir", "varchar"), ("file_ptrn", "varchar"), ("use_yn", "varchar"), ("coll_cycle", "numeric"),
+    ("rate", "numeric"), ("eff_dt", "timestamp"), ("exp_dt", "timestamp"), ("rmk", "text"),
+]
+
+
+def db_rows(count, distinct=2000):
+    """psycopg2 fetchall() 결과와 같은 튜플 행 (문자열, 정수, Decimal, datetime, NULL, 작은따옴표 포함)
+
+    행 객체는 distinct개를 만들어 반복 참조한다 (1M 행에서도 입력 데이터 메모리는 작게 유지).
+    """
+    rng = random.Random(SEED)
+    base = datetime(2024, 1, 1)
+    pool = []
+    for i in range(min(count, distinct)):
+        pool.append((
+            f"NE{i:06d}",
+            f"COLL_{rng.randint(0, 999):03d}",
+            rng.randint(1, 99),
+            f"SRV{rng.randint(0, 50):02d}",
+            f"/data/cdr/in/{rng.randint(0, 20)}/",
+            "*.dat" if i % 3 else "CDR_'%'_*.dat",
+            "Y" if i % 5 else "N",
+            rng.choice([5, 10, 15, 60]),
+            decimal.Decimal(f"{rng.randint(0, 10000) / 100:.2f}"),
+            base + timedelta(minutes=i),
+            datetime(9999, 12, 31, 23, 59, 59),
+            None if i % 4 else f"비고 {i} - O'Brien 수집",
+        ))
+    return [pool[i % len(pool)] for i in range(count)]
+
+
+def custom_sql_form(columns):
+    """generate_custom_sql 입력 폼 (컬럼별 옵션을 골고루 섞음)"""
+    form = {"where_clause": "ne_id = 'NE000001' AND exp_dt > now()"}
+    for i, (name, column_type) in enumerate(columns):
+        option = ("default", "replace", "now", "user_input")[i % 4]
+        form[f"{name}_option"] = option
+        if option == "replace":
+            form[f"{name}_value1"] = "OLD"
+            form[f"{name}_value2"] = "NEW"
+        elif option == "user_input":
+            form[f"{name}_value"] = "10" if column_type == "numeric" else "VALUE"
+    return form
+
+
+def wide_columns(count):
+    """count개 컬럼 (COLUMNS 타입 순환)"""
+    return [(f"{name}_{i}", column_type) for i in range(count // len(COLUMNS) + 1)
+            for name, column_type in COLUMNS][:count]
+
+
+def abc_lab_response(size_bytes):
+    """ABC Lab 변환 응답 텍스트 (INSERT문 사이에 설명, 빈 줄, 코드 블록 표시 포함)"""
+    rng = random.Random(SEED)
+    lines = ["다음은 변환된 INSERT문입니다.", "```sql"]
+    size = 0
+    i = 0
+    while size < size_bytes:
+        if i % 50 == 0:
+            line = f"-- {i // 50 + 1}번째 테이블"
+        else:
+            line = (f"INSERT INTO kmznmst.tb_cdrcoll_base_info VALUES ('NE{i:06d}', 'COLL_{rng.randint(0, 999):03d}', "
+                    f"{rng.randint(1, 99)}, '/data/cdr/in/{rng.randint(0, 20)}/', '*.dat', 'Y', "
+                    f"DATE('2024-01-01 00:00:00'), DATE('9999-12-31 23:59:59'), NULL);")
+        if i % 17 == 0:
+            line = "  " + line + "  "
+        lines.append(line)
+        size += len(line) + 1
+        i += 1
+    lines += ["```", "변환이 완료되었습니다."]
+    return "\n".join(lines)
+
+
+def tasks(count):
+    """과제 데이터 (SQL 본문 포함, 작성자/등록 시각 분산)"""
+    rng = random.Random(SEED)
+    base = datetime(2023, 1, 1)
+    result = []
+    for i in range(count):
+        table = f"tb_{rng.choice(['cdrsend', 'cdrcoll', 'wflow', 'file_fmt'])}_{rng.randint(0, 200)}"
+        sql = "\n".join(
+            f"INSERT INTO kmznmst.{table} VALUES ('NE{rng.randint(0, 99999):05d}', 'C{j}', {j}, 'Y');"
+            for j in range(rng.randint(3, 12))
+        )
+        created_at = (base + timedelta(minutes=i * 7)).isoformat()
+        result.append({
+            "task_id": f"DR-{2023 + i // 50000}-{i:06d}",
+            "title": f"{table} 이관 과제 {i}",
+            "content": f"NE {i} 수집 설정 변경",
+            "sql": sql,
+            "author": f"user{rng.randint(0, 40)}",
+            "created_at": created_at,
+            "updated_at": created_at,
+        })
+    return result
+
+
+def embeddings(task_ids, dimensions):
+    """정규분포 임베딩 벡터 {task_id: float32 벡터}"""
+    rng = np.random.default_rng(SEED)
+    matrix = rng.standard_normal((len(task_ids), dimensions), dtype=np.float32)
+    return dict(zip(task_ids, matrix))
@@ -0,0 +1,100 @@
+"""벤치마크용 가짜 DB / 과제 저장소 / 임베딩 백엔드 (네트워크, PostgreSQL 없이 실행)"""
+import os
+import zlib
+from contextlib import contextmanager
+import numpy as np
+from services.db_service import DatabaseService
+from services.embedding_service import EmbeddingService, EmbeddingStore
+
+
+class FakeCursor:
+    """psycopg2 커서 대체 (execute 후 준비된 행 반환)"""
+
+    def __init__(self, rows, colnames):
+        self.rows = rows
+        self.description = [(name,) for name in colnames]
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchall(self):
+        return self.rows
+
+
+@contextmanager
+def fake_database(rows, colnames):
+    """DatabaseService.execute_query를 가짜 커서 결과로 대체"""
+    cursor = FakeCursor(rows, colnames)
+    original = DatabaseService.execute_query
+
+    def execute_query(query, params=None):
+        cursor.execute(query, params)
+        return cursor.fetchall(), [desc[0] for desc in cursor.description]
+
+    DatabaseService.execute_query = staticmethod(execute_query)
+    try:
+        yield cursor
+    finally:
+        DatabaseService.execute_query = original
+
+
+class FakeTaskStore:
+    """메모리 과제 저장소 (SQLiteTaskStore와 같은 조회 인터페이스)"""
+
+    def __init__(self, tasks):
+        self.tasks = {task["task_id"]: task for task in tasks}
+        self._ordered = sorted(tasks, key=lambda task: (task["created_at"], task["task_id"]), reverse=True)
+
+    def generation(self):
+        return 0
+
+    def version(self):
+        return 0, 0
+
+    def changes_since(self, generation, until):
+        return []
+
+    def exists(self, task_id):
+        return task_id in self.tasks
+
+    def get(self, task_id):
+        task = self.tasks.get(task_id)
+        return dict(task) if task else None
+
+    def list_tasks(self, include_sql=True):
+        if include_sql:
+            return [dict(task) for task in self._ordered]
+        return [{key: value for key, value in task.items() if key != "sql"} for task in self._ordered]
+
+    def count(self):
+        return len(self.tasks)
+
+
+class FakeEmbeddingBackend:
+    """텍스트 해시로 고정 벡터를 만드는 원격 백엔드 대체 (API 호출 없음)"""
+
+    name = "openai"
+    remote = True
+
+    def __init__(self, dimensions):
+        self.dimensions = dimensions
+
+    def embed(self, text):
+        rng = np.random.default_rng(zlib.crc32(text.encode("utf-8")))
+        return rng.standard_normal(self.dimensions, dtype=np.float32).tolist()
+
+    def embed_batch(self, texts):
+        return [self.embed(text) for text in texts]
+
+
+def embedding_service(vectors, dimensions, workdir):
+    """합성 벡터를 담은 EmbeddingService (임베딩 파일 없이 메모리에서만 사용)"""
+    service = EmbeddingService()
+    backend = FakeEmbeddingBackend(dimensions)
+    service.backends = {backend.name: backend}
+    service.primary = backend.name
+    store = EmbeddingStore(os.path.join(workdir, "embeddings.json"), quantize=service.quantize,
+                           rerank_factor=service.rerank_factor)
+    store.embeddings = vectors
+    service.stores = {backend.name: store}
+    return service
@@ -0,0 +1,205 @@
+"""실행 중인 백엔드 대상 부하 생성기 (고정 동시성, p50/p95/p99 지연 + 처리량)
+
+backend 디렉터리에서 실행한다. 외부 API 없이 측정하려면 먼저 스텁 서버를 띄우고
+백엔드를 ABC_LAB_API_URL / OPENAI_BASE_URL로 스텁에 연결한다 (benchmarks.stubs 참고).
+
+    python -m benchmarks.load recommend -c 8 -d 30
+    python -m benchmarks.load ai_generate --source-ne-id NE000001 --target-ne-id NE999999 -c 4 -n 200
+    python -m benchmarks.load custom_generate recommend -c 16 -d 60 --json results.json
+"""
+import sys
+import json
+import math
+import time
+import argparse
+import threading
+from dataclasses import dataclass, field
+import requests
+
+from benchmarks import data
+
+
+@dataclass
+class Scenario:
+    """부하 시나리오 (body(i)는 i번째 요청 본문)"""
+    name: str
+    method: str
+    path: str
+    body: object
+
+
+@dataclass
+class LoadResult:
+    scenario: str
+    concurrency: int
+    elapsed: float = 0.0
+    latencies: list = field(default_factory=list)
+    statuses: dict = field(default_factory=dict)
+    errors: dict = field(default_factory=dict)
+
+    @property
+    def requests(self):
+        return len(self.latencies)
+
+    @property
+    def failures(self):
+        return sum(count for status, count in self.statuses.items() if not 200 <= status < 300) + sum(self.errors.values())
+
+    def percentile(self, p):
+        """nearest-rank 백분위 지연 (ms)"""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = min(len(ordered), max(1, math.ceil(p / 100 * len(ordered)))) - 1
+        return ordered[index] * 1000
+
+    def summary(self):
+        return {
+            "scenario": self.scenario,
+            "concurrency": self.concurrency,
+            "requests": self.requests,
+            "failures": self.failures,
+            "elapsed_sec": round(self.elapsed, 3),
+            "throughput_rps": round(self.requests / self.elapsed, 2) if self.elapsed else 0.0,
+            "latency_ms": {
+                "p50": round(self.percentile(50), 2),
+                "p95": round(self.percentile(95), 2),
+                "p99": round(self.percentile(99), 2),
+                "max": round(max(self.latencies) * 1000, 2) if self.latencies else 0.0,
+            },
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "errors": self.errors,
+        }
+
+
+def build_scenarios(args):
+    """시나리오 이름 → Scenario"""
+    sample_sqls = [task["sql"] for task in data.tasks(200)]
+    custom_form = {"schema": args.schema, "table_name": args.table, "where_clause": args.where, "engine": args.engine}
+    return {
+        "ai_generate": Scenario(
+            "ai_generate", "POST", "/api/v1/sql/ai/generate",
+            lambda i: {"source_ne_id": args.source_ne_id, "target_ne_id": args.target_ne_id,
+                       "response": args.response, "mode": args.mode},
+        ),
+        "custom_generate": Scenario(
+            "custom_generate", "POST", "/api/v1/sql/custom/generate",
+            lambda i: custom_form,
+        ),
+        "recommend": Scenario(
+            "recommend", "POST", "/api/v1/tasks/recommend",
+            lambda i: {"sql": sample_sqls[i % len(sample_sqls)], "top_k": 5},
+        ),
+    }
+
+
+def run_load(base_url, scenario, concurrency, duration=None, total=None, warmup=0, timeout=300.0):
+    """고정 동시성으로 scenario 실행 (duration초 동안 또는 total건까지)"""
+    result = LoadResult(scenario.name, concurrency)
+    lock = threading.Lock()
+    counter = {"next": 0}
+    url = base_url.rstrip("/") + scenario.path
+
+    def next_index():
+        with lock:
+            index = counter["next"]
+            counter["next"] += 1
+            return index
+
+    def send(session, index):
+        started = time.perf_counter()
+        try:
+            response = session.request(scenario.method, url, json=scenario.body(index), timeout=timeout)
+            response.content  # 본문 수신까지 측정
+            return time.perf_counter() - started, response.status_code, None
+        except requests.RequestException as e:
+            return time.perf_counter() - started, None, type(e).__name__
+
+    with requests.Session() as session:
+        for i in range(warmup):
+            send(session, i)
+
+    deadline = time.perf_counter() + duration if duration else None
+
+    def worker():
+        with requests.Session() as session:
+            while True:
+                if deadline and time.perf_counter() >= deadline:
+                    return
+                index = next_index()
+                if total is not None and index >= total:
+                    return
+                latency, status, error = send(session, index)
+                with lock:
+                    result.latencies.append(latency)
+                    if error:
+                        result.errors[error] = result.errors.get(error, 0) + 1
+                    else:
+                        result.statuses[status] = result.statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def format_summary(summary):
+    latency = summary["latency_ms"]
+    statuses = ", ".join(f"{status}: {count}" for status, count in summary["statuses"].items())
+    errors = ", ".join(f"{name}: {count}" for name, count in summary["errors"].items())
+    lines = [
+        f"[{summary['scenario']}] 동시성 {summary['concurrency']}, {summary['elapsed_sec']:.1f}초",
+        f"  요청 {summary['requests']}건 (실패 {summary['failures']}건), 처리량 {summary['throughput_rps']:.2f} req/s",
+        f"  지연 p50 {latency['p50']:.1f}ms  p95 {latency['p95']:.1f}ms  p99 {latency['p99']:.1f}ms  최대 {latency['max']:.1f}ms",
+        f"  상태 코드 {statuses or '-'}" + (f"  / 연결 오류 {errors}" if errors else ""),
+    ]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load", description="백엔드 부하 생성기")
+    parser.add_argument('scenarios', nargs='+', choices=["ai_generate", "custom_generate", "recommend"],
+                        help="실행할 시나리오 (여러 개면 순서대로 실행)")
+    parser.add_argument('--url', default="http://127.0.0.1:15000", help="백엔드 주소")
+    parser.add_argument('-c', '--concurrency', type=int, default=8, help="동시 요청 수")
+    parser.add_argument('-d', '--duration', type=float, default=None, help="시나리오별 실행 시간(초)")
+    parser.add_argument('-n', '--requests', type=int, default=None, help="시나리오별 요청 수")
+    parser.add_argument('--warmup', type=int, default=3, help="측정 전 준비 요청 수")
+    parser.add_argument('--timeout', type=float, default=300.0, help="요청 타임아웃(초)")
+    parser.add_argument('--json', dest='json_path', help="결과를 JSON 파일로 저장")
+    parser.add_argument('--source-ne-id', default="NE000001", help="ai_generate 기준 NE ID")
+    parser.add_argument('--target-ne-id', default="NE999999", help="ai_generate 신규 NE ID")
+    parser.add_argument('--response', default="lean", choices=["full", "lean"], help="ai_generate 응답 방식")
+    parser.add_argument('--mode', default="full", choices=["full", "diff"], help="ai_generate 생성 방식")
+    parser.add_argument('--schema', default="kmznmst", help="custom_generate 스키마")
+    parser.add_argument('--table', default="tb_cdrcoll_base_info", help="custom_generate 테이블")
+    parser.add_argument('--where', default="", help="custom_generate WHERE 절")
+    parser.add_argument('--engine', default="sql", choices=["sql", "python"], help="custom_generate 생성 방식")
+    args = parser.parse_args()
+
+    if args.duration is None and args.requests is None:
+        args.duration = 30.0
+
+    scenarios = build_scenarios(args)
+    summaries = []
+    for name in args.scenarios:
+        result = run_load(args.url, scenarios[name], args.concurrency, duration=args.duration,
+                          total=args.requests, warmup=args.warmup, timeout=args.timeout)
+        summary = result.summary()
+        summaries.append(summary)
+        print(format_summary(summary))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(summaries, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+
+    return 1 if any(summary["requests"] == 0 for summary in summaries) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""벤치마크 실행 / 측정 / 기준값 비교"""
+import gc
+import json
+import time
+import statistics
+import tracemalloc
+from dataclasses import dataclass
+
+
+@dataclass
+class Case:
+    """벤치마크 항목
+
+    setup(size)은 측정할 함수(인자 없음)를 반환한다. 준비 시간은 측정하지 않는다.
+    """
+    name: str
+    sizes: tuple
+    setup: object
+    quick_sizes: tuple = None
+
+    def instances(self, quick=False):
+        sizes = self.quick_sizes if quick and self.quick_sizes else self.sizes
+        return [(f"{self.name}[{size}]", size) for size in sizes]
+
+
+def measure(func, min_time=1.0, min_rounds=5, max_rounds=200):
+    """실행 시간 측정 (GC 중지, 중앙값 기준) + 별도 1회 실행의 tracemalloc 최대 메모리
+
+    반환: {"ops_per_sec", "median_ms", "stdev_pct", "rounds", "peak_mb"}
+    """
+    func()  # 캐시/지연 생성 준비 실행
+
+    timings = []
+    gc.collect()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        while len(timings) < max_rounds and (len(timings) < min_rounds or time.perf_counter() - started < min_time):
+            t0 = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - t0)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(timings)
+    stdev = statistics.stdev(timings) if len(timings) > 1 else 0.0
+    return {
+        "ops_per_sec": round(1 / median, 3) if median else None,
+        "median_ms": round(median * 1000, 3),
+        "stdev_pct": round(stdev / median * 100, 1) if median else 0.0,
+        "rounds": len(timings),
+        "peak_mb": round(peak / 1024 / 1024, 2),
+    }
+
+
+def run(cases, quick=False, name_filter=None, min_time=1.0, log=print):
+    """선택된 항목 실행 - {항목 이름: 측정 결과}"""
+    results = {}
+    for case in cases:
+        for name, size in case.instances(quick):
+            if name_filter and name_filter not in name:
+                continue
+            func = case.setup(size)
+            results[name] = measure(func, min_time=min_time)
+            del func
+            gc.collect()
+            log(format_result(name, results[name]))
+    return results
+
+
+def format_result(name, result, baseline=None):
+    line = (f"{name:<44} {result['ops_per_sec']:>12,.2f} ops/s  {result['median_ms']:>10.2f} ms"
+            f"  ±{result['stdev_pct']:>4.1f}%  {result['peak_mb']:>8.2f} MB")
+    if baseline:
+        line += f"  ({_change(result['ops_per_sec'], baseline['ops_per_sec']):+.1f}% ops/s"
+        line += f", {_change(result['peak_mb'], baseline['peak_mb']):+.1f}% mem)"
+    return line
+
+
+def _change(value, base):
+    if not base:
+        return 0.0
+    return (value - base) / base * 100
+
+
+def load_baseline(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path, results, environment):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment, "results": results}, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+# 기준값을 비교할 수 있는 같은 장비인지 판단하는 환경 항목
+HOST_KEYS = ("host", "cpu", "cpu_count")
+
+
+def host_mismatch(saved_environment, environment):
+    """기준값 저장 장비와 현재 장비가 다른 항목 목록 (같으면 빈 목록)"""
+    saved_environment = saved_environment or {}
+    return [
+        f"{key} {saved_environment.get(key)!r} → {environment.get(key)!r}"
+        for key in HOST_KEYS if saved_environment.get(key) != environment.get(key)
+    ]
+
+
+def compare(results, baseline, tolerance):
+    """기준값 대비 회귀 항목 목록 (처리량 tolerance 이상 감소 또는 메모리 tolerance 이상 증가)"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        speed = _change(result["ops_per_sec"], base["ops_per_sec"])
+        memory = _change(result["peak_mb"], base["peak_mb"])
+        if speed < -tolerance * 100:
+            regressions.append(f"{name}: 처리량 {speed:+.1f}%")
+        # 1MB 미만은 측정 오차가 크므로 제외
+        if memory > tolerance * 100 and result["peak_mb"] - base["peak_mb"] > 1:
+            regressions.append(f"{name}: 메모리 {memory:+.1f}%")
+    return regressions
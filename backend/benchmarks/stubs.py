@@ -0,0 +1,306 @@
+"""ABC Lab / OpenAI 임베딩 API 로컬 스텁 서버 (부하 테스트용)
+
+backend 디렉터리에서 실행한다. 한 서버가 두 API를 함께 흉내 낸다.
+
+    python -m benchmarks.stubs --port 18080 --abc-latency 2.0 --error-rate 0.05
+
+백엔드는 다음 환경변수로 스텁에 연결한다.
+
+    ABC_LAB_API_URL=http://127.0.0.1:18080/v1/chat-messages
+    OPENAI_BASE_URL=http://127.0.0.1:18080/v1
+
+- POST /v1/chat-messages: ABC Lab 응답 형식 ({"answer": ...}). response_mode=streaming이면 SSE로 나눠 보낸다.
+  변환 요청은 입력 INSERT문의 기존 NE_ID를 신규 NE_ID로 바꿔 코드 블록으로 돌려주고, 검증 요청(inputs.type=verify)은
+  검증 결과 문장을 돌려준다.
+- POST /v1/embeddings: OpenAI 임베딩 응답 형식. 텍스트 해시로 만든 고정 정규화 벡터 (encoding_format=base64 지원).
+- GET /health: 스텁 설정과 처리 건수
+"""
+import sys
+import json
+import time
+import zlib
+import base64
+import random
+import logging
+import argparse
+import threading
+from dataclasses import dataclass, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StubConfig:
+    """스텁 동작 설정 (지연 시간 단위: 초)"""
+    abc_latency: float = 1.0
+    abc_jitter: float = 0.2
+    embedding_latency: float = 0.1
+    embedding_jitter: float = 0.05
+    dimensions: int = 1536
+    # SSE 응답의 조각당 줄 수 / 조각 사이 지연
+    stream_lines: int = 20
+    stream_delay: float = 0.05
+    # 오류 주입: error_rate 비율로 error_status 응답, hang_rate 비율로 hang초 대기 (클라이언트 타임아웃 유도)
+    error_rate: float = 0.0
+    error_status: int = 500
+    hang_rate: float = 0.0
+    hang: float = 600.0
+    seed: int = None
+
+
+class StubState:
+    """요청 경로별 처리 건수와 오류 주입용 난수 (스레드 공유)"""
+
+    def __init__(self, config):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.counts = {}
+        self._lock = threading.Lock()
+
+    def count(self, key):
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def roll(self):
+        with self._lock:
+            return self.random.random()
+
+    def delay(self, latency, jitter):
+        with self._lock:
+            extra = self.random.uniform(-jitter, jitter) if jitter else 0.0
+        return max(0.0, latency + extra)
+
+
+def convert_answer(query):
+    """ABC Lab 변환 응답 생성 (기존 NE_ID → 신규 NE_ID 치환)"""
+    source_ne_id = target_ne_id = None
+    statements = []
+    for line in query.splitlines():
+        line = line.strip()
+        if line.startswith("기존 NE_ID:"):
+            source_ne_id = line.split(":", 1)[1].strip()
+        elif line.startswith("신규 NE_ID:"):
+            target_ne_id = line.split(":", 1)[1].strip()
+        elif line.startswith("INSERT INTO") or line.startswith("UPDATE "):
+            statements.append(line)
+
+    if source_ne_id and target_ne_id:
+        statements = [statement.replace(f"'{source_ne_id}'", f"'{target_ne_id}'") for statement in statements]
+    return "\n".join(["변환된 INSERT문입니다.", "```sql", *statements, "```"])
+
+
+def verify_answer(query):
+    """ABC Lab 검증 응답 생성"""
+    count = sum(1 for line in query.splitlines() if line.strip().startswith("INSERT INTO"))
+    return f"검증 결과: INSERT문 {count}개에서 정합성 오류를 찾지 못했습니다."
+
+
+def embedding_vector(text, dimensions):
+    """텍스트 해시 시드의 정규화 벡터 (같은 텍스트 → 같은 벡터)"""
+    rng = np.random.default_rng(zlib.crc32(text.encode("utf-8")))
+    vector = rng.standard_normal(dimensions, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "mzn-stub/1.0"
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/health":
+            self._send_json(200, {"status": "ok", "config": asdict(self.state.config), "counts": self.state.counts})
+        else:
+            self._send_json(404, {"error": {"message": f"not found: {self.path}"}})
+
+    def do_POST(self):
+        path = self.path.split("?", 1)[0].rstrip("/")
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "invalid json"}})
+            return
+
+        if path.endswith("/chat-messages"):
+            self.state.count("chat-messages")
+            if self._inject_error():
+                return
+            self._chat_messages(payload)
+        elif path.endswith("/embeddings"):
+            self.state.count("embeddings")
+            if self._inject_error():
+                return
+            self._embeddings(payload)
+        else:
+            self._send_json(404, {"error": {"message": f"not found: {self.path}"}})
+
+    def _inject_error(self):
+        """설정 비율에 따라 오류 응답 또는 무응답 대기 (처리했으면 True)"""
+        config = self.state.config
+        roll = self.state.roll()
+        if roll < config.hang_rate:
+            self.state.count("hang")
+            time.sleep(config.hang)
+            self.close_connection = True
+            return True
+        if roll < config.hang_rate + config.error_rate:
+            self.state.count("error")
+            self._send_json(config.error_status, {"code": "stub_error", "message": "injected error", "status": config.error_status})
+            return True
+        return False
+
+    def _chat_messages(self, payload):
+        config = self.state.config
+        query = payload.get("query") or ""
+        inputs = payload.get("inputs") or {}
+        answer = verify_answer(query) if inputs.get("type") == "verify" else convert_answer(query)
+        message_id = f"stub-{time.time_ns()}"
+
+        if payload.get("response_mode") == "streaming":
+            self._stream_answer(answer, message_id, payload)
+            return
+
+        time.sleep(self.state.delay(config.abc_latency, config.abc_jitter))
+        self._send_json(200, {
+            "event": "message",
+            "message_id": message_id,
+            "conversation_id": payload.get("conversation_id") or message_id,
+            "mode": "chat",
+            "answer": answer,
+            "metadata": {"usage": {"prompt_tokens": len(query) // 4, "completion_tokens": len(answer) // 4}},
+            "created_at": int(time.time()),
+        })
+
+    def _stream_answer(self, answer, message_id, payload):
+        """SSE 응답 (첫 조각까지 abc_latency, 이후 조각마다 stream_delay)"""
+        config = self.state.config
+        time.sleep(self.state.delay(config.abc_latency, config.abc_jitter))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        conversation_id = payload.get("conversation_id") or message_id
+        lines = answer.split("\n")
+        step = max(1, config.stream_lines)
+        try:
+            for start in range(0, len(lines), step):
+                chunk = "\n".join(lines[start:start + step])
+                if start + step < len(lines):
+                    chunk += "\n"
+                self._send_event({"event": "message", "message_id": message_id,
+                                  "conversation_id": conversation_id, "answer": chunk})
+                time.sleep(config.stream_delay)
+            self._send_event({"event": "message_end", "message_id": message_id,
+                              "conversation_id": conversation_id, "metadata": {}})
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _send_event(self, event):
+        self.wfile.write(b"data: " + json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n\n")
+        self.wfile.flush()
+
+    def _embeddings(self, payload):
+        config = self.state.config
+        texts = payload.get("input")
+        if isinstance(texts, str):
+            texts = [texts]
+        if not texts:
+            self._send_json(400, {"error": {"message": "input is required"}})
+            return
+
+        dimensions = int(payload.get("dimensions") or config.dimensions)
+        as_base64 = payload.get("encoding_format") == "base64"
+        data = []
+        for index, text in enumerate(texts):
+            vector = embedding_vector(str(text), dimensions)
+            embedding = base64.b64encode(vector.tobytes()).decode("ascii") if as_base64 else vector.tolist()
+            data.append({"object": "embedding", "index": index, "embedding": embedding})
+
+        time.sleep(self.state.delay(config.embedding_latency, config.embedding_jitter))
+        tokens = sum(len(str(text)) // 4 for text in texts)
+        self._send_json(200, {
+            "object": "list",
+            "data": data,
+            "model": payload.get("model", "text-embedding-3-small"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        })
+
+    def _send_json(self, status, body):
+        encoded = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(encoded)))
+            self.end_headers()
+            self.wfile.write(encoded)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # 부하 테스트 동시 연결 수 대비
+    request_queue_size = 256
+
+    def __init__(self, address, config):
+        super().__init__(address, StubHandler)
+        self.state = StubState(config)
+
+
+def main():
+    defaults = StubConfig()
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.stubs", description="ABC Lab / OpenAI 임베딩 API 로컬 스텁")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=18080)
+    parser.add_argument('--abc-latency', type=float, default=defaults.abc_latency, help="ABC Lab 응답 지연(초)")
+    parser.add_argument('--abc-jitter', type=float, default=defaults.abc_jitter, help="ABC Lab 지연 편차(±초)")
+    parser.add_argument('--embedding-latency', type=float, default=defaults.embedding_latency, help="임베딩 응답 지연(초)")
+    parser.add_argument('--embedding-jitter', type=float, default=defaults.embedding_jitter, help="임베딩 지연 편차(±초)")
+    parser.add_argument('--dimensions', type=int, default=defaults.dimensions, help="요청에 dimensions가 없을 때 벡터 차원")
+    parser.add_argument('--stream-lines', type=int, default=defaults.stream_lines, help="SSE 조각당 줄 수")
+    parser.add_argument('--stream-delay', type=float, default=defaults.stream_delay, help="SSE 조각 사이 지연(초)")
+    parser.add_argument('--error-rate', type=float, default=defaults.error_rate, help="오류 응답 비율 (0~1)")
+    parser.add_argument('--error-status', type=int, default=defaults.error_status, help="오류 응답 HTTP 상태 코드")
+    parser.add_argument('--hang-rate', type=float, default=defaults.hang_rate, help="응답하지 않고 대기할 비율 (0~1)")
+    parser.add_argument('--hang', type=float, default=defaults.hang, help="무응답 대기 시간(초)")
+    parser.add_argument('--seed', type=int, default=None, help="오류 주입/지연 난수 시드")
+    parser.add_argument('-v', '--verbose', action='store_true', help="요청 로그 출력")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format='%(message)s')
+
+    config = StubConfig(
+        abc_latency=args.abc_latency, abc_jitter=args.abc_jitter,
+        embedding_latency=args.embedding_latency, embedding_jitter=args.embedding_jitter,
+        dimensions=args.dimensions, stream_lines=args.stream_lines, stream_delay=args.stream_delay,
+        error_rate=args.error_rate, error_status=args.error_status,
+        hang_rate=args.hang_rate, hang=args.hang, seed=args.seed,
+    )
+    server = StubServer((args.host, args.port), config)
+    base = f"http://{args.host}:{args.port}"
+    logger.info(f"스텁 서버 시작: {base}")
+    logger.info(f"  ABC_LAB_API_URL={base}/v1/chat-messages")
+    logger.info(f"  OPENAI_BASE_URL={base}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
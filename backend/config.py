@@ -5,32 +5,221 @@ from dotenv import load_dotenv
 # .env 파일 로드
 load_dotenv()
 
+def _env_int(name, default):
+    """정수 환경변수 (없거나 비어 있으면 기본값)"""
+    value = os.getenv(name, '').strip()
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"환경변수 {name}는 정수여야 합니다: {value!r}")
+
+def _env_float(name, default):
+    """실수 환경변수 (없거나 비어 있으면 기본값)"""
+    value = os.getenv(name, '').strip()
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"환경변수 {name}는 숫자여야 합니다: {value!r}")
+
+def _env_bool(name, default):
+    """true/false 환경변수 (없거나 비어 있으면 기본값)"""
+    value = os.getenv(name, '').strip()
+    if not value:
+        return default
+    return value.lower() in ('true', '1', 'yes')
+
 @dataclass
 class DatabaseConfig:
     """데이터베이스 설정"""
     host: str = os.getenv('DB_HOST')
-    port: int = int(os.getenv('DB_PORT'))
+    port: int = _env_int('DB_PORT', 5432)
     database: str = os.getenv('DB_NAME')
     user: str = os.getenv('DB_USER')
     password: str = os.getenv('DB_PASS')
+    # 워커 프로세스별 접속 정보당 연결 풀 크기 (최대값은 워커 스레드 수 이상 권장)
+    pool_min: int = _env_int('DB_POOL_MIN', 1)
+    pool_max: int = _env_int('DB_POOL_MAX', 10)
+    # 워커 프로세스별 연결 풀 최대 개수 (접속 정보별로 풀이 생기므로 넘으면 오래 안 쓴 풀부터 종료)
+    pool_max_profiles: int = _env_int('DB_POOL_MAX_PROFILES', 16)
+    # 테이블 컬럼 정보 캐시 유지 시간(초), 0이면 매번 information_schema 조회
+    column_cache_ttl: int = _env_int('DB_COLUMN_CACHE_TTL', 300)
 
 @dataclass
 class ABCLabConfig:
     """ABC Lab API 설정"""
     api_url: str = os.getenv('ABC_LAB_API_URL')
     api_key: str = os.getenv('ABC_LAB_API_KEY')
-    timeout: int = int(os.getenv('ABC_LAB_TIMEOUT'))
+    timeout: int = _env_int('ABC_LAB_TIMEOUT', 180)
     user: str = os.getenv('ABC_LAB_USER')
+    # 워커 프로세스당 유지할 HTTP 연결 수 (동시 호출 스레드 수 이상 권장)
+    pool_size: int = _env_int('ABC_LAB_POOL_SIZE', 10)
+    # 차단기: 최근 window건 중 실패(오류, 검증 호출의 slow_call초 이상 지연) 비율이 기준 이상이면 open_seconds 동안 호출 차단
+    breaker_enabled: bool = _env_bool('ABC_LAB_BREAKER_ENABLED', True)
+    breaker_window: int = _env_int('ABC_LAB_BREAKER_WINDOW', 20)
+    breaker_min_calls: int = _env_int('ABC_LAB_BREAKER_MIN_CALLS', 5)
+    breaker_failure_rate: float = _env_float('ABC_LAB_BREAKER_FAILURE_RATE', 0.5)
+    breaker_slow_call: float = _env_float('ABC_LAB_BREAKER_SLOW_CALL', 120.0)
+    breaker_open_seconds: float = _env_float('ABC_LAB_BREAKER_OPEN_SECONDS', 30.0)
+    # 검증 호출 중복 요청: 최근 검증 응답 시간 분위수(hedge_quantile)만큼 지나도 응답이 없으면 한 번 더 요청
+    hedge_enabled: bool = _env_bool('ABC_LAB_HEDGE_ENABLED', False)
+    hedge_quantile: float = _env_float('ABC_LAB_HEDGE_QUANTILE', 0.95)
+    hedge_min_delay: float = _env_float('ABC_LAB_HEDGE_MIN_DELAY', 0.5)
+    # 응답 시간 표본이 hedge_min_samples건 미만일 때 사용할 대기 시간(초)
+    hedge_default_delay: float = _env_float('ABC_LAB_HEDGE_DEFAULT_DELAY', 10.0)
+    hedge_min_samples: int = _env_int('ABC_LAB_HEDGE_MIN_SAMPLES', 20)
+
+@dataclass
+class EmbeddingConfig:
+    """임베딩 설정"""
+    model: str = os.getenv('EMBEDDING_MODEL', 'text-embedding-3-small')
+    # 비우면 OpenAI 기본 주소 (사내 프록시/로컬 스텁 사용 시 지정, 예: http://127.0.0.1:18080/v1)
+    base_url: str = os.getenv('OPENAI_BASE_URL') or None
+    # 0이면 모델 기본 차원 사용 (text-embedding-3-small: 1536)
+    dimensions: int = _env_int('EMBEDDING_DIMENSIONS', 0)
+    quantize: bool = _env_bool('EMBEDDING_QUANTIZE', False)
+    rerank_factor: int = _env_int('EMBEDDING_RERANK_FACTOR', 4)
+    # openai | local (SQL 토큰 해싱, 오프라인) | hybrid (openai + local 점수 결합)
+    backend: str = os.getenv('EMBEDDING_BACKEND', 'openai').lower()
+    local_dimensions: int = _env_int('EMBEDDING_LOCAL_DIMENSIONS', 1024)
+    # hybrid 모드에서 원격(openai) 점수 가중치, 나머지는 로컬 점수
+    hybrid_weight: float = _env_float('EMBEDDING_HYBRID_WEIGHT', 0.7)
+
+@dataclass
+class EmbeddingWorkerConfig:
+    """백그라운드 임베딩 작업 설정"""
+    # 배치당 최대 과제 수 / 배치 수집 대기 시간(초)
+    batch_size: int = _env_int('EMBEDDING_BATCH_SIZE', 32)
+    batch_wait: float = _env_float('EMBEDDING_BATCH_WAIT', 0.5)
+    # 원격 임베딩 API 분당 최대 호출 수 (0이면 제한 없음)
+    requests_per_minute: int = _env_int('EMBEDDING_RPM', 60)
+    # 배치 실패 시 재시도 횟수 / 첫 재시도 대기(초, 지수 증가)
+    max_retries: int = _env_int('EMBEDDING_MAX_RETRIES', 5)
+    retry_delay: float = _env_float('EMBEDDING_RETRY_DELAY', 1.0)
+    # 재시도 모두 실패한 과제를 다시 큐에 넣기까지 대기(초)
+    failure_cooldown: int = _env_int('EMBEDDING_FAILURE_COOLDOWN', 300)
+    # 첫 요청 시 임베딩이 없는 과제 자동 채움
+    backfill_on_start: bool = _env_bool('EMBEDDING_BACKFILL', True)
+
+@dataclass
+class TaskStoreConfig:
+    """과제 저장소 설정"""
+    # sqlite (인덱스 조회) | file (과제별 JSON 파일)
+    backend: str = os.getenv('TASK_STORE', 'sqlite').lower()
+    db_path: str = os.getenv('TASK_DB_PATH', 'data/tasks/tasks.db')
+    tasks_dir: str = os.getenv('TASKS_DIR', 'data/tasks')
+
+@dataclass
+class RAGConfig:
+    """유사 과제 추천 설정"""
+    # SQL 식별자 BM25 사전 필터 후보 수 (0이면 사전 필터 미사용)
+    prefilter_limit: int = _env_int('RAG_PREFILTER_LIMIT', 300)
+
+@dataclass
+class DuplicateConfig:
+    """유사(중복) 과제 감지 설정"""
+    # 추정 Jaccard 유사도 기준 (정규화 SQL 토큰 5-gram)
+    threshold: float = _env_float('DUPLICATE_THRESHOLD', 0.8)
+    num_perm: int = _env_int('DUPLICATE_NUM_PERM', 128)
+    # LSH 밴드 수 (num_perm / bands = 밴드당 행 수)
+    bands: int = _env_int('DUPLICATE_BANDS', 16)
+
+@dataclass
+class TracingConfig:
+    """요청 단위 구간 추적 설정"""
+    enabled: bool = _env_bool('TRACE_ENABLED', True)
+    # Server-Timing 응답 헤더 (브라우저 개발자 도구 Timing 탭에서 확인)
+    server_timing: bool = _env_bool('TRACE_SERVER_TIMING', True)
+    # ?trace=1 또는 X-Debug-Trace: 1 요청 시 JSON 응답에 구간 트리 추가 허용
+    debug_response: bool = _env_bool('TRACE_DEBUG_RESPONSE', False)
+    # 처리 시간이 기준(ms) 이상인 요청의 구간 트리를 샘플링 비율만큼 로그로 출력
+    slow_ms: int = _env_int('TRACE_SLOW_MS', 3000)
+    slow_sample_rate: float = _env_float('TRACE_SLOW_SAMPLE_RATE', 1.0)
+    # 요청당 최대 구간 수 (반복 조회 시 메모리 제한)
+    max_spans: int = _env_int('TRACE_MAX_SPANS', 500)
+
+@dataclass
+class ResultStoreConfig:
+    """생성 결과 보관 설정 (AI SQL 생성 response=lean)"""
+    results_dir: str = os.getenv('RESULT_STORE_DIR', 'data/results')
+    max_entries: int = _env_int('RESULT_STORE_MAX_ENTRIES', 200)
+    max_bytes: int = _env_int('RESULT_STORE_MAX_BYTES', 500 * 1024 * 1024)
+    # 생성 후 보관 기간(초)
+    ttl: int = _env_int('RESULT_STORE_TTL', 24 * 3600)
+
+@dataclass
+class CustomSQLConfig:
+    """커스텀 SQL 생성 설정"""
+    # 기본 생성 방식: sql (DB에서 INSERT문 문자열 생성) | python (값만 조회 후 Python에서 변환)
+    engine: str = os.getenv('CUSTOM_SQL_ENGINE', 'sql').lower()
+    # 미리보기(limit/after) 기본/최대 페이지 크기
+    preview_limit: int = _env_int('CUSTOM_SQL_PREVIEW_LIMIT', 100)
+    preview_max_limit: int = _env_int('CUSTOM_SQL_PREVIEW_MAX_LIMIT', 1000)
+
+@dataclass
+class AISQLConfig:
+    """AI SQL 생성 설정"""
+    # mode=diff 변경 비교에서 제외할 컬럼 (쉼표 구분, 예: 등록/수정 일시)
+    diff_ignore_columns: str = os.getenv('AI_SQL_DIFF_IGNORE_COLUMNS', '')
+    # mode=diff 값 안의 NE ID까지 치환해 비교할 ID 컬럼 (그 외 컬럼은 값 전체가 NE ID일 때만 치환)
+    diff_id_columns: str = os.getenv('AI_SQL_DIFF_ID_COLUMNS',
+                                     'wflow_inst_id,origin_fmt_id,cdr_change_fmt_id,cdr_file_fmt_id')
+
+@dataclass
+class CompressionConfig:
+    """응답 압축 설정"""
+    enabled: bool = _env_bool('COMPRESS_ENABLED', True)
+    # 이 크기(바이트) 미만 응답은 압축하지 않음 (스트리밍 응답은 항상 압축)
+    min_size: int = _env_int('COMPRESS_MIN_SIZE', 1024)
+    gzip_level: int = _env_int('COMPRESS_GZIP_LEVEL', 5)
+    # brotli 패키지가 설치된 경우에만 사용
+    brotli_quality: int = _env_int('COMPRESS_BROTLI_QUALITY', 4)
+    streaming: bool = _env_bool('COMPRESS_STREAMING', True)
+
+@dataclass
+class AdmissionConfig:
+    """외부 호출 동시 처리 제한 (워커 프로세스별, 0이면 제한 없음)"""
+    enabled: bool = _env_bool('ADMISSION_ENABLED', True)
+    abc_lab_limit: int = _env_int('ABC_LAB_MAX_CONCURRENCY', 4)
+    abc_lab_queue: int = _env_int('ABC_LAB_QUEUE_SIZE', 8)
+    abc_lab_queue_timeout: float = _env_float('ABC_LAB_QUEUE_TIMEOUT', 10.0)
+    openai_limit: int = _env_int('OPENAI_MAX_CONCURRENCY', 8)
+    openai_queue: int = _env_int('OPENAI_QUEUE_SIZE', 32)
+    openai_queue_timeout: float = _env_float('OPENAI_QUEUE_TIMEOUT', 5.0)
+    # DB 접속 정보별 제한 (0이면 연결 풀 최대 크기 - 풀 고갈 오류 대신 대기)
+    db_limit: int = _env_int('DB_MAX_CONCURRENCY', 0)
+    db_queue: int = _env_int('DB_QUEUE_SIZE', 32)
+    db_queue_timeout: float = _env_float('DB_QUEUE_TIMEOUT', 5.0)
+    # 거절 응답(503) Retry-After 헤더 값(초)
+    retry_after: int = _env_int('ADMISSION_RETRY_AFTER', 5)
 
 @dataclass
 class AppConfig:
     """애플리케이션 설정"""
     host: str = os.getenv('FLASK_HOST', '127.0.0.1')
-    port: int = int(os.getenv('FLASK_PORT', 15000))
-    debug: bool = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
+    port: int = _env_int('FLASK_PORT', 15000)
+    debug: bool = _env_bool('FLASK_DEBUG', True)
     secret_key: str = os.getenv('SECRET_KEY')
+    # 시작 시 워밍업: false (첫 사용 시 생성) | true (시작 전 완료) | background (시작 후 백그라운드)
+    warmup: str = os.getenv('APP_WARMUP', 'false').lower()
+    # JSON 직렬화: auto (orjson 설치 시 orjson) | orjson | default (표준 json)
+    json_provider: str = os.getenv('JSON_PROVIDER', 'auto').lower()
 
 # 설정 인스턴스
 db_config = DatabaseConfig()
 abc_lab_config = ABCLabConfig()
+embedding_config = EmbeddingConfig()
+embedding_worker_config = EmbeddingWorkerConfig()
+task_store_config = TaskStoreConfig()
+rag_config = RAGConfig()
+duplicate_config = DuplicateConfig()
+tracing_config = TracingConfig()
+compression_config = CompressionConfig()
+result_store_config = ResultStoreConfig()
+custom_sql_config = CustomSQLConfig()
+ai_sql_config = AISQLConfig()
+admission_config = AdmissionConfig()
 app_config = AppConfig()
\ No newline at end of file
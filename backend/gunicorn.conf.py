@@ -0,0 +1,40 @@
+"""gunicorn 설정 (gunicorn -c gunicorn.conf.py wsgi:app)
+
+요청 처리 시간 대부분이 ABC Lab / OpenAI / PostgreSQL 대기이므로
+프로세스 수는 CPU 수 정도로 두고, 워커별 스레드(gthread)로 동시 요청을 처리한다.
+"""
+import os
+import multiprocessing
+
+# 마스터에서 앱을 적재할 때 임베딩 행렬/색인까지 미리 올려 워커들이 fork로 공유 (copy-on-write)
+os.environ.setdefault('APP_WARMUP', 'true')
+
+from config import app_config, abc_lab_config  # noqa: E402
+
+bind = f"{os.getenv('FLASK_HOST', '0.0.0.0')}:{app_config.port}"
+
+worker_class = "gthread"
+workers = int(os.getenv('GUNICORN_WORKERS', min(multiprocessing.cpu_count(), 4)))
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+
+# AI SQL 생성은 ABC Lab 응답을 최대 ABC_LAB_TIMEOUT초 기다리므로 그보다 길게
+timeout = abc_lab_config.timeout + 30
+# 재시작/배포 시 진행 중인 AI SQL 생성 요청이 끝날 때까지 대기
+graceful_timeout = abc_lab_config.timeout + 30
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+
+# 메모리 누수 대비 워커 주기적 재시작 (0이면 비활성, 마스터에서 다시 fork 하므로 적재 비용 없음)
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = max_requests // 10
+
+preload_app = True
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    """워커 프로세스별 HTTP 클라이언트, SQLite 연결, DB 연결 풀, ABC Lab 세션 재생성"""
+    from wsgi import app
+    app.extensions['services'].after_fork()
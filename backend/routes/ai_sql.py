@@ -1,7 +1,11 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response
+from werkzeug.utils import secure_filename
 import logging
 from services.sql_service import SQLService
 from services.abc_lab_service import ABCLabService
+from services.registry import get_services
+from services.admission import Saturated
+from services.circuit_breaker import CircuitOpen
 
 logger = logging.getLogger(__name__)
 
@@ -37,10 +41,29 @@ def generate_ai_sql():
                 "timestamp": None
             }), 400
 
-        logger.info(f"AI SQL 생성 시작: {source_ne_id} -> {target_ne_id}")
+        # 응답 방식: full (모든 INSERT문 포함) | lean (건수/통계 + result_id, INSERT문은 결과 조회 API로)
+        response_mode = str(request.args.get("response") or data.get("response") or "full").lower()
+        if response_mode not in ("full", "lean"):
+            return jsonify({
+                "success": False,
+                "error": {"code": "INVALID_PARAMS", "message": "response는 full 또는 lean 이어야 합니다."},
+                "timestamp": None
+            }), 400
 
-        # 5개 테이블 데이터 조회
-        migration_results, total_insert_count = SQLService.get_ai_sql_tables_data(source_ne_id)
+        # 생성 방식: full (기준 NE 전체 INSERT) | diff (신규 NE에 없는 행 INSERT, 값이 다른 행 UPDATE)
+        generate_mode = str(request.args.get("mode") or data.get("mode") or "full").lower()
+        if generate_mode not in ("full", "diff"):
+            return jsonify({
+                "success": False,
+                "error": {"code": "INVALID_PARAMS", "message": "mode는 full 또는 diff 이어야 합니다."},
+                "timestamp": None
+            }), 400
+
+        logger.info(f"AI SQL 생성 시작 ({generate_mode}): {source_ne_id} -> {target_ne_id}")
+
+        # 5개 테이블 데이터 조회 (diff면 신규 NE 기존 행과 비교)
+        migration_results, total_insert_count = SQLService.get_ai_sql_tables_data(
+            source_ne_id, target_ne_id, diff=generate_mode == "diff")
 
         # 모든 INSERT문을 하나로 합치기 (배치 처리 제거)
         all_statements = []
@@ -50,6 +73,18 @@ def generate_ai_sql():
             if table_name in migration_results and migration_results[table_name]["statements"]:
                 all_statements.extend(migration_results[table_name]["statements"])
 
+        if not all_statements and generate_mode == "diff" and any(
+                result["diff"]["source_rows"] for result in migration_results.values()):
+            return jsonify({
+                "success": True,
+                "data": {
+                    "mode": generate_mode,
+                    **_result_summary(source_ne_id, target_ne_id, migration_results, {}, total_insert_count)
+                },
+                "message": f"신규 NE ID '{target_ne_id}'에 기준 NE 설정이 모두 반영되어 있습니다. (변경 없음)",
+                "timestamp": None
+            })
+
         if not all_statements:
             return jsonify({
                 "success": False,
@@ -58,6 +93,8 @@ def generate_ai_sql():
             }), 404
 
         # ABC Lab API 일괄 호출 (배치 처리 제거)
+        # 변환하지 못하고 원본 INSERT문으로 응답한 이유 (circuit_open / upstream_error / parse_failed)
+        fallback_reason = None
         try:
             logger.info(f"ABC Lab API 일괄 처리 시작: 총 {len(all_statements)}개 INSERT문")
 
@@ -84,6 +121,7 @@ def generate_ai_sql():
                 logger.info(f"ABC Lab API 변환 완료: {len(all_statements)}개 → {len(converted_statements)}개")
             else:
                 logger.warning("ABC Lab API 변환 결과 파싱 실패, 원본 사용")
+                fallback_reason = "parse_failed"
                 final_results = {
                     "original_sql": {
                         "count": len(all_statements),
@@ -91,9 +129,24 @@ def generate_ai_sql():
                     }
                 }
 
+        except Saturated:
+            raise
+        except CircuitOpen as api_error:
+            # 차단 중에는 ABC Lab을 기다리지 않고 바로 원본 INSERT문 사용
+            logger.warning(f"ABC Lab API 차단 중, 원본 INSERT문 사용: {api_error}")
+            fallback_reason = "circuit_open"
+
+            final_results = {
+                "original_sql": {
+                    "count": len(all_statements),
+                    "statements": all_statements
+                }
+            }
+
         except Exception as api_error:
             logger.error(f"ABC Lab API 호출 실패: {api_error}")
             logger.warning("API 변환 실패, 원본 INSERT문 사용")
+            fallback_reason = "upstream_error"
 
             final_results = {
                 "original_sql": {
@@ -104,19 +157,48 @@ def generate_ai_sql():
 
         # 최종 응답 구성
         total_converted = sum(result["count"] for result in final_results.values())
+        statement_label = "INSERT/UPDATE문" if generate_mode == "diff" else "INSERT문"
+        conversion = {"converted": fallback_reason is None, "fallback_reason": fallback_reason}
+        message = f"AI SQL 생성이 완료되었습니다. (총 {total_converted}개 {statement_label})"
+        if fallback_reason:
+            message += " ABC Lab 변환에 실패해 원본 문을 반환합니다."
+
+        if response_mode == "lean":
+            result_id = get_services().result_store.put({
+                "source_ne_id": source_ne_id,
+                "target_ne_id": target_ne_id,
+                "mode": generate_mode,
+                **conversion,
+                "table_results": migration_results,
+                "final_results": final_results
+            })
+            logger.info(f"AI SQL 생성 완료 (lean): {total_converted}개 INSERT문, 결과 ID {result_id}")
+            return jsonify({
+                "success": True,
+                "data": {
+                    "result_id": result_id,
+                    "mode": generate_mode,
+                    **conversion,
+                    **_result_summary(source_ne_id, target_ne_id, migration_results, final_results, total_insert_count)
+                },
+                "message": message,
+                "timestamp": None
+            })
 
         result = {
             "success": True,
             "data": {
                 "source_ne_id": source_ne_id,
                 "target_ne_id": target_ne_id,
+                "mode": generate_mode,
+                **conversion,
                 "original_table_count": len([t for t in migration_results.values() if t["count"] > 0]),
                 "original_insert_count": total_insert_count,
                 "final_insert_count": total_converted,
                 "table_results": migration_results,  # 원본 테이블별 결과
                 "final_results": final_results      # 변환된 최종 결과
             },
-            "message": f"AI SQL 생성이 완료되었습니다. (총 {total_converted}개 INSERT문)",
+            "message": message,
             "timestamp": None
         }
 
@@ -131,6 +213,9 @@ def generate_ai_sql():
             "timestamp": None
         }), 400
 
+    except Saturated:
+        raise
+
     except Exception as e:
         logger.error(f"AI SQL 생성 중 예상치 못한 오류: {e}")
         return jsonify({
@@ -173,10 +258,136 @@ def get_ai_sql_data_preview(source_ne_id):
             "timestamp": None
         })
 
+    except Saturated:
+        raise
+
     except Exception as e:
         logger.error(f"AI SQL 데이터 미리보기 오류: {e}")
         return jsonify({
             "success": False,
             "error": {"code": "PREVIEW_ERROR", "message": f"데이터 미리보기 중 오류 발생: {str(e)}"},
             "timestamp": None
-        }), 500
\ No newline at end of file
+        }), 500
+
+
+def _result_summary(source_ne_id, target_ne_id, table_results, final_results, original_insert_count=None):
+    """생성 결과 요약 (INSERT문 제외, 건수/테이블별 통계)"""
+    if original_insert_count is None:
+        original_insert_count = sum(result["count"] for result in table_results.values())
+    return {
+        "source_ne_id": source_ne_id,
+        "target_ne_id": target_ne_id,
+        "original_table_count": len([t for t in table_results.values() if t["count"] > 0]),
+        "original_insert_count": original_insert_count,
+        "final_insert_count": sum(result["count"] for result in final_results.values()),
+        "table_stats": {name: _table_stat(result) for name, result in table_results.items()},
+        "final_stats": {name: {"count": result["count"]} for name, result in final_results.items()}
+    }
+
+
+def _table_stat(result):
+    """테이블별 건수 (diff 모드면 INSERT/UPDATE/변경 없음 건수 포함)"""
+    if "diff" in result:
+        return {"count": result["count"], **result["diff"]}
+    return {"count": result["count"]}
+
+
+def _load_result(result_id):
+    """저장된 생성 결과 조회 - (result, 오류 응답)"""
+    result = get_services().result_store.get(result_id)
+    if result is None:
+        return None, (jsonify({
+            "success": False,
+            "error": {"code": "RESULT_NOT_FOUND", "message": f"생성 결과 '{result_id}'를 찾을 수 없습니다. (만료되었거나 잘못된 ID)"},
+            "timestamp": None
+        }), 404)
+    return result, None
+
+
+def _result_section(result, table_name):
+    """테이블명(원본 테이블 또는 ai_generated_sql / original_sql)에 해당하는 결과"""
+    return result["table_results"].get(table_name) or result["final_results"].get(table_name)
+
+
+@ai_sql_bp.route('/results/<result_id>', methods=['GET'])
+def get_ai_sql_result(result_id):
+    """저장된 AI SQL 생성 결과 요약"""
+    result, error = _load_result(result_id)
+    if error:
+        return error
+
+    return jsonify({
+        "success": True,
+        "data": {
+            "result_id": result_id,
+            "mode": result.get("mode", "full"),
+            "converted": result.get("converted", "ai_generated_sql" in result["final_results"]),
+            "fallback_reason": result.get("fallback_reason"),
+            **_result_summary(result["source_ne_id"], result["target_ne_id"],
+                              result["table_results"], result["final_results"])
+        },
+        "message": "생성 결과 조회 완료",
+        "timestamp": None
+    })
+
+
+@ai_sql_bp.route('/results/<result_id>/tables/<table_name>', methods=['GET'])
+def get_ai_sql_result_table(result_id, table_name):
+    """저장된 AI SQL 생성 결과의 테이블별 INSERT문
+
+    table_name: 원본 테이블명 또는 ai_generated_sql / original_sql (변환 결과)
+    include_raw=true면 변환 결과에 ABC Lab 원본 응답 포함
+    """
+    result, error = _load_result(result_id)
+    if error:
+        return error
+
+    section = _result_section(result, table_name)
+    if section is None:
+        return jsonify({
+            "success": False,
+            "error": {"code": "NOT_FOUND", "message": f"결과에 '{table_name}' 테이블이 없습니다."},
+            "timestamp": None
+        }), 404
+
+    data = {"result_id": result_id, "table_name": table_name,
+            "count": section["count"], "statements": section["statements"]}
+    if request.args.get("include_raw", "false").lower() == "true" and "raw_response" in section:
+        data["raw_response"] = section["raw_response"]
+
+    return jsonify({
+        "success": True,
+        "data": data,
+        "message": f"{table_name}: {section['count']}개 INSERT문",
+        "timestamp": None
+    })
+
+
+@ai_sql_bp.route('/results/<result_id>/download', methods=['GET'])
+def download_ai_sql_result(result_id):
+    """저장된 AI SQL 생성 결과 SQL 파일 다운로드 (table 미지정 시 최종 결과)
+
+    결과 JSON 전체를 읽은 뒤 SQL문을 한 줄씩 내보낸다. 응답 문자열을 한 번 더 만들지 않을 뿐
+    메모리 사용량은 결과 크기에 비례한다.
+    """
+    result, error = _load_result(result_id)
+    if error:
+        return error
+
+    table_name = request.args.get("table") or next(iter(result["final_results"]))
+    section = _result_section(result, table_name)
+    if section is None:
+        return jsonify({
+            "success": False,
+            "error": {"code": "NOT_FOUND", "message": f"결과에 '{table_name}' 테이블이 없습니다."},
+            "timestamp": None
+        }), 404
+
+    # 이미 메모리에 읽은 SQL문을 한 줄씩 전송 (전체 SQL 문자열 결합 없음)
+    def generate():
+        for statement in section["statements"]:
+            yield statement + "\n"
+
+    filename = secure_filename(f"{result['source_ne_id']}_to_{result['target_ne_id']}_{table_name}.sql") or "result.sql"
+    return Response(generate(), mimetype="application/sql",
+                    headers={"Content-Disposition": f"attachment; filename=\"{filename}\""})
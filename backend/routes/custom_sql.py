@@ -1,8 +1,11 @@
 from flask import Blueprint, request, jsonify
 import logging
+from config import custom_sql_config
 from services.db_service import DatabaseService
 from services.sql_service import SQLService
 from services.abc_lab_service import ABCLabService
+from services.admission import Saturated
+from services.circuit_breaker import CircuitOpen
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +34,32 @@ def generate_custom_sql():
                 "timestamp": None
             }), 400
 
+        # 생성 방식: sql (DB에서 INSERT문 문자열 생성) | python (값만 조회 후 Python에서 변환)
+        engine = str(request.args.get("engine") or data.get("engine") or custom_sql_config.engine).lower()
+        if engine not in ("sql", "python"):
+            return jsonify({
+                "success": False,
+                "error": {"code": "INVALID_PARAMS", "message": "engine은 sql 또는 python 이어야 합니다."},
+                "timestamp": None
+            }), 400
+
+        # 미리보기: limit / after가 있으면 기본키 순서로 한 페이지만 조회
+        limit = request.args.get("limit", data.get("limit"))
+        after = request.args.get("after") or data.get("after") or None
+        preview = limit is not None or after is not None
+        if preview:
+            try:
+                limit = int(limit) if limit is not None else custom_sql_config.preview_limit
+            except (TypeError, ValueError):
+                limit = 0
+            if not 1 <= limit <= custom_sql_config.preview_max_limit:
+                return jsonify({
+                    "success": False,
+                    "error": {"code": "INVALID_PARAMS",
+                              "message": f"limit은 1~{custom_sql_config.preview_max_limit} 사이 정수여야 합니다."},
+                    "timestamp": None
+                }), 400
+
         # 테이블 컬럼 정보 조회
         columns = DatabaseService.get_table_columns(schema, table_name)
         if not columns:
@@ -40,25 +69,42 @@ def generate_custom_sql():
                 "timestamp": None
             }), 404
 
-        # 커스텀 SQL 템플릿 생성
-        sql_template = SQLService.generate_custom_sql(schema, table_name, columns, data)
-
-        # SQL 실행하여 결과 조회
-        rows, colnames = DatabaseService.execute_query(sql_template)
-
-        logger.info(f"커스텀 SQL 생성 완료: {len(rows)}건의 데이터 생성")
+        page = None
+        if preview:
+            sql_template, rows, colnames, page = SQLService.preview_custom_rows(
+                schema, table_name, columns, data, engine, limit, str(after) if after else None)
+        elif engine == "python":
+            sql_template, rows, colnames = SQLService.generate_custom_rows(schema, table_name, columns, data)
+        else:
+            # 커스텀 SQL 템플릿 생성
+            sql_template = SQLService.generate_custom_sql(schema, table_name, columns, data)
+
+            # SQL 실행하여 결과 조회
+            rows, colnames = DatabaseService.execute_query(sql_template)
+
+        logger.info(f"커스텀 SQL 생성 완료 ({engine}): {len(rows)}건의 데이터 생성")
+
+        result = {
+            "sql_template": sql_template,
+            "columns": colnames,
+            "rows": rows,
+            "record_count": len(rows),
+            "engine": engine,
+            "schema": schema,
+            "table_name": table_name
+        }
+        message = f"커스텀 SQL이 성공적으로 생성되었습니다. ({len(rows)}건)"
+        if page is not None:
+            result["page"] = page
+            if page["estimated_total"] is not None:
+                message = f"커스텀 SQL 미리보기 ({len(rows)}건 / 약 {page['estimated_total']}건)"
+            else:
+                message = f"커스텀 SQL 미리보기 ({len(rows)}건)"
 
         return jsonify({
             "success": True,
-            "data": {
-                "sql_template": sql_template,
-                "columns": colnames,
-                "rows": rows,
-                "record_count": len(rows),
-                "schema": schema,
-                "table_name": table_name
-            },
-            "message": f"커스텀 SQL이 성공적으로 생성되었습니다. ({len(rows)}건)",
+            "data": result,
+            "message": message,
             "timestamp": None
         })
 
@@ -70,6 +116,9 @@ def generate_custom_sql():
             "timestamp": None
         }), 400
 
+    except Saturated:
+        raise
+
     except Exception as e:
         logger.error(f"커스텀 SQL 생성 오류: {e}")
         return jsonify({
@@ -140,6 +189,9 @@ def validate_sql():
             "timestamp": None
         })
 
+    except (Saturated, CircuitOpen):
+        raise
+
     except Exception as e:
         logger.error(f"SQL 검증 오류: {e}")
         return jsonify({
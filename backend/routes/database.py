@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify, session
 import logging
 from services.db_service import DatabaseService
+from services.admission import Saturated
+from services.http_cache import make_etag, not_modified, with_validators
 
 logger = logging.getLogger(__name__)
 
@@ -73,7 +75,7 @@ def connect():
 
 @database_bp.route('/tables/<schema>/<table_name>/columns', methods=['GET'])
 def get_table_columns(schema, table_name):
-    """테이블 컬럼 정보 조회"""
+    """테이블 컬럼 정보 조회 (컬럼 캐시 기준 ETag, 변경이 없으면 304)"""
     try:
         if not schema or not table_name:
             return jsonify({
@@ -91,11 +93,17 @@ def get_table_columns(schema, table_name):
                 "timestamp": None
             }), 404
 
+        # 캐시 유지 시간 안에는 DB 조회 없이 캐시된 컬럼으로 비교
+        etag = make_etag("columns", schema, table_name, columns)
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+
         columns_list = [{"column_name": column[0], "udt_name": column[1]} for column in columns]
         
         logger.info(f"컬럼 조회 성공: {schema}.{table_name} ({len(columns_list)}개 컬럼)")
 
-        return jsonify({
+        return with_validators(jsonify({
             "success": True,
             "data": {
                 "columns": columns_list,
@@ -105,7 +113,10 @@ def get_table_columns(schema, table_name):
             },
             "message": f"테이블 '{table_name}'의 컬럼을 성공적으로 조회했습니다.",
             "timestamp": None
-        })
+        }), etag)
+
+    except Saturated:
+        raise
 
     except Exception as e:
         logger.error(f"컬럼 정보 조회 오류: {e}")
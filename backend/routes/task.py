@@ -1,20 +1,29 @@
 from flask import Blueprint, request, jsonify
 from datetime import datetime
 import logging
-from services.task_service import TaskService
-from services.rag_service import RAGService
+from services.registry import get_services
+from services.task_store import DuplicateTaskError
+from services.admission import Saturated
+from services.http_cache import make_etag, not_modified, with_validators
 
 logger = logging.getLogger(__name__)
 
 task_bp = Blueprint('task', __name__, url_prefix='/api/v1/tasks')
-task_service = TaskService()
-rag_service = RAGService()
+
+# 과제 목록 페이지 크기
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+DEFAULT_SEARCH_SIZE = 20
+# 유사 과제 추천 개수
+DEFAULT_RECOMMEND_SIZE = 3
+MAX_RECOMMEND_SIZE = 20
 
 
 @task_bp.route('', methods=['POST'])
 def create_task():
     """과제 등록"""
     try:
+        task_service = get_services().task_service
         data = request.get_json()
 
         if not data:
@@ -57,7 +66,7 @@ def create_task():
             }), 400
 
         # 중복 체크
-        if task_service.get_task(task_id):
+        if task_service.task_exists(task_id):
             return jsonify({
                 "success": False,
                 "error": {
@@ -66,6 +75,9 @@ def create_task():
                 }
             }), 400
 
+        # 유사 과제 확인 (정규화 SQL MinHash, 등록은 막지 않고 응답에 표시)
+        duplicates = task_service.find_near_duplicates(sql)
+
         # 과제 생성
         task = task_service.create_task(
             task_id=task_id,
@@ -77,13 +89,30 @@ def create_task():
 
         logger.info(f"✅ 과제 등록 완료: {task_id}")
 
+        message = f"과제가 등록되었습니다. ({task_id})"
+        if duplicates:
+            top = duplicates[0]
+            message += f" ⚠️ SQL이 거의 같은 과제 {len(duplicates)}건: {top['task_id']} ({top['similarity']}%)"
+            logger.warning(f"⚠️ 유사 과제 등록: {task_id} ≈ {[d['task_id'] for d in duplicates]}")
+
         return jsonify({
             "success": True,
             "data": task,
-            "message": f"과제가 등록되었습니다. ({task_id})",
+            "duplicates": duplicates,
+            "message": message,
             "timestamp": datetime.now().isoformat()
         }), 201
 
+    except DuplicateTaskError:
+        # 중복 체크 이후 다른 워커가 같은 과제번호를 먼저 저장한 경우
+        return jsonify({
+            "success": False,
+            "error": {
+                "code": "DUPLICATE_TASK_ID",
+                "message": f"과제번호 '{task_id}'가 이미 존재합니다."
+            }
+        }), 400
+
     except Exception as e:
         logger.error(f"❌ 과제 등록 오류: {e}")
         return jsonify({
@@ -97,19 +126,74 @@ def create_task():
 
 @task_bp.route('', methods=['GET'])
 def get_tasks():
-    """과제 목록 조회"""
+    """과제 목록 조회
+
+    쿼리 파라미터 (모두 선택):
+      limit   - 페이지 크기 (지정 시 키셋 페이지네이션, 최대 MAX_PAGE_SIZE)
+      cursor  - 이전 응답의 next_cursor
+      fields  - 반환 필드 (콤마 구분, 예: task_id,title,author,created_at)
+      summary - true면 SQL 본문을 읽지 않음
+
+    저장소 세대로 ETag/Last-Modified를 만들어, 변경이 없으면 과제를 읽지 않고 304로 응답한다.
+    """
     try:
-        tasks = task_service.get_all_tasks()
+        task_service = get_services().task_service
+
+        generation, modified_at = task_service.version()
+        etag = make_etag("tasks", generation, request.query_string)
+        cached = not_modified(etag, modified_at)
+        if cached is not None:
+            return cached
+
+        limit = _query_number('limit', int)
+        cursor = request.args.get('cursor', '').strip() or None
+        fields = [f.strip() for f in request.args.get('fields', '').split(',') if f.strip()]
+        summary = request.args.get('summary', 'false').lower() == 'true'
+
+        # 파라미터가 없으면 기존과 동일하게 전체 목록 반환
+        if limit is None and not cursor and not fields and not summary:
+            tasks = task_service.get_all_tasks()
+
+            return with_validators(jsonify({
+                "success": True,
+                "data": {
+                    "tasks": tasks,
+                    "total": len(tasks)
+                },
+                "message": f"{len(tasks)}개의 과제를 조회했습니다.",
+                "timestamp": datetime.now().isoformat()
+            }), etag, modified_at)
+
+        if limit is None:
+            limit = DEFAULT_PAGE_SIZE
+        if limit < 1 or limit > MAX_PAGE_SIZE:
+            return jsonify({
+                "success": False,
+                "error": {
+                    "code": "INVALID_LIMIT",
+                    "message": f"limit은 1~{MAX_PAGE_SIZE} 사이여야 합니다."
+                }
+            }), 400
 
-        return jsonify({
+        tasks, next_cursor = task_service.list_tasks(limit, cursor=cursor, fields=fields, summary=summary)
+
+        return with_validators(jsonify({
             "success": True,
             "data": {
                 "tasks": tasks,
-                "total": len(tasks)
+                "total": len(tasks),
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None
             },
             "message": f"{len(tasks)}개의 과제를 조회했습니다.",
             "timestamp": datetime.now().isoformat()
-        })
+        }), etag, modified_at)
+
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": {"code": "INVALID_PARAMS", "message": str(e)}
+        }), 400
 
     except Exception as e:
         logger.error(f"❌ 과제 목록 조회 오류: {e}")
@@ -122,10 +206,114 @@ def get_tasks():
         }), 500
 
 
+@task_bp.route('/search', methods=['GET'])
+def search_tasks():
+    """과제 전문 검색 (제목, 내용, SQL)
+
+    쿼리 파라미터: q (필수), limit (기본 DEFAULT_SEARCH_SIZE), offset (기본 0)
+    """
+    try:
+        task_service = get_services().task_service
+
+        query = request.args.get('q', '').strip()
+        limit = _query_number('limit', int, DEFAULT_SEARCH_SIZE)
+        offset = _query_number('offset', int, 0)
+
+        if not query:
+            return jsonify({
+                "success": False,
+                "error": {"code": "MISSING_QUERY", "message": "검색어(q)를 입력해주세요."}
+            }), 400
+
+        if limit < 1 or limit > MAX_PAGE_SIZE or offset < 0:
+            return jsonify({
+                "success": False,
+                "error": {
+                    "code": "INVALID_PARAMS",
+                    "message": f"limit은 1~{MAX_PAGE_SIZE}, offset은 0 이상이어야 합니다."
+                }
+            }), 400
+
+        results, total = task_service.search_tasks(query, limit, offset)
+
+        return jsonify({
+            "success": True,
+            "data": {
+                "results": results,
+                "total": total,
+                "limit": limit,
+                "offset": offset,
+                "has_more": offset + len(results) < total
+            },
+            "message": f"{total}개의 과제를 찾았습니다.",
+            "timestamp": datetime.now().isoformat()
+        })
+
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": {"code": "INVALID_PARAMS", "message": str(e)}
+        }), 400
+
+    except Exception as e:
+        logger.error(f"❌ 과제 검색 오류: {e}")
+        return jsonify({
+            "success": False,
+            "error": {
+                "code": "SEARCH_ERROR",
+                "message": f"과제 검색 중 오류가 발생했습니다: {str(e)}"
+            }
+        }), 500
+
+
+@task_bp.route('/reindex', methods=['POST'])
+def reindex_tasks():
+    """전체 과제 재임베딩 요청 (관리자용, 백그라운드 처리)"""
+    try:
+        worker = get_services().embedding_worker
+        started = worker.request_reindex()
+
+        return jsonify({
+            "success": True,
+            "data": worker.status(),
+            "message": "전체 과제 재임베딩을 시작했습니다." if started else "이미 재임베딩이 진행 중입니다.",
+            "timestamp": datetime.now().isoformat()
+        }), 202
+
+    except Exception as e:
+        logger.error(f"❌ 재임베딩 요청 오류: {e}")
+        return jsonify({
+            "success": False,
+            "error": {
+                "code": "REINDEX_ERROR",
+                "message": f"재임베딩 요청 중 오류가 발생했습니다: {str(e)}"
+            }
+        }), 500
+
+
+@task_bp.route('/embeddings/status', methods=['GET'])
+def embedding_status():
+    """임베딩 작업 상태 (대기 과제 수, 재임베딩 진행률)"""
+    worker = get_services().embedding_worker
+    return jsonify({
+        "success": True,
+        "data": worker.status(),
+        "timestamp": datetime.now().isoformat()
+    })
+
+
 @task_bp.route('/<task_id>', methods=['GET'])
 def get_task(task_id):
-    """과제 상세 조회"""
+    """과제 상세 조회 (저장소 세대 기준 ETag/Last-Modified, 변경이 없으면 304)"""
     try:
+        task_service = get_services().task_service
+
+        generation, modified_at = task_service.version()
+        etag = make_etag("task", task_id, generation)
+        cached = not_modified(etag, modified_at)
+        if cached is not None:
+            return cached
+
         task = task_service.get_task(task_id)
 
         if not task:
@@ -137,12 +325,12 @@ def get_task(task_id):
                 }
             }), 404
 
-        return jsonify({
+        return with_validators(jsonify({
             "success": True,
             "data": task,
             "message": "과제를 조회했습니다.",
             "timestamp": datetime.now().isoformat()
-        })
+        }), etag, modified_at)
 
     except Exception as e:
         logger.error(f"❌ 과제 조회 오류: {e}")
@@ -155,10 +343,66 @@ def get_task(task_id):
         }), 500
 
 
+@task_bp.route('/<task_id>/duplicates', methods=['GET'])
+def get_task_duplicates(task_id):
+    """SQL이 거의 같은 과제 조회
+
+    쿼리 파라미터: threshold (0~1, 기본 DUPLICATE_THRESHOLD)
+    """
+    try:
+        task_service = get_services().task_service
+        threshold = _query_number('threshold', float)
+
+        if threshold is not None and not 0 <= threshold <= 1:
+            return jsonify({
+                "success": False,
+                "error": {"code": "INVALID_PARAMS", "message": "threshold는 0~1 사이여야 합니다."}
+            }), 400
+
+        duplicates = task_service.find_task_duplicates(task_id, threshold)
+
+        if duplicates is None:
+            return jsonify({
+                "success": False,
+                "error": {
+                    "code": "NOT_FOUND",
+                    "message": f"과제 '{task_id}'를 찾을 수 없습니다."
+                }
+            }), 404
+
+        return jsonify({
+            "success": True,
+            "data": {
+                "task_id": task_id,
+                "duplicates": duplicates,
+                "total": len(duplicates)
+            },
+            "message": f"{len(duplicates)}개의 유사 과제를 찾았습니다.",
+            "timestamp": datetime.now().isoformat()
+        })
+
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": {"code": "INVALID_PARAMS", "message": str(e)}
+        }), 400
+
+    except Exception as e:
+        logger.error(f"❌ 유사 과제 조회 오류: {e}")
+        return jsonify({
+            "success": False,
+            "error": {
+                "code": "DUPLICATES_ERROR",
+                "message": f"유사 과제 조회 중 오류가 발생했습니다: {str(e)}"
+            }
+        }), 500
+
+
 @task_bp.route('/<task_id>', methods=['DELETE'])
 def delete_task(task_id):
     """과제 삭제"""
     try:
+        task_service = get_services().task_service
         success = task_service.delete_task(task_id)
 
         if not success:
@@ -209,8 +453,18 @@ def recommend_similar():
                 "error": {"code": "MISSING_SQL", "message": "SQL문을 입력해주세요."}
             }), 400
 
+        # 추천 조건 검증
+        try:
+            options = _parse_recommend_options(data)
+        except ValueError as e:
+            return jsonify({
+                "success": False,
+                "error": {"code": "INVALID_PARAMS", "message": str(e)}
+            }), 400
+
         # RAG 검색
-        recommendations = rag_service.find_similar_tasks(user_sql, top_k=3)
+        rag_service = get_services().rag_service
+        recommendations = rag_service.find_similar_tasks(user_sql, **options)
 
         logger.info(f"✅ 유사 과제 추천 완료: {len(recommendations)}개")
 
@@ -224,6 +478,9 @@ def recommend_similar():
             "timestamp": datetime.now().isoformat()
         })
 
+    except Saturated:
+        raise
+
     except Exception as e:
         logger.error(f"❌ 유사 과제 추천 오류: {e}")
         return jsonify({
@@ -232,4 +489,73 @@ def recommend_similar():
                 "code": "RECOMMEND_ERROR",
                 "message": f"추천 중 오류가 발생했습니다: {str(e)}"
             }
-        }), 500
\ No newline at end of file
+        }), 500
+
+
+def _parse_recommend_options(data):
+    """추천 조건 파싱 (top_k, min_similarity(%), author, created_after/before, include_sql - 기본 true)"""
+    try:
+        top_k = int(data.get('top_k', DEFAULT_RECOMMEND_SIZE))
+        min_similarity = data.get('min_similarity')
+        min_similarity = float(min_similarity) if min_similarity is not None else None
+    except (TypeError, ValueError):
+        raise ValueError("top_k는 정수, min_similarity는 숫자여야 합니다.")
+
+    if not 1 <= top_k <= MAX_RECOMMEND_SIZE:
+        raise ValueError(f"top_k는 1~{MAX_RECOMMEND_SIZE} 사이여야 합니다.")
+    if min_similarity is not None and not 0 <= min_similarity <= 100:
+        raise ValueError("min_similarity는 0~100(%) 사이여야 합니다.")
+
+    dates = {}
+    for key in ('created_after', 'created_before'):
+        value = (data.get(key) or '').strip()
+        if value:
+            try:
+                parsed = datetime.fromisoformat(value[:-1] + '+00:00' if value.endswith(('Z', 'z')) else value)
+            except ValueError:
+                raise ValueError(f"{key}는 ISO 형식 날짜여야 합니다. (예: 2025-09-01)")
+            # 저장된 created_at은 서버 로컬 시각(시간대 없음)이므로 시간대가 있으면 로컬 시각으로 변환
+            if parsed.tzinfo is not None:
+                parsed = parsed.astimezone().replace(tzinfo=None)
+            dates[key] = parsed.isoformat()
+        else:
+            dates[key] = None
+
+    author = (data.get('author') or '').strip() or None
+
+    return {
+        "top_k": top_k,
+        # 응답 similarity와 같은 % 단위로 받아 코사인 유사도로 변환
+        "min_similarity": min_similarity / 100 if min_similarity is not None else None,
+        "author": author,
+        "created_after": dates['created_after'],
+        "created_before": dates['created_before'],
+        # 기존 응답과 같이 기본은 전체 SQL 포함, false면 앞부분 sql_snippet만 반환
+        "include_sql": _parse_flag(data.get('include_sql'), 'include_sql', default=True),
+    }
+
+
+def _query_number(name, cast, default=None):
+    """숫자 쿼리 파라미터 (없으면 default, 숫자가 아니면 ValueError)"""
+    value = request.args.get(name, '').strip()
+    if not value:
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        kind = "정수" if cast is int else "숫자"
+        raise ValueError(f"{name}는 {kind}여야 합니다.")
+
+
+def _parse_flag(value, name, default=False):
+    """불리언 옵션 파싱 (JSON true/false 또는 문자열 true/false/1/0/yes/no)"""
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ('true', '1', 'yes'):
+        return True
+    if text in ('false', '0', 'no', ''):
+        return False
+    raise ValueError(f"{name}는 true 또는 false여야 합니다.")
@@ -0,0 +1,31 @@
+"""과제 JSON 파일 → SQLite 과제 저장소 마이그레이션
+
+backend 디렉터리에서 실행한다. 이미 있는 과제는 건너뛰므로 여러 번 실행해도 안전하다.
+
+    python -m scripts.migrate_tasks
+    python -m scripts.migrate_tasks --tasks-dir data/tasks --db-path data/tasks/tasks.db
+"""
+import sys
+import argparse
+import logging
+
+from config import task_store_config
+from services.task_store import SQLiteTaskStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="과제 JSON 파일을 SQLite 저장소로 가져오기")
+    parser.add_argument('--tasks-dir', default=task_store_config.tasks_dir)
+    parser.add_argument('--db-path', default=task_store_config.db_path)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    store = SQLiteTaskStore(args.db_path)
+    imported = store.import_from_directory(args.tasks_dir)
+    print(f"가져온 과제: {imported}개, 저장소 전체: {store.count()}개 ({args.db_path})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
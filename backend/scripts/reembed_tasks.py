@@ -0,0 +1,138 @@
+"""과제 임베딩 재생성 및 정확도 비교 도구
+
+backend 디렉터리에서 실행한다.
+
+    # 현재 임베딩(full precision)을 기준으로 축소 차원/int8 양자화 정확도 비교 (API 호출 없음)
+    python -m scripts.reembed_tasks --compare-only --dimensions 256 512
+
+    # EMBEDDING_DIMENSIONS 설정(또는 --dimensions)으로 전체 과제 재임베딩 후 기존 결과와 비교
+    python -m scripts.reembed_tasks --dimensions 256
+"""
+import os
+import sys
+import json
+import shutil
+import argparse
+import logging
+import numpy as np
+from dataclasses import replace
+
+from config import embedding_config
+from services.embedding_service import EmbeddingService, EmbeddingIndex, fit_dimensions
+from services.task_service import TaskService
+
+logger = logging.getLogger(__name__)
+
+
+def load_reference(path):
+    """기준(full precision) 임베딩 로드"""
+    with open(path, 'r') as f:
+        raw = json.load(f)
+    return {task_id: np.asarray(vec, dtype=np.float32) for task_id, vec in raw.items()}
+
+
+def recall_at_k(reference, vectors, top_k, quantize, rerank_factor):
+    """과제별 leave-one-out 검색으로 기준 대비 recall@k 계산"""
+    reference_index = EmbeddingIndex(reference)
+    index = EmbeddingIndex(vectors, quantize, rerank_factor)
+    ids = [task_id for task_id in reference if task_id in vectors]
+
+    recalls = []
+    for task_id in ids:
+        others = [other for other in ids if other != task_id]
+        if not others:
+            continue
+        expected = {t for t, _ in reference_index.search(reference[task_id], top_k, others)}
+        found = {t for t, _ in index.search(vectors[task_id], top_k, others)}
+        recalls.append(len(expected & found) / len(expected))
+
+    return float(np.mean(recalls)) if recalls else 1.0
+
+
+def print_comparison(reference, candidates, top_k, rerank_factor):
+    """설정별 정확도/메모리 비교표 출력"""
+    full_dim = max(vec.shape[0] for vec in reference.values())
+    print(f"\n과제 {len(reference)}개, 기준 {full_dim}차원 float, recall@{top_k}")
+    print(f"{'설정':<22}{'recall':>10}{'벡터당 바이트':>16}{'압축률':>10}")
+    print("-" * 58)
+
+    for label, vectors, quantize in candidates:
+        dim = max(vec.shape[0] for vec in vectors.values())
+        size = dim + 4 if quantize else dim * 4
+        recall = recall_at_k(reference, vectors, top_k, quantize, rerank_factor)
+        print(f"{label:<22}{recall:>10.3f}{size:>16}{full_dim * 4 / size:>9.1f}x")
+
+
+def truncated_candidates(reference, dimensions_list):
+    """기존 벡터를 잘라 축소 차원을 시뮬레이션"""
+    candidates = [("full float32", reference, False), ("full int8", reference, True)]
+    for dims in dimensions_list:
+        vectors = {task_id: fit_dimensions(vec, dims) for task_id, vec in reference.items()}
+        candidates.append((f"{dims}d float32", vectors, False))
+        candidates.append((f"{dims}d int8", vectors, True))
+    return candidates
+
+
+def reembed(dimensions):
+    """전체 과제를 지정 차원으로 재임베딩"""
+    config = replace(embedding_config, dimensions=dimensions or 0, backend='openai')
+    embedding_service = EmbeddingService(config=config)
+    task_service = TaskService(embedding_service=embedding_service)
+
+    tasks = task_service.get_all_tasks()
+    embeddings = {}
+    for idx, task in enumerate(tasks, 1):
+        text = TaskService.build_embedding_text(task)
+        embeddings[task['task_id']] = embedding_service.create_embedding(text)
+        print(f"  [{idx}/{len(tasks)}] {task['task_id']}")
+
+    embedding_service.replace_all(embeddings)
+    return {task_id: fit_dimensions(vec, dimensions) for task_id, vec in embeddings.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="과제 임베딩 재생성 / 정확도 비교")
+    parser.add_argument('--dimensions', type=int, nargs='*', default=None,
+                        help="임베딩 차원 (재임베딩 시 첫 번째 값 사용, 비교 시 전체 사용)")
+    parser.add_argument('--compare-only', action='store_true', help="API 호출 없이 현재 임베딩으로 비교만 수행")
+    parser.add_argument('--top-k', type=int, default=3)
+    parser.add_argument('--embeddings-file', default="data/tasks/embeddings.json")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    dimensions_list = args.dimensions or ([embedding_config.dimensions] if embedding_config.dimensions else [256, 512])
+
+    # 신규 설치 등 임베딩 파일이 없으면 비교 없이 재임베딩만 수행
+    reference = None
+    if os.path.exists(args.embeddings_file):
+        reference = load_reference(args.embeddings_file)
+    else:
+        print(f"임베딩 파일이 없습니다: {args.embeddings_file} (비교 생략)")
+
+    if args.compare_only:
+        if reference:
+            print_comparison(reference, truncated_candidates(reference, dimensions_list),
+                             args.top_k, embedding_config.rerank_factor)
+        return 0
+
+    # 기존 파일 백업 후 재임베딩
+    if reference is not None:
+        backup = args.embeddings_file + ".bak"
+        shutil.copyfile(args.embeddings_file, backup)
+        print(f"기존 임베딩 백업: {backup}")
+
+    dims = dimensions_list[0]
+    print(f"{dims}차원으로 재임베딩 시작")
+    vectors = reembed(dims)
+    if not reference or not vectors:
+        print(f"재임베딩 완료: {len(vectors)}개")
+        return 0
+
+    print_comparison(reference, [(f"{dims}d float32 (API)", vectors, False),
+                                 (f"{dims}d int8 (API)", vectors, True)],
+                     args.top_k, embedding_config.rerank_factor)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
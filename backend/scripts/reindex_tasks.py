@@ -0,0 +1,56 @@
+"""과제 임베딩 backfill / 전체 재임베딩
+
+backend 디렉터리에서 실행한다. 서버와 같은 파일 잠금을 사용하므로 서버 실행 중에도 안전하다.
+
+    # 임베딩이 없는 과제만 생성
+    python -m scripts.reindex_tasks --missing-only
+
+    # 전체 과제 재임베딩 (모델/차원 변경 후)
+    python -m scripts.reindex_tasks
+"""
+import sys
+import argparse
+import logging
+from dataclasses import replace
+
+from config import embedding_worker_config
+from services.embedding_service import EmbeddingService
+from services.embedding_worker import EmbeddingWorker
+from services.task_service import TaskService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="과제 임베딩 backfill / 전체 재임베딩")
+    parser.add_argument('--missing-only', action='store_true', help="임베딩이 없는 과제만 생성")
+    parser.add_argument('--batch-size', type=int, default=embedding_worker_config.batch_size)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    embedding_service = EmbeddingService()
+    task_service = TaskService(embedding_service=embedding_service)
+    config = replace(embedding_worker_config, batch_size=args.batch_size, batch_wait=0)
+    worker = EmbeddingWorker(embedding_service, task_service, config)
+
+    # 스레드 없이 현재 프로세스에서 바로 실행
+    if args.missing_only:
+        task_ids = [task['task_id'] for task in task_service.get_all_tasks(include_sql=False)]
+        missing = set()
+        for name in embedding_service.backends:
+            missing.update(embedding_service.missing_ids(task_ids, name))
+        missing = [task_id for task_id in task_ids if task_id in missing]
+        embedded = set()
+        for start in range(0, len(missing), config.batch_size):
+            embedded |= worker.embed_tasks(missing[start:start + config.batch_size])
+        # 실행 중 삭제된 과제는 실패로 세지 않음
+        failed = [task_id for task_id in missing if task_id not in embedded and task_service.task_exists(task_id)]
+        print(f"임베딩 생성: {len(embedded)}개 / 누락 {len(missing)}개 (실패 {len(failed)}개)")
+        return 0 if not failed else 1
+
+    status = worker.reindex()
+    print(f"재임베딩 결과: {status}")
+    return 0 if status["state"] == "done" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,60 @@
+import time
 import requests
 import json
 import logging
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout, as_completed
+from requests.adapters import HTTPAdapter
 from config import abc_lab_config
+from services.metrics import ABC_LAB_REQUEST_DURATION, ABC_LAB_HEDGES
+from services.tracing import span, traced
+from services.admission import get_limiter, Saturated
+from services.circuit_breaker import CircuitBreaker, CircuitOpen, CLOSED
 
 logger = logging.getLogger(__name__)
 
 class ABCLabService:
     """ABC Lab API 호출 서비스"""
+
+    # 프로세스 공유 세션 (TLS 연결 재사용)
+    _session = None
+    _session_lock = threading.Lock()
+
+    # 오류가 이어지면 타임아웃까지 기다리지 않고 바로 실패 (AI SQL 생성은 원본 INSERT문 사용)
+    # 느린 호출 기준은 검증 호출에만 적용 (생성 호출은 타임아웃 안에서 오래 걸리는 것이 정상)
+    breaker = CircuitBreaker(
+        "abc_lab",
+        window=abc_lab_config.breaker_window,
+        min_calls=abc_lab_config.breaker_min_calls,
+        failure_rate=abc_lab_config.breaker_failure_rate,
+        open_seconds=abc_lab_config.breaker_open_seconds,
+    ) if abc_lab_config.breaker_enabled else None
+
+    # 검증 중복 요청용 스레드 풀과 최근 검증 응답 시간(초)
+    _executor = None
+    _verify_latencies = deque(maxlen=200)
+
+    @staticmethod
+    def get_session():
+        """ABC Lab API 세션 반환 (없으면 생성)"""
+        if ABCLabService._session is None:
+            with ABCLabService._session_lock:
+                if ABCLabService._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=abc_lab_config.pool_size)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    ABCLabService._session = session
+        return ABCLabService._session
+
+    @staticmethod
+    def reset_session():
+        """fork 이후 상속된 세션/스레드 풀 폐기 (부모 프로세스 연결은 닫지 않음)"""
+        with ABCLabService._session_lock:
+            ABCLabService._session = None
+            ABCLabService._executor = None
     
     @staticmethod
     def validate_sql(sql_data):
@@ -20,10 +68,16 @@ class ABCLabService:
                 "user": abc_lab_config.user,
             }
             
-            response = ABCLabService._make_request(payload)
+            # 검증은 같은 요청을 다시 보내도 결과가 같으므로 응답이 늦으면 중복 요청 허용
+            if abc_lab_config.hedge_enabled:
+                response = ABCLabService._hedged_request(payload)
+            else:
+                response = ABCLabService._make_request(payload, slow_call=abc_lab_config.breaker_slow_call)
             logger.info("SQL 검증 API 호출 성공")
             return response
-            
+
+        except (Saturated, CircuitOpen):
+            raise
         except Exception as e:
             logger.error(f"SQL 검증 API 호출 실패: {e}")
             raise Exception(f"SQL 검증 실패: {str(e)}")
@@ -58,33 +112,53 @@ class ABCLabService:
             
             return response
 
+        except (Saturated, CircuitOpen):
+            raise
         except Exception as e:
             logger.error(f"AI SQL 생성 API 호출 실패: {e}")
             raise Exception(f"AI SQL 생성 실패: {str(e)}")
 
     @staticmethod
-    def _make_request(payload):
-        """ABC Lab API 요청 공통 처리"""
+    def _make_request(payload, slow_call=None):
+        """ABC Lab API 요청 공통 처리 (slow_call초 이상 걸린 응답은 차단기에 실패로 기록)"""
         headers = {
             "Authorization": f"Bearer {abc_lab_config.api_key}",
             "Content-Type": "application/json",
             "User-Agent": "curl/7.68.0"
         }
 
+        breaker = ABCLabService.breaker
+        if breaker is not None:
+            breaker.allow()
+
+        started = time.perf_counter()
+        request_started = None
+        status = "error"
         try:
-            response = requests.post(
-                abc_lab_config.api_url,
-                headers=headers,
-                json=payload,
-                timeout=abc_lab_config.timeout
-            )
-            response.raise_for_status()
+            with get_limiter("abc_lab").acquire(), span("abc_lab.request") as request_span:
+                request_started = time.perf_counter()
+                response = ABCLabService.get_session().post(
+                    abc_lab_config.api_url,
+                    headers=headers,
+                    json=payload,
+                    timeout=abc_lab_config.timeout
+                )
+                status = response.status_code
+                request_span.set(status=status, bytes=len(response.content))
+                response.raise_for_status()
 
             data = response.json()
             result = data.get("answer", "")
             
             return result
 
+        except Saturated:
+            status = "rejected"
+            raise
+        except requests.Timeout as e:
+            status = "timeout"
+            logger.error(f"ABC Lab API 요청 실패: {e}")
+            raise Exception(f"ABC Lab API 네트워크 오류: {str(e)}")
         except requests.RequestException as e:
             logger.error(f"ABC Lab API 요청 실패: {e}")
             raise Exception(f"ABC Lab API 네트워크 오류: {str(e)}")
@@ -94,10 +168,86 @@ class ABCLabService:
         except Exception as e:
             logger.error(f"ABC Lab API 호출 중 예상치 못한 오류: {e}")
             raise Exception(f"ABC Lab API 처리 실패: {str(e)}")
+        finally:
+            ABC_LAB_REQUEST_DURATION.observe(time.perf_counter() - started, status=status)
+            if breaker is not None:
+                if request_started is None:
+                    # 동시 처리 제한으로 보내지 못한 요청은 차단 판단에서 제외
+                    breaker.cancel()
+                else:
+                    breaker.record(not ABCLabService._upstream_failed(status),
+                                   time.perf_counter() - request_started, slow_call)
+
+    @staticmethod
+    def _upstream_failed(status):
+        """ABC Lab 장애로 볼 결과 (타임아웃, 네트워크 오류, 5xx, 429)"""
+        if isinstance(status, int):
+            return status >= 500 or status == 429
+        return status in ("timeout", "error")
+
+    @staticmethod
+    def _get_executor():
+        if ABCLabService._executor is None:
+            with ABCLabService._session_lock:
+                if ABCLabService._executor is None:
+                    ABCLabService._executor = ThreadPoolExecutor(
+                        max_workers=abc_lab_config.pool_size, thread_name_prefix="abc-lab-hedge")
+        return ABCLabService._executor
+
+    @staticmethod
+    def hedge_delay():
+        """중복 요청까지 기다릴 시간(초) - 최근 검증 응답 시간의 hedge_quantile 분위수"""
+        config = abc_lab_config
+        samples = sorted(ABCLabService._verify_latencies)
+        if len(samples) < config.hedge_min_samples:
+            return config.hedge_default_delay
+        index = min(len(samples) - 1, int(config.hedge_quantile * len(samples)))
+        return max(config.hedge_min_delay, samples[index])
+
+    @staticmethod
+    def _timed_request(payload):
+        started = time.perf_counter()
+        result = ABCLabService._make_request(payload, slow_call=abc_lab_config.breaker_slow_call)
+        ABCLabService._verify_latencies.append(time.perf_counter() - started)
+        return result
+
+    @staticmethod
+    def _hedged_request(payload):
+        """멱등 요청 중복 전송 - 기다려도 응답이 없으면 같은 요청을 한 번 더 보내고 먼저 성공한 응답 사용
+
+        먼저 끝난 요청이 실패하면 나머지 요청을 기다린다. 늦은 요청은 취소할 수 없으므로 끝까지 실행된다.
+        """
+        executor = ABCLabService._get_executor()
+        # 구간 추적 컨텍스트를 스레드 풀에서도 사용 (요청마다 별도 복사본)
+        primary = executor.submit(contextvars.copy_context().run, ABCLabService._timed_request, payload)
+        try:
+            return primary.result(timeout=ABCLabService.hedge_delay())
+        except FutureTimeout:
+            pass
+
+        breaker = ABCLabService.breaker
+        if breaker is not None and breaker.state != CLOSED:
+            return primary.result()
+
+        ABC_LAB_HEDGES.inc(result="sent")
+        hedge = executor.submit(contextvars.copy_context().run, ABCLabService._timed_request, payload)
+        errors = {}
+        for future in as_completed([primary, hedge]):
+            try:
+                result = future.result()
+            except Exception as e:
+                errors[future] = e
+                continue
+            if future is hedge:
+                ABC_LAB_HEDGES.inc(result="won")
+                logger.info("ABC Lab 검증 중복 요청 응답 사용")
+            return result
+        raise errors.get(primary) or errors[hedge]
 
     @staticmethod
+    @traced("abc_lab.parse")
     def parse_insert_statements(api_response):
-        """ABC Lab API 응답을 INSERT문 리스트로 파싱"""
+        """ABC Lab API 응답을 INSERT문 리스트로 파싱 (diff 모드의 UPDATE문 포함)"""
         try:
             if not api_response:
                 return []
@@ -108,8 +258,8 @@ class ABCLabService:
 
             for line in lines:
                 line = line.strip()
-                # INSERT문만 추출 (주석, 빈 줄 제외)
-                if line.startswith('INSERT INTO') and line.endswith(';'):
+                # INSERT/UPDATE문만 추출 (주석, 빈 줄 제외)
+                if line.startswith(('INSERT INTO', 'UPDATE ')) and line.endswith(';'):
                     insert_statements.append(line)
 
             logger.info(f"API 응답에서 {len(insert_statements)}개의 INSERT문 파싱 완료")
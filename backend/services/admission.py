@@ -0,0 +1,165 @@
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from flask import jsonify
+from config import admission_config, db_config
+from services.circuit_breaker import CircuitOpen
+from services.metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_DEPTH, ADMISSION_WAIT, ADMISSION_REJECTED
+
+logger = logging.getLogger(__name__)
+
+
+class Saturated(Exception):
+    """동시 처리 한도와 대기열이 모두 찬 경우 (503 + Retry-After 응답)"""
+
+    def __init__(self, limiter, reason, retry_after):
+        super().__init__(f"{limiter} 요청이 많아 처리할 수 없습니다. ({reason})")
+        self.limiter = limiter
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Ticket:
+    """대기열 자리 (반납된 처리 슬롯을 직접 넘겨받으면 granted)"""
+
+    __slots__ = ("cond", "granted")
+
+    def __init__(self, lock):
+        self.cond = threading.Condition(lock)
+        self.granted = False
+
+
+class ConcurrencyLimiter:
+    """외부 호출 동시 처리 제한 (한도 초과 시 대기열에서 최대 queue_timeout초 대기, 대기열이 차면 즉시 거절)
+
+    반납된 슬롯은 대기열 맨 앞 요청에 바로 넘기므로 새 요청이 대기 중인 요청을 앞지르지 않는다 (FIFO).
+    limit이 0 이하이면 제한하지 않고 처리 수만 기록한다.
+    """
+
+    def __init__(self, name, limit, queue_size=0, queue_timeout=0.0, retry_after=1):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._queue = deque()
+
+    @property
+    def waiting(self):
+        return len(self._queue)
+
+    @contextmanager
+    def acquire(self):
+        self._enter()
+        try:
+            yield self
+        finally:
+            self._leave()
+
+    def _enter(self):
+        started = time.perf_counter()
+        with self._lock:
+            if (self.limit <= 0 or self.in_flight < self.limit) and not self._queue:
+                self.in_flight += 1
+                ADMISSION_WAIT.observe(0, limiter=self.name, outcome="admitted")
+                return
+            if len(self._queue) >= self.queue_size:
+                self._reject("queue_full", started)
+
+            ticket = _Ticket(self._lock)
+            self._queue.append(ticket)
+            deadline = started + self.queue_timeout
+            while not ticket.granted:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._queue.remove(ticket)
+                    self._reject("timeout", started)
+                ticket.cond.wait(remaining)
+        ADMISSION_WAIT.observe(time.perf_counter() - started, limiter=self.name, outcome="admitted")
+
+    def _leave(self):
+        with self._lock:
+            if self._queue:
+                # 슬롯을 반납하지 않고 맨 앞 대기 요청에 그대로 넘긴다 (in_flight 유지)
+                ticket = self._queue.popleft()
+                ticket.granted = True
+                ticket.cond.notify()
+            else:
+                self.in_flight -= 1
+
+    def _reject(self, reason, started):
+        ADMISSION_WAIT.observe(time.perf_counter() - started, limiter=self.name, outcome="rejected")
+        ADMISSION_REJECTED.inc(limiter=self.name, reason=reason)
+        logger.warning(f"{self.name} 동시 처리 한도 초과로 거절 ({reason}, 처리 중 {self.in_flight}, 대기 {self.waiting})")
+        raise Saturated(self.name, reason, self.retry_after)
+
+
+# 제한 대상별 limiter {이름: ConcurrencyLimiter}
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def _settings(name):
+    """제한 대상 이름(abc_lab, openai, db:<접속 정보>) → (limit, queue_size, queue_timeout)"""
+    config = admission_config
+    if not config.enabled:
+        return 0, 0, 0.0
+    kind = name.split(":", 1)[0]
+    if kind == "abc_lab":
+        return config.abc_lab_limit, config.abc_lab_queue, config.abc_lab_queue_timeout
+    if kind == "openai":
+        return config.openai_limit, config.openai_queue, config.openai_queue_timeout
+    if kind == "db":
+        return config.db_limit or db_config.pool_max, config.db_queue, config.db_queue_timeout
+    raise ValueError(f"알 수 없는 제한 대상: {name}")
+
+
+def get_limiter(name):
+    """이름별 limiter 반환 (없으면 설정값으로 생성)"""
+    limiter = _limiters.get(name)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(name)
+            if limiter is None:
+                limit, queue_size, queue_timeout = _settings(name)
+                limiter = ConcurrencyLimiter(name, limit, queue_size, queue_timeout, admission_config.retry_after)
+                _limiters[name] = limiter
+    return limiter
+
+
+def reset_limiters():
+    """fork 이후 상속된 limiter 폐기 (부모 프로세스 처리 수/잠금 상태 제거)"""
+    global _limiters_lock
+    _limiters.clear()
+    _limiters_lock = threading.Lock()
+
+
+def _unavailable(code, error):
+    response = jsonify({
+        "success": False,
+        "error": {"code": code, "message": str(error)},
+        "timestamp": None
+    })
+    response.status_code = 503
+    response.headers["Retry-After"] = str(error.retry_after)
+    return response
+
+
+def init_admission(app):
+    """동시 처리 한도 초과 / 외부 API 차단 응답 등록 (503 + Retry-After)"""
+
+    @app.errorhandler(Saturated)
+    def handle_saturated(error):
+        return _unavailable("SERVER_BUSY", error)
+
+    @app.errorhandler(CircuitOpen)
+    def handle_circuit_open(error):
+        return _unavailable("UPSTREAM_UNAVAILABLE", error)
+
+
+ADMISSION_IN_FLIGHT.set_function(lambda: {(name,): limiter.in_flight for name, limiter in list(_limiters.items())})
+ADMISSION_QUEUE_DEPTH.set_function(lambda: {(name,): limiter.waiting for name, limiter in list(_limiters.items())})
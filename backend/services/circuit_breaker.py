@@ -0,0 +1,103 @@
+import math
+import time
+import logging
+import threading
+from collections import deque
+from services.metrics import CIRCUIT_STATE, CIRCUIT_REJECTED, CIRCUIT_TRANSITIONS
+
+logger = logging.getLogger(__name__)
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+# mzn_circuit_state 게이지 값
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpen(Exception):
+    """차단기가 열려 외부 호출을 보내지 않은 경우 (503 + Retry-After, AI SQL 생성은 원본 사용)"""
+
+    def __init__(self, name, retry_after):
+        super().__init__(f"{name} 응답 지연/오류로 호출이 일시 차단되었습니다. ({retry_after}초 후 재시도)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """오류/지연 비율 기반 차단기
+
+    최근 window건 중 실패(오류, slow_call초 이상 지연) 비율이 failure_rate 이상이면 열려서 open_seconds 동안
+    호출 없이 CircuitOpen을 발생시킨다. 이후 시험 호출 1건을 허용해(half_open) 성공하면 닫고, 실패하면 다시 연다.
+    """
+
+    def __init__(self, name, window=20, min_calls=5, failure_rate=0.5, slow_call=None, open_seconds=30.0,
+                 clock=time.monotonic):
+        self.name = name
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call = slow_call
+        self.open_seconds = open_seconds
+        self.clock = clock
+        self.state = CLOSED
+        self._outcomes = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._trial = False
+        self._lock = threading.Lock()
+        _breakers[name] = self
+
+    def allow(self):
+        """호출 허용 여부 확인 (차단 중이면 CircuitOpen)"""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            remaining = self._opened_at + self.open_seconds - self.clock()
+            if self.state == OPEN and remaining <= 0:
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN and not self._trial:
+                self._trial = True
+                return
+        CIRCUIT_REJECTED.inc(breaker=self.name)
+        raise CircuitOpen(self.name, max(1, math.ceil(remaining)))
+
+    def record(self, success, duration=None, slow_call=None):
+        """호출 결과 기록 (지연 기준을 넘으면 성공 응답도 실패로 계산, slow_call을 주면 호출별 기준 사용)"""
+        slow_call = self.slow_call if slow_call is None else slow_call
+        failed = not success or (slow_call is not None and duration is not None and duration >= slow_call)
+        with self._lock:
+            if self.state == HALF_OPEN and self._trial:
+                self._trial = False
+                if failed:
+                    self._open("시험 호출 실패")
+                else:
+                    self._outcomes.clear()
+                    self._transition(CLOSED)
+                return
+            if self.state != CLOSED:
+                return
+            self._outcomes.append(failed)
+            if len(self._outcomes) >= self.min_calls and sum(self._outcomes) / len(self._outcomes) >= self.failure_rate:
+                self._open(f"최근 {len(self._outcomes)}건 중 실패 {sum(self._outcomes)}건")
+
+    def cancel(self):
+        """결과 없이 끝난 호출 (동시 처리 제한 거절 등) - 시험 호출 기회 반환"""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._trial = False
+
+    def _open(self, reason):
+        self._opened_at = self.clock()
+        self._outcomes.clear()
+        self._transition(OPEN)
+        logger.warning(f"{self.name} 차단기 열림 ({self.open_seconds:.0f}초, {reason})")
+
+    def _transition(self, state):
+        if state != self.state:
+            self.state = state
+            CIRCUIT_TRANSITIONS.inc(breaker=self.name, state=state)
+            if state == CLOSED:
+                logger.info(f"{self.name} 차단기 닫힘 (시험 호출 성공)")
+
+
+# 이름별 차단기 (상태 게이지 출력용)
+_breakers = {}
+
+CIRCUIT_STATE.set_function(lambda: {(name,): STATE_VALUES[breaker.state] for name, breaker in list(_breakers.items())})
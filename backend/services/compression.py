@@ -0,0 +1,112 @@
+import zlib
+from flask import request
+from config import compression_config
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 압축 대상 Content-Type
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "application/sql",
+                      "application/javascript", "application/xml", "text/")
+
+
+def available_encodings():
+    """서버에서 지원하는 압축 방식 (선호 순)"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encodings):
+    """Accept-Encoding 협상 (q값이 가장 높은 방식, 같으면 br 우선) - 없으면 None"""
+    best, best_quality = None, 0
+    for encoding in available_encodings():
+        quality = accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def _gzip_compressor(level):
+    # wbits 31 = gzip 헤더/트레일러 포함
+    return zlib.compressobj(level, zlib.DEFLATED, 31)
+
+
+def compress_body(data, encoding, config=None):
+    """전체 본문 압축"""
+    config = config or compression_config
+    if encoding == "br":
+        return brotli.compress(data, quality=config.brotli_quality)
+    compressor = _gzip_compressor(config.gzip_level)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks, encoding, config=None):
+    """스트리밍 응답 압축 (청크마다 flush 해서 클라이언트가 바로 받을 수 있게)"""
+    config = config or compression_config
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=config.brotli_quality)
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+
+    compressor = _gzip_compressor(config.gzip_level)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _compressible(response):
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    if "Content-Encoding" in response.headers:
+        return False
+    return response.mimetype.startswith(COMPRESSIBLE_TYPES)
+
+
+def init_compression(app, config=None):
+    """Accept-Encoding 협상 기반 응답 압축 (gzip, brotli 설치 시 br)
+
+    일반 응답은 min_size 이상일 때만 압축하고, 스트리밍 응답은 청크 단위로 압축한다.
+    다른 after_request 훅(추적 정보 추가 등)이 끝난 뒤 실행되도록 가장 먼저 등록한다.
+    """
+    config = config or compression_config
+    if not config.enabled:
+        return
+
+    @app.after_request
+    def compress_response(response):
+        if request.method == "HEAD" or not _compressible(response):
+            return response
+        response.vary.add("Accept-Encoding")
+
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            if not config.streaming:
+                return response
+            response.response = compress_stream(response.response, encoding, config)
+            response.headers.pop("Content-Length", None)
+            response.headers["Content-Encoding"] = encoding
+            return response
+
+        if response.direct_passthrough:
+            return response
+        data = response.get_data()
+        if len(data) < config.min_size:
+            return response
+
+        response.set_data(compress_body(data, encoding, config))
+        response.headers["Content-Encoding"] = encoding
+        return response
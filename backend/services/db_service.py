@@ -1,13 +1,143 @@
+import json
+import time
 import psycopg2
 import logging
-from flask import session
+import threading
+from contextlib import contextmanager
+from psycopg2.pool import ThreadedConnectionPool
+from flask import session, has_request_context
 from config import db_config
+from services.metrics import DB_QUERY_DURATION, DB_QUERY_ROWS, DB_QUERY_ERRORS, DB_POOL_CONNECTIONS, record_cache
+from services.tracing import span
+from services.admission import get_limiter
+from services.row_transformer import quote_ident
 
 logger = logging.getLogger(__name__)
 
+class _ProfilePool:
+    """접속 정보 하나의 연결 풀 (대여 중/유휴 연결 수를 직접 센다)"""
+
+    def __init__(self, params):
+        host, port, database, user, password = params
+        self.pool = ThreadedConnectionPool(
+            db_config.pool_min, db_config.pool_max,
+            host=host, port=port, database=database, user=user, password=password
+        )
+        self.in_use = 0
+        # ThreadedConnectionPool은 반환된 연결을 minconn개까지만 유휴로 남긴다
+        self.idle = db_config.pool_min
+
+
 class DatabaseService:
     """데이터베이스 관련 서비스"""
-    
+
+    # 접속 정보별 연결 풀 {(host, port, database, user, password): _ProfilePool} (오래 안 쓴 순서)
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    # 테이블 컬럼/기본키 캐시 {(종류, host, port, database, user, schema, table): (조회 시각, 값)}
+    _columns_cache = {}
+    COLUMNS_CACHE_SIZE = 1000
+
+    @staticmethod
+    def _connection_params():
+        """현재 요청의 접속 정보 (세션 정보 우선, 없으면 기본 설정)"""
+        if has_request_context() and all(key in session for key in ["DB_HOST", "DB_NAME", "DB_PORT", "DB_USER", "DB_PASS"]):
+            return (session["DB_HOST"], session["DB_PORT"], session["DB_NAME"], session["DB_USER"], session["DB_PASS"])
+        return (db_config.host, db_config.port, db_config.database, db_config.user, db_config.password)
+
+    @staticmethod
+    def _checkout(params):
+        """접속 정보별 연결 풀을 대여 중으로 표시해 반환 (없으면 생성, 풀 수가 한도를 넘으면 오래 안 쓴 유휴 풀 종료)"""
+        with DatabaseService._pools_lock:
+            pools = DatabaseService._pools
+            profile = pools.pop(params, None)
+            if profile is None:
+                profile = _ProfilePool(params)
+                host, port, database, _, _ = params
+                logger.info(f"데이터베이스 연결 풀 생성: {host}:{port}/{database} "
+                            f"({db_config.pool_min}~{db_config.pool_max})")
+                DatabaseService._evict_pools(db_config.pool_max_profiles - 1)
+            pools[params] = profile
+            profile.in_use += 1
+            if profile.idle:
+                profile.idle -= 1
+            return profile
+
+    @staticmethod
+    def _checkin(profile, closed):
+        """대여 해제 (닫은 연결은 유휴 수에 넣지 않음)"""
+        with DatabaseService._pools_lock:
+            profile.in_use -= 1
+            if not closed and profile.idle < db_config.pool_min:
+                profile.idle += 1
+
+    @staticmethod
+    def _evict_pools(limit):
+        """풀 수가 limit 이하가 되도록 대여 중이 아닌 풀을 오래 안 쓴 순서로 종료 (_pools_lock 안에서 호출)"""
+        pools = DatabaseService._pools
+        for params in list(pools):
+            if len(pools) <= limit:
+                break
+            profile = pools[params]
+            if profile.in_use:
+                continue
+            del pools[params]
+            profile.pool.closeall()
+            host, port, database, _, _ = params
+            logger.info(f"데이터베이스 연결 풀 종료 (접속 정보 {limit}개 초과): {host}:{port}/{database}")
+
+    @staticmethod
+    @contextmanager
+    def connection():
+        """연결 풀에서 연결을 빌려 사용 후 반환 (트랜잭션은 롤백 후 반환)
+
+        접속 정보별 동시 사용 수를 제한해 풀이 고갈되면 오류 대신 대기하고, 대기열이 차면 Saturated를 발생시킨다.
+        """
+        params = DatabaseService._connection_params()
+        host, port, database, user, _ = params
+        with get_limiter(f"db:{user}@{host}:{port}/{database}").acquire():
+            profile = DatabaseService._checkout(params)
+            conn = None
+            try:
+                conn = profile.pool.getconn()
+                yield conn
+            finally:
+                # 끊어진 연결은 풀에서 제거, 정상 연결은 열린 트랜잭션 정리 후 반환
+                broken = True
+                if conn is not None:
+                    broken = bool(conn.closed)
+                    if not broken:
+                        try:
+                            conn.rollback()
+                        except psycopg2.Error:
+                            broken = True
+                    profile.pool.putconn(conn, close=broken)
+                DatabaseService._checkin(profile, broken)
+
+    @staticmethod
+    def reset_pools():
+        """fork 이후 상속된 연결 풀 폐기 (부모 프로세스 소켓을 닫지 않도록 close 하지 않음)"""
+        DatabaseService._pools_lock = threading.Lock()
+        DatabaseService._pools = {}
+
+    @staticmethod
+    def pool_usage():
+        """연결 풀 사용 현황 {(state,): 연결 수} (모든 접속 정보 합계)"""
+        with DatabaseService._pools_lock:
+            profiles = list(DatabaseService._pools.values())
+            in_use = sum(profile.in_use for profile in profiles)
+            idle = sum(profile.idle for profile in profiles)
+        return {("in_use",): in_use, ("idle",): idle, ("max",): db_config.pool_max * len(profiles)}
+
+    @staticmethod
+    def close_pools():
+        """모든 연결 풀 종료"""
+        with DatabaseService._pools_lock:
+            for profile in DatabaseService._pools.values():
+                profile.pool.closeall()
+            DatabaseService._pools = {}
+
     @staticmethod
     def get_connection():
         """데이터베이스 연결 반환"""
@@ -65,72 +195,176 @@ class DatabaseService:
             return False, f"예상치 못한 오류: {str(e)}"
 
     @staticmethod
-    def get_table_columns(schema, table_name):
-        """테이블의 컬럼 정보 조회"""
+    def clear_column_cache():
+        """테이블 컬럼/기본키 캐시 비우기 (스키마 변경 후)"""
+        DatabaseService._columns_cache = {}
+
+    @staticmethod
+    def _cached_lookup(kind, schema, table_name, loader):
+        """테이블 메타데이터 조회 (접속 정보별로 DB_COLUMN_CACHE_TTL초 동안 캐시)"""
         if not schema or not table_name:
             raise ValueError("스키마와 테이블명이 필요합니다.")
 
-        conn = None
-        cursor = None
+        host, port, database, user, _ = DatabaseService._connection_params()
+        cache_key = (kind, host, port, database, user, schema, table_name)
+        ttl = db_config.column_cache_ttl
+        cached = DatabaseService._columns_cache.get(cache_key) if ttl > 0 else None
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            record_cache(kind, True)
+            return cached[1]
 
-        try:
-            conn = DatabaseService.get_connection()
-            cursor = conn.cursor()
+        value = loader(schema, table_name)
+        if ttl > 0:
+            record_cache(kind, False)
+            # 없는 테이블은 곧 생성될 수 있으므로 캐시하지 않음
+            if value:
+                cache = DatabaseService._columns_cache
+                cache.pop(cache_key, None)
+                cache[cache_key] = (time.monotonic(), value)
+                while len(cache) > DatabaseService.COLUMNS_CACHE_SIZE:
+                    cache.pop(next(iter(cache)), None)
+        return value
 
+    @staticmethod
+    def get_table_columns(schema, table_name):
+        """테이블의 컬럼 정보 조회 (캐시)"""
+        return DatabaseService._cached_lookup("table_columns", schema, table_name,
+                                              DatabaseService._query_table_columns)
 
-            # SQL 인젝션 방지를 위한 파라미터화된 쿼리
-            query = """
-                SELECT column_name, udt_name 
-                FROM information_schema.columns 
-                WHERE table_schema = %s AND table_name = %s
-                ORDER BY ordinal_position
-            """
+    @staticmethod
+    def get_primary_key(schema, table_name):
+        """테이블 기본키 컬럼명 목록 (없으면 빈 목록, 캐시)"""
+        return DatabaseService._cached_lookup("primary_key", schema, table_name,
+                                              DatabaseService._query_primary_key)
 
-            cursor.execute(query, (schema, table_name))
-            columns = cursor.fetchall()
+    @staticmethod
+    def _query_table_columns(schema, table_name):
+        """information_schema에서 컬럼 정보 조회"""
+        started = time.perf_counter()
+        try:
+            with span("db.columns", table=f"{schema}.{table_name}"), \
+                    DatabaseService.connection() as conn, conn.cursor() as cursor:
+                # SQL 인젝션 방지를 위한 파라미터화된 쿼리
+                query = """
+                    SELECT column_name, udt_name 
+                    FROM information_schema.columns 
+                    WHERE table_schema = %s AND table_name = %s
+                    ORDER BY ordinal_position
+                """
+
+                cursor.execute(query, (schema, table_name))
+                columns = cursor.fetchall()
 
+            DB_QUERY_ROWS.observe(len(columns), operation="get_table_columns")
             logger.info(f"테이블 {schema}.{table_name}에서 {len(columns)}개의 컬럼 조회 완료")
             return columns
 
         except psycopg2.Error as e:
             logger.error(f"컬럼 조회 중 데이터베이스 오류: {e}")
+            DB_QUERY_ERRORS.inc(operation="get_table_columns")
             raise
         except Exception as e:
             logger.error(f"컬럼 조회 중 예상치 못한 오류: {e}")
+            DB_QUERY_ERRORS.inc(operation="get_table_columns")
             raise
         finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
+            DB_QUERY_DURATION.observe(time.perf_counter() - started, operation="get_table_columns")
 
     @staticmethod
-    def execute_query(query):
-        """쿼리 실행 및 결과 반환"""
-        conn = None
-        cursor = None
+    def _query_primary_key(schema, table_name):
+        """information_schema에서 기본키 컬럼 조회 (키 순서대로)"""
+        started = time.perf_counter()
+        try:
+            with span("db.primary_key", table=f"{schema}.{table_name}"), \
+                    DatabaseService.connection() as conn, conn.cursor() as cursor:
+                query = """
+                    SELECT kcu.column_name
+                    FROM information_schema.table_constraints tc
+                    JOIN information_schema.key_column_usage kcu
+                      ON kcu.constraint_name = tc.constraint_name
+                     AND kcu.table_schema = tc.table_schema
+                     AND kcu.table_name = tc.table_name
+                    WHERE tc.constraint_type = 'PRIMARY KEY' AND tc.table_schema = %s AND tc.table_name = %s
+                    ORDER BY kcu.ordinal_position
+                """
 
+                cursor.execute(query, (schema, table_name))
+                key_columns = [row[0] for row in cursor.fetchall()]
+
+            logger.info(f"테이블 {schema}.{table_name} 기본키: {', '.join(key_columns) or '없음'}")
+            return key_columns
+
+        except Exception as e:
+            logger.error(f"기본키 조회 중 오류: {e}")
+            DB_QUERY_ERRORS.inc(operation="get_primary_key")
+            raise
+        finally:
+            DB_QUERY_DURATION.observe(time.perf_counter() - started, operation="get_primary_key")
+
+    @staticmethod
+    def estimate_row_count(schema, table_name, condition=""):
+        """테이블 건수 추정 - 조건 없으면 pg_class.reltuples, 있으면 EXPLAIN 예상 행 수 (실제 조회 없음)
+
+        condition은 where_condition()으로 정리한 조건식이며, 미리보기 SELECT와 같게 괄호로 감싼다.
+
+        반환: {"estimated_total": 건수 또는 None(통계 없음), "estimate_source": "reltuples" | "explain"}
+        """
+        started = time.perf_counter()
         try:
-            conn = DatabaseService.get_connection()
-            cursor = conn.cursor()
+            with span("db.estimate", table=f"{schema}.{table_name}"), \
+                    DatabaseService.connection() as conn, conn.cursor() as cursor:
+                if condition:
+                    cursor.execute(f"EXPLAIN (FORMAT JSON) SELECT 1 FROM {quote_ident(schema)}.{quote_ident(table_name)} "
+                                   f"WHERE ({condition})")
+                    plan = cursor.fetchone()[0]
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    return {"estimated_total": int(plan[0]["Plan"]["Plan Rows"]), "estimate_source": "explain"}
 
-            logger.info(f"쿼리 실행: {query[:100]}...")
-            cursor.execute(query)
-            
-            rows = cursor.fetchall()
-            colnames = [desc[0] for desc in cursor.description]
+                cursor.execute("""
+                    SELECT c.reltuples::bigint
+                    FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+                    WHERE n.nspname = %s AND c.relname = %s
+                """, (schema, table_name))
+                row = cursor.fetchone()
+                # 한 번도 ANALYZE 되지 않은 테이블은 -1 (PostgreSQL 14 이상) 또는 0
+                estimate = int(row[0]) if row and row[0] is not None and row[0] >= 0 else None
+                return {"estimated_total": estimate, "estimate_source": "reltuples"}
+
+        except psycopg2.Error as e:
+            logger.warning(f"건수 추정 실패 ({schema}.{table_name}): {e}")
+            DB_QUERY_ERRORS.inc(operation="estimate_row_count")
+            return {"estimated_total": None, "estimate_source": None}
+        finally:
+            DB_QUERY_DURATION.observe(time.perf_counter() - started, operation="estimate_row_count")
 
+    @staticmethod
+    def execute_query(query, params=None):
+        """쿼리 실행 및 결과 반환 (params는 %s 자리 값)"""
+        started = time.perf_counter()
+        try:
+            with span("db.query") as query_span, DatabaseService.connection() as conn, conn.cursor() as cursor:
+                logger.info(f"쿼리 실행: {query[:100]}...")
+                cursor.execute(query, params)
+
+                rows = cursor.fetchall()
+                colnames = [desc[0] for desc in cursor.description]
+                query_span.set(rows=len(rows))
+
+            DB_QUERY_ROWS.observe(len(rows), operation="execute_query")
             logger.info(f"쿼리 실행 완료: {len(rows)}건 조회")
             return rows, colnames
 
         except psycopg2.Error as e:
             logger.error(f"쿼리 실행 중 데이터베이스 오류: {e}")
+            DB_QUERY_ERRORS.inc(operation="execute_query")
             raise
         except Exception as e:
             logger.error(f"쿼리 실행 중 예상치 못한 오류: {e}")
+            DB_QUERY_ERRORS.inc(operation="execute_query")
             raise
         finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
\ No newline at end of file
+            DB_QUERY_DURATION.observe(time.perf_counter() - started, operation="execute_query")
+
+
+DB_POOL_CONNECTIONS.set_function(DatabaseService.pool_usage)
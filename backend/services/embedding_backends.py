@@ -0,0 +1,135 @@
+import os
+import math
+import zlib
+import logging
+from collections import Counter
+import numpy as np
+from openai import OpenAI
+from services.sql_terms import tokenize_sql, SQL_KEYWORDS
+from services.admission import get_limiter
+
+logger = logging.getLogger(__name__)
+
+
+class OpenAIEmbeddingBackend:
+    """OpenAI 임베딩 API 백엔드"""
+
+    name = "openai"
+    remote = True
+
+    def __init__(self, http_client=None, model="text-embedding-3-small", dimensions=None, base_url=None):
+        self.http_client = http_client
+        self.model = model
+        self.dimensions = dimensions
+        self.base_url = base_url
+        # OpenAI 클라이언트는 첫 임베딩 호출 시 생성
+        self._client = None
+
+    def reset_client(self, http_client=None):
+        """HTTP 클라이언트 교체 (fork 이후 워커 프로세스에서 새 연결 사용)"""
+        self.http_client = http_client
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            api_key = os.getenv('OPENAI_API_KEY')
+            if not api_key:
+                raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다.")
+
+            # 공유 HTTP 클라이언트가 없으면 자체 생성
+            http_client = self.http_client
+            if http_client is None:
+                # SSL 검증 비활성화 (회사 프록시 대응)
+                import httpx
+                http_client = httpx.Client(
+                    timeout=60.0,
+                    verify=False
+                )
+
+            self._client = OpenAI(
+                api_key=api_key,
+                base_url=self.base_url,
+                http_client=http_client
+            )
+        return self._client
+
+    def embed(self, text):
+        """텍스트를 벡터로 변환"""
+        params = {"model": self.model, "input": text}
+        if self.dimensions:
+            params["dimensions"] = self.dimensions
+
+        with get_limiter("openai").acquire():
+            response = self.client.embeddings.create(**params)
+        return response.data[0].embedding
+
+    def embed_batch(self, texts):
+        """여러 텍스트를 한 번의 API 호출로 변환 (입력 순서 유지)"""
+        params = {"model": self.model, "input": list(texts)}
+        if self.dimensions:
+            params["dimensions"] = self.dimensions
+
+        with get_limiter("openai").acquire():
+            response = self.client.embeddings.create(**params)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+
+class HashingEmbeddingBackend:
+    """SQL 토큰 해싱 기반 로컬 임베딩 백엔드
+
+    테이블명, 컬럼명, 키워드 토큰을 고정 차원으로 feature hashing 하고
+    sublinear TF 가중치를 적용한다. 네트워크 호출 없이 프로세스 내에서 계산된다.
+    """
+
+    name = "local"
+    remote = False
+    KEYWORD_WEIGHT = 0.2
+
+    def __init__(self, dimensions=1024):
+        self.dimensions = dimensions
+        self.model = f"sql-hashing-{dimensions}"
+
+    def embed(self, text):
+        """텍스트를 벡터로 변환"""
+        counts = Counter(tokenize_sql(text))
+        vec = np.zeros(self.dimensions, dtype=np.float32)
+        if not counts:
+            return vec
+
+        indices = np.empty(len(counts), dtype=np.int64)
+        values = np.empty(len(counts), dtype=np.float32)
+        for i, (token, tf) in enumerate(counts.items()):
+            # 프로세스 간 동일한 값을 보장하기 위해 내장 hash() 대신 crc32 사용
+            h = zlib.crc32(token.encode('utf-8'))
+            indices[i] = h % self.dimensions
+            sign = 1.0 if (h // self.dimensions) & 1 else -1.0
+            weight = self.KEYWORD_WEIGHT if token in SQL_KEYWORDS else 1.0
+            values[i] = sign * weight * (1.0 + math.log(tf))
+
+        np.add.at(vec, indices, values)
+        norm = np.linalg.norm(vec)
+        if norm > 0:
+            vec /= norm
+        return vec
+
+    def embed_batch(self, texts):
+        """여러 텍스트를 벡터로 변환"""
+        return [self.embed(text) for text in texts]
+
+
+def create_backends(config, http_client=None):
+    """설정에 따라 사용할 임베딩 백엔드 목록 생성 (첫 번째가 기본 백엔드)"""
+    mode = config.backend
+
+    if mode == "openai":
+        return [OpenAIEmbeddingBackend(http_client, config.model, config.dimensions or None, config.base_url)]
+    if mode == "local":
+        return [HashingEmbeddingBackend(config.local_dimensions)]
+    if mode == "hybrid":
+        return [
+            OpenAIEmbeddingBackend(http_client, config.model, config.dimensions or None, config.base_url),
+            HashingEmbeddingBackend(config.local_dimensions),
+        ]
+
+    raise ValueError(f"알 수 없는 임베딩 백엔드: {mode} (openai, local, hybrid 중 선택)")
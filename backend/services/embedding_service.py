@@ -1,80 +1,494 @@
 import os
 import json
+import time
 import logging
-from openai import OpenAI
+import tempfile
+import threading
+from contextlib import contextmanager
+import numpy as np
+from config import embedding_config
+from services.embedding_backends import create_backends
+from services.file_utils import file_lock, atomic_write_json, file_signature
+from services.metrics import EMBEDDING_DURATION, record_cache
+from services.tracing import span
 
 logger = logging.getLogger(__name__)
 
 
-class EmbeddingService:
-    def __init__(self):
-        api_key = os.getenv('OPENAI_API_KEY')
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다.")
-
-        # SSL 검증 비활성화 (회사 프록시 대응)
-        import httpx
-        http_client = httpx.Client(
-            timeout=60.0,
-            verify=False
-        )
-
-        self.client = OpenAI(
-            api_key=api_key,
-            http_client=http_client
-        )
-        self.embeddings_file = "data/tasks/embeddings.json"
+def fit_dimensions(vector, dimensions=None):
+    """벡터를 지정 차원으로 변환 (float32)
+
+    text-embedding-3 계열은 앞쪽 차원만 잘라 정규화한 결과가 dimensions 파라미터
+    결과와 같으므로, 재임베딩 전의 고차원 벡터도 그대로 사용할 수 있다.
+    """
+    vec = np.asarray(vector, dtype=np.float32)
+    if dimensions and vec.shape[0] > dimensions:
+        vec = vec[:dimensions]
+        norm = np.linalg.norm(vec)
+        if norm > 0:
+            vec = vec / norm
+    return vec
+
+
+def spill_matrix(matrix, directory=None):
+    """행렬을 이름 없는 임시 파일에 기록하고 읽기 전용 memmap으로 반환
+
+    메모리에는 접근한 행의 페이지만 올라오고, 다른 메모리가 필요하면 OS가 바로 회수할 수 있다.
+    파일을 만들 수 없으면 행렬을 그대로 반환한다.
+    """
+    if matrix.size == 0:
+        return matrix
+    try:
+        with tempfile.TemporaryFile(dir=directory, prefix=".tmp-") as f:
+            matrix.tofile(f)
+            f.flush()
+            return np.memmap(f, dtype=matrix.dtype, mode='r', shape=matrix.shape)
+    except OSError as e:
+        logger.warning(f"float 벡터 임시 파일 생성 실패, 메모리에 유지: {e}")
+        return matrix
+
+
+class EmbeddingIndex:
+    """임베딩 검색용 행렬 인덱스 (정규화 float32 또는 int8 양자화)
+
+    양자화 모드에서는 int8 코드와 행별 scale만 메모리에 두고, 재정렬용 정규화 float 행렬은
+    spill_dir의 임시 파일 memmap으로 두어 후보 행만 읽는다.
+    """
+
+    def __init__(self, vectors, quantize=False, rerank_factor=4, spill_dir=None):
+        self.quantize = quantize
+        self.rerank_factor = max(1, rerank_factor)
+
+        self.ids = list(vectors.keys())
+        self.rows = {task_id: row for row, task_id in enumerate(self.ids)}
+        self.dim = max((vec.shape[0] for vec in vectors.values()), default=0)
+
+        matrix = np.zeros((len(self.ids), self.dim), dtype=np.float32)
+        for row, task_id in enumerate(self.ids):
+            vec = vectors[task_id]
+            matrix[row, :vec.shape[0]] = vec
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+
+        if quantize:
+            # 행 단위 대칭 스칼라 양자화: x ≈ codes * scale
+            scales = np.abs(matrix).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            self.codes = np.round(matrix / scales[:, None]).astype(np.int8)
+            self.scales = scales.astype(np.float32)
+            self.matrix = None
+            self.floats = spill_matrix(matrix, spill_dir)
+        else:
+            self.codes = None
+            self.scales = None
+            self.matrix = matrix
+            self.floats = matrix
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _prepare_query(self, query):
+        """쿼리 벡터 정규화 및 인덱스 차원 맞춤"""
+        query = np.asarray(query, dtype=np.float32)[:self.dim]
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return None
+        query = query / norm
+        if query.shape[0] < self.dim:
+            query = np.pad(query, (0, self.dim - query.shape[0]))
+        return query
+
+    def _select_rows(self, candidate_ids):
+        """후보 과제 ID를 행 번호 배열로 변환"""
+        if candidate_ids is None:
+            return np.arange(len(self.ids))
+        return np.array([self.rows[task_id] for task_id in candidate_ids if task_id in self.rows],
+                        dtype=np.int64)
+
+    def _scores(self, query, rows):
+        """행별 유사도 (양자화 모드에서는 int8 근사값)"""
+        if not self.quantize:
+            return self.matrix[rows] @ query
+        return (self.codes[rows] @ query) * self.scales[rows]
+
+    def _exact_scores(self, query, rows):
+        """행별 float 코사인 유사도 (양자화 모드에서는 해당 행만 임시 파일에서 읽음)"""
+        return np.asarray(self.floats[rows] @ query)
+
+    def vector(self, task_id):
+        """정규화 float 벡터 (없으면 None)"""
+        row = self.rows.get(task_id)
+        if row is None:
+            return None
+        return np.array(self.floats[row])
+
+    def search(self, query, top_k=3, candidate_ids=None, row_filter=None, min_score=None):
+        """코사인 유사도 상위 K개 (task_id, similarity) 반환
+
+        row_filter(ids)는 인덱스 행 순서의 bool 마스크를 반환하는 함수로, 유사도 계산 전에 행을 거른다.
+        양자화 모드에서는 int8 근사 점수로 top_k * rerank_factor 후보를 고른 뒤
+        float 벡터로 다시 계산해 순위를 확정한다 (min_score는 확정 점수에 적용).
+        """
+        if not self.ids:
+            return []
+
+        query = self._prepare_query(query)
+        rows = self._select_rows(candidate_ids)
+        if row_filter is not None and rows.size:
+            rows = rows[row_filter(self.ids)[rows]]
+        if query is None or rows.size == 0:
+            return []
+
+        scores = self._scores(query, rows)
+        if self.quantize:
+            # 1차: int8 근사 점수로 후보 축소 → 2차: float 재정렬
+            n_candidates = min(rows.size, top_k * self.rerank_factor)
+            if n_candidates < rows.size:
+                shortlist = np.argpartition(-scores, n_candidates - 1)[:n_candidates]
+                rows = rows[shortlist]
+            scores = self._exact_scores(query, rows)
+
+        if min_score is not None:
+            keep = scores >= min_score
+            rows, scores = rows[keep], scores[keep]
+
+        order = np.argsort(-scores)[:top_k]
+        return [(self.ids[rows[i]], float(scores[i])) for i in order]
+
+    def score_ids(self, query, task_ids, exact=False):
+        """과제 ID 목록 순서대로 유사도 배열 반환 (임베딩 없는 과제는 0)"""
+        result = np.zeros(len(task_ids), dtype=np.float32)
+        query = self._prepare_query(query) if self.ids else None
+        if query is None:
+            return result
+
+        positions = [i for i, task_id in enumerate(task_ids) if task_id in self.rows]
+        if not positions:
+            return result
+
+        rows = np.array([self.rows[task_ids[i]] for i in positions], dtype=np.int64)
+        result[positions] = self._exact_scores(query, rows) if exact else self._scores(query, rows)
+        return result
+
+
+class EmbeddingStore:
+    """백엔드별 임베딩 파일 저장소와 검색 인덱스
+
+    쓰기는 프로세스 간 파일 잠금 안에서 최신 파일을 다시 읽어 반영한 뒤 원자적으로 교체하고,
+    읽기 전에는 파일 서명(inode, 크기, mtime)을 비교해 다른 워커의 변경을 다시 로드한다.
+    양자화 모드에서는 인덱스를 만든 뒤 float 벡터 딕셔너리(embeddings)를 해제하고,
+    쓰기 때만 파일에서 다시 읽는다.
+    """
+
+    def __init__(self, embeddings_file, dimensions=None, quantize=False, rerank_factor=4):
+        self.embeddings_file = embeddings_file
+        self.dimensions = dimensions
+        self.quantize = quantize
+        self.rerank_factor = rerank_factor
+        self._lock = threading.RLock()
+        self._signature = None
         self.embeddings = self._load_embeddings()
+        # 검색용 행렬 인덱스 (변경 시 무효화 후 지연 재생성)
+        self._index = None
 
     def _load_embeddings(self):
-        """저장된 임베딩 로드"""
-        if os.path.exists(self.embeddings_file):
+        """저장된 임베딩 로드 (float32 배열로 보관)"""
+        self._signature = file_signature(self.embeddings_file)
+        if self._signature is not None:
             try:
                 with open(self.embeddings_file, 'r') as f:
-                    return json.load(f)
+                    raw = json.load(f)
+                return {task_id: self._fit_dimensions(vec) for task_id, vec in raw.items()}
             except Exception as e:
                 logger.error(f"임베딩 로드 오류: {e}")
                 return {}
         return {}
 
-    def create_embedding(self, text):
-        """텍스트를 벡터로 변환"""
-        try:
-            response = self.client.embeddings.create(
-                model="text-embedding-3-small",
-                input=text
+    def refresh(self):
+        """다른 프로세스가 파일을 바꿨으면 다시 로드"""
+        with self._lock:
+            if file_signature(self.embeddings_file) != self._signature:
+                self.embeddings = self._load_embeddings()
+                self._index = None
+                logger.info(f"임베딩 파일 변경 감지, 다시 로드: {self.embeddings_file} ({len(self.embeddings)}개)")
+
+    def vectors(self):
+        """float 벡터 딕셔너리 (양자화 모드에서 해제됐으면 파일에서 다시 로드)"""
+        with self._lock:
+            if self.embeddings is None:
+                self.embeddings = self._load_embeddings()
+            return self.embeddings
+
+    def _known(self):
+        """저장된 과제 ID 조회용 (float 벡터 또는 인덱스 행 번호)"""
+        with self._lock:
+            if self.embeddings is not None:
+                return self.embeddings
+        return self.index().rows
+
+    def _fit_dimensions(self, vector):
+        """설정된 차원에 맞게 벡터 변환"""
+        return fit_dimensions(vector, self.dimensions)
+
+    def _write_embeddings(self):
+        """임베딩 파일 원자적 기록"""
+        atomic_write_json(self.embeddings_file,
+                          {task_id: vec.tolist() for task_id, vec in self.embeddings.items()})
+        self._signature = file_signature(self.embeddings_file)
+
+    @contextmanager
+    def _modify(self):
+        """잠금 → 최신 파일 반영 → 변경 → 원자적 기록"""
+        with self._lock, file_lock(self.embeddings_file):
+            self.refresh()
+            self.vectors()
+            yield
+            self._index = None
+            self._write_embeddings()
+
+    def save_many(self, embeddings):
+        """여러 임베딩을 한 번에 저장"""
+        with self._modify():
+            for task_id, vec in embeddings.items():
+                self.embeddings[task_id] = self._fit_dimensions(vec)
+
+    def replace_all(self, embeddings):
+        """전체 임베딩 교체"""
+        with self._modify():
+            self.embeddings = {task_id: self._fit_dimensions(vec) for task_id, vec in embeddings.items()}
+
+    def delete(self, task_id):
+        """임베딩 삭제 (삭제 여부 반환)"""
+        self.refresh()
+        if task_id not in self._known():
+            return False
+        with self._modify():
+            self.embeddings.pop(task_id, None)
+        return True
+
+    def get(self, task_id):
+        """임베딩 조회 (양자화 모드에서 float 벡터를 해제했으면 인덱스의 정규화 벡터)"""
+        self.refresh()
+        with self._lock:
+            if self.embeddings is not None:
+                return self.embeddings.get(task_id)
+        return self.index().vector(task_id)
+
+    def missing_ids(self, task_ids):
+        """임베딩이 없는 과제 ID 목록"""
+        self.refresh()
+        known = self._known()
+        return [task_id for task_id in task_ids if task_id not in known]
+
+    def index(self):
+        """검색용 행렬 인덱스 반환 (변경 시 지연 재생성)"""
+        self.refresh()
+        with self._lock:
+            record_cache("embedding_index", self._index is not None)
+            if self._index is None:
+                self._index = EmbeddingIndex(self.vectors(), self.quantize, self.rerank_factor,
+                                             spill_dir=os.path.dirname(self.embeddings_file) or None)
+                if self.quantize:
+                    # 검색은 int8 인덱스와 임시 파일의 float 행렬만 사용
+                    self.embeddings = None
+                logger.info(f"임베딩 인덱스 생성 ({os.path.basename(self.embeddings_file)}): "
+                            f"{len(self._index)}개 x {self._index.dim}차원 (양자화: {self.quantize})")
+            return self._index
+
+    def search(self, query_embedding, top_k=3, candidate_ids=None, row_filter=None, min_score=None):
+        """유사도 상위 K개 (task_id, similarity) 반환"""
+        return self.index().search(self._fit_dimensions(query_embedding), top_k, candidate_ids,
+                                   row_filter, min_score)
+
+    def score_ids(self, query_embedding, task_ids, exact=False):
+        """과제 ID 목록 순서대로 유사도 배열 반환"""
+        return self.index().score_ids(self._fit_dimensions(query_embedding), task_ids, exact)
+
+
+class EmbeddingService:
+    # 백엔드별 임베딩 저장 파일 (벡터 공간이 다르므로 분리 저장)
+    EMBEDDING_FILES = {
+        "openai": "data/tasks/embeddings.json",
+        "local": "data/tasks/embeddings_local.json",
+    }
+
+    def __init__(self, http_client=None, config=None):
+        self.config = config or embedding_config
+        self.quantize = self.config.quantize
+        self.rerank_factor = max(1, self.config.rerank_factor)
+        self.hybrid_weight = self.config.hybrid_weight
+
+        # 첫 번째 백엔드가 기본 백엔드 (hybrid: openai + local)
+        self.backends = {backend.name: backend for backend in create_backends(self.config, http_client)}
+        self.primary = next(iter(self.backends))
+        self.stores = {
+            name: EmbeddingStore(
+                self.EMBEDDING_FILES[name],
+                dimensions=backend.dimensions if backend.remote else None,
+                quantize=self.quantize,
+                rerank_factor=self.rerank_factor
             )
-            embedding = response.data[0].embedding
-            logger.info(f"임베딩 생성 완료: {len(embedding)}차원")
+            for name, backend in self.backends.items()
+        }
+        logger.info(f"임베딩 백엔드: {', '.join(self.backends)} (기본: {self.primary})")
+
+    @property
+    def embeddings(self):
+        """기본 백엔드의 임베딩 딕셔너리"""
+        return self.stores[self.primary].vectors()
+
+    @property
+    def embeddings_file(self):
+        """기본 백엔드의 임베딩 파일 경로"""
+        return self.stores[self.primary].embeddings_file
+
+    def create_embedding(self, text, backend=None):
+        """텍스트를 벡터로 변환 (기본 백엔드 또는 지정 백엔드)"""
+        name = backend or self.primary
+        started = time.perf_counter()
+        try:
+            with span(f"embedding.{name}"):
+                embedding = self.backends[name].embed(text)
+            EMBEDDING_DURATION.observe(time.perf_counter() - started, backend=name, mode="single", outcome="success")
+            logger.info(f"임베딩 생성 완료 ({name}): {len(embedding)}차원")
             return embedding
         except Exception as e:
-            logger.error(f"임베딩 생성 오류: {e}")
+            EMBEDDING_DURATION.observe(time.perf_counter() - started, backend=name, mode="single", outcome="error")
+            logger.error(f"임베딩 생성 오류 ({name}): {e}")
             raise
 
-    def save_embedding(self, task_id, embedding):
-        """임베딩 저장"""
+    def create_embeddings(self, text):
+        """설정된 모든 백엔드로 임베딩 생성 ({backend: vector})
+
+        하이브리드 모드에서 원격 호출이 실패하면 로컬 임베딩만 반환한다.
+        """
+        embeddings = {}
+        for name, backend in self.backends.items():
+            try:
+                embeddings[name] = self.create_embedding(text, name)
+            except Exception:
+                if len(self.backends) == 1 or not backend.remote:
+                    raise
+                logger.warning(f"⚠️ {name} 임베딩 실패, 로컬 임베딩만 사용합니다")
+        return embeddings
+
+    def create_embeddings_batch(self, texts, backend=None):
+        """여러 텍스트를 한 번에 변환 (입력 순서대로 벡터 리스트)"""
+        name = backend or self.primary
+        started = time.perf_counter()
         try:
-            self.embeddings[task_id] = embedding
+            with span(f"embedding.{name}", batch=len(texts)):
+                embeddings = self.backends[name].embed_batch(texts)
+            EMBEDDING_DURATION.observe(time.perf_counter() - started, backend=name, mode="batch", outcome="success")
+            logger.info(f"배치 임베딩 생성 완료 ({name}): {len(embeddings)}개")
+            return embeddings
+        except Exception as e:
+            EMBEDDING_DURATION.observe(time.perf_counter() - started, backend=name, mode="batch", outcome="error")
+            logger.error(f"배치 임베딩 생성 오류 ({name}, {len(texts)}개): {e}")
+            raise
 
-            # 디렉터리 확인
-            os.makedirs(os.path.dirname(self.embeddings_file), exist_ok=True)
+    def save_many(self, embeddings, backend=None):
+        """여러 과제 임베딩 저장 ({task_id: vector})"""
+        name = backend or self.primary
+        self.stores[name].save_many(embeddings)
+        logger.info(f"임베딩 저장 완료 ({name}): {len(embeddings)}개")
 
-            with open(self.embeddings_file, 'w') as f:
-                json.dump(self.embeddings, f)
+    def save_embedding(self, task_id, embedding, backend=None):
+        """임베딩 저장 (벡터 또는 {backend: vector})"""
+        embeddings = embedding if isinstance(embedding, dict) else {backend or self.primary: embedding}
+        try:
+            for name, vec in embeddings.items():
+                self.stores[name].save_many({task_id: vec})
 
-            logger.info(f"임베딩 저장 완료: {task_id}")
+            logger.info(f"임베딩 저장 완료: {task_id} ({', '.join(embeddings)})")
         except Exception as e:
             logger.error(f"임베딩 저장 오류: {e}")
             raise
 
+    def replace_all(self, embeddings, backend=None):
+        """전체 임베딩 교체 (재임베딩 마이그레이션용)"""
+        name = backend or self.primary
+        self.stores[name].replace_all(embeddings)
+        logger.info(f"임베딩 전체 교체 완료 ({name}): {len(embeddings)}개")
+
     def delete_embedding(self, task_id):
         """임베딩 삭제"""
-        if task_id in self.embeddings:
-            del self.embeddings[task_id]
-            with open(self.embeddings_file, 'w') as f:
-                json.dump(self.embeddings, f)
+        deleted = [name for name, store in self.stores.items() if store.delete(task_id)]
+        if deleted:
             logger.info(f"임베딩 삭제 완료: {task_id}")
 
-    def get_embedding(self, task_id):
+    def get_embedding(self, task_id, backend=None):
         """임베딩 조회"""
-        return self.embeddings.get(task_id)
\ No newline at end of file
+        return self.stores[backend or self.primary].get(task_id)
+
+    def missing_ids(self, task_ids, backend=None):
+        """임베딩이 없는 과제 ID 목록"""
+        return self.stores[backend or self.primary].missing_ids(task_ids)
+
+    def missing_local_ids(self, task_ids):
+        """로컬 백엔드 임베딩이 없는 과제 ID 목록"""
+        missing = set()
+        for name, backend in self.backends.items():
+            if not backend.remote:
+                missing.update(self.stores[name].missing_ids(task_ids))
+        return [task_id for task_id in task_ids if task_id in missing]
+
+    def fill_local_embeddings(self, texts):
+        """로컬 백엔드 임베딩을 즉시 계산해 채움 ({task_id: text})"""
+        for name, backend in self.backends.items():
+            if backend.remote:
+                continue
+            store = self.stores[name]
+            missing_ids = set(store.missing_ids(texts))
+            missing = {task_id: text for task_id, text in texts.items() if task_id in missing_ids}
+            if missing:
+                store.save_many({task_id: backend.embed(text) for task_id, text in missing.items()})
+                logger.info(f"로컬 임베딩 채움 ({name}): {len(missing)}개")
+
+    def search(self, query_embedding, top_k=3, candidate_ids=None, row_filter=None, min_score=None):
+        """유사도 상위 K개 (task_id, similarity) 반환
+
+        query_embedding이 {backend: vector} 이고 백엔드가 둘 이상이면
+        원격/로컬 점수를 hybrid_weight로 가중 결합한다.
+        row_filter(ids)는 ids 순서의 bool 마스크를 반환하며 유사도 계산 전에 적용된다.
+        """
+        queries = query_embedding if isinstance(query_embedding, dict) else {self.primary: query_embedding}
+        if len(queries) == 1:
+            name, query = next(iter(queries.items()))
+            return self.stores[name].search(query, top_k, candidate_ids, row_filter, min_score)
+        return self._hybrid_search(queries, top_k, candidate_ids, row_filter, min_score)
+
+    def _hybrid_search(self, queries, top_k, candidate_ids, row_filter=None, min_score=None):
+        """원격/로컬 유사도 가중 결합 검색"""
+        if candidate_ids is None:
+            candidate_ids = set()
+            for name in queries:
+                candidate_ids.update(self.stores[name].index().ids)
+        task_ids = list(candidate_ids)
+        if task_ids and row_filter is not None:
+            task_ids = [task_id for task_id, keep in zip(task_ids, row_filter(task_ids)) if keep]
+        if not task_ids:
+            return []
+
+        def combined_scores(ids, exact):
+            total = np.zeros(len(ids), dtype=np.float32)
+            for name, query in queries.items():
+                weight = self.hybrid_weight if self.backends[name].remote else 1.0 - self.hybrid_weight
+                total += weight * self.stores[name].score_ids(query, ids, exact)
+            return total
+
+        scores = combined_scores(task_ids, exact=False)
+        if self.quantize:
+            # 근사 점수로 후보 축소 후 float 점수로 재정렬
+            shortlist = np.argsort(-scores)[:top_k * self.rerank_factor]
+            task_ids = [task_ids[i] for i in shortlist]
+            scores = combined_scores(task_ids, exact=True)
+
+        if min_score is not None:
+            keep = np.flatnonzero(scores >= min_score)
+            task_ids, scores = [task_ids[i] for i in keep], scores[keep]
+
+        order = np.argsort(-scores)[:top_k]
+        return [(task_ids[i], float(scores[i])) for i in order]
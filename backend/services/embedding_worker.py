@@ -0,0 +1,304 @@
+import time
+import queue
+import random
+import logging
+import threading
+from datetime import datetime
+from config import embedding_worker_config
+from services.task_service import TaskService
+
+logger = logging.getLogger(__name__)
+
+# 작업 큐 제어 신호
+_WAKE = "wake"
+_BACKFILL = "backfill"
+_REINDEX = "reindex"
+_STOP = "stop"
+
+
+class RateLimiter:
+    """분당 호출 수 제한 (호출 간 최소 간격 유지)"""
+
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """다음 호출 가능 시점까지 대기"""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+class EmbeddingWorker:
+    """과제 임베딩 백그라운드 작업자
+
+    과제 등록 요청은 저장 직후 반환하고, 임베딩 생성은 이 작업자의 단일 스레드가
+    배치 단위로 처리한다. 원격 API 호출은 분당 호출 수를 제한하고 실패 시 지수 백오프로 재시도한다.
+    스레드는 첫 작업 요청 시 시작된다 (fork 이후 워커 프로세스에서 시작되도록).
+    """
+
+    def __init__(self, embedding_service, task_service, config=None):
+        self.embedding_service = embedding_service
+        self.task_service = task_service
+        self.config = config or embedding_worker_config
+        self.rate_limiter = RateLimiter(self.config.requests_per_minute)
+
+        self._jobs = queue.Queue()
+        # 임베딩 대기 과제 (삽입 순서 유지, 중복 제거)
+        self._pending = {}
+        # 재시도까지 모두 실패한 과제 {task_id: 실패 시각}
+        self._failed_at = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._backfill_requested = False
+
+        self.stats = {"embedded": 0, "failed": 0, "retries": 0, "batches": 0}
+        self.reindex_status = {"state": "idle"}
+
+    # ---------- 작업 요청 (요청 스레드에서 호출) ----------
+
+    def enqueue(self, task_ids, force=False):
+        """과제 임베딩 작업 등록 (새로 등록된 과제 수 반환)
+
+        최근 재시도까지 실패한 과제는 force=True가 아니면 대기 시간 동안 다시 넣지 않는다.
+        """
+        now = time.monotonic()
+        added = 0
+        with self._lock:
+            for task_id in task_ids:
+                if task_id in self._pending:
+                    continue
+                failed_at = self._failed_at.get(task_id)
+                if not force and failed_at is not None and now - failed_at < self.config.failure_cooldown:
+                    continue
+                self._pending[task_id] = True
+                added += 1
+        if added:
+            self._submit(_WAKE)
+        return added
+
+    def request_backfill(self):
+        """임베딩이 없는 과제 채우기 (프로세스당 한 번)"""
+        with self._lock:
+            if self._backfill_requested:
+                return False
+            self._backfill_requested = True
+        self._submit(_BACKFILL)
+        return True
+
+    def request_reindex(self):
+        """전체 과제 재임베딩 요청 (이미 진행 중이면 False)"""
+        with self._lock:
+            if self.reindex_status["state"] in ("queued", "running"):
+                return False
+            self.reindex_status = {"state": "queued", "requested_at": datetime.now().isoformat()}
+        self._submit(_REINDEX)
+        return True
+
+    def status(self):
+        """작업자 상태"""
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "pending": pending,
+            "stats": dict(self.stats),
+            "reindex": dict(self.reindex_status),
+        }
+
+    def stop(self, timeout=5.0):
+        """작업자 종료"""
+        if self._thread is not None and self._thread.is_alive():
+            self._jobs.put(_STOP)
+            self._thread.join(timeout)
+
+    def _submit(self, job):
+        self._ensure_started()
+        self._jobs.put(job)
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="embedding-worker", daemon=True)
+                self._thread.start()
+                logger.info("임베딩 작업자 시작")
+
+    # ---------- 작업 처리 (작업자 스레드) ----------
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job == _STOP:
+                break
+            try:
+                if job == _BACKFILL:
+                    self.backfill()
+                elif job == _REINDEX:
+                    self.reindex()
+                self._drain()
+            except Exception as e:
+                logger.error(f"❌ 임베딩 작업 오류: {e}")
+        logger.info("임베딩 작업자 종료")
+
+    def _drain(self):
+        """대기 과제를 배치 단위로 처리"""
+        # 연속 등록되는 과제를 한 배치로 모으기 위해 잠시 대기
+        if self.config.batch_wait > 0:
+            time.sleep(self.config.batch_wait)
+
+        while True:
+            with self._lock:
+                batch = list(self._pending)[:self.config.batch_size]
+            if not batch:
+                return
+            embedded = self.embed_tasks(batch)
+            now = time.monotonic()
+            with self._lock:
+                for task_id in batch:
+                    self._pending.pop(task_id, None)
+                    if task_id in embedded:
+                        self._failed_at.pop(task_id, None)
+                    else:
+                        self._failed_at[task_id] = now
+
+    def embed_tasks(self, task_ids, backends=None):
+        """과제 임베딩 생성 및 저장 (백엔드별 배치 호출) - 저장된 과제 ID 집합 반환
+
+        삭제된 과제는 건너뛰고, 백엔드 하나가 실패해도 나머지 백엔드 결과는 저장한다.
+        """
+        texts = self._load_texts(task_ids)
+        if not texts:
+            return set()
+
+        ids = list(texts)
+        embedded = set()
+        alive = set(ids)
+        for name in backends or self.embedding_service.backends:
+            vectors = self._embed_with_retry(name, [texts[task_id] for task_id in ids])
+            if vectors is None:
+                continue
+            # 임베딩 중 삭제된 과제는 저장하지 않음
+            alive = {task_id for task_id in alive if self.task_service.task_exists(task_id)}
+            embeddings = {task_id: vec for task_id, vec in zip(ids, vectors) if task_id in alive}
+            if embeddings:
+                self.embedding_service.save_many(embeddings, name)
+            if name == self.embedding_service.primary:
+                embedded.update(embeddings)
+
+        with self._lock:
+            self.stats["batches"] += 1
+            self.stats["embedded"] += len(embedded)
+            # 삭제된 과제는 실패로 세지 않음
+            self.stats["failed"] += len(alive - embedded)
+        return embedded
+
+    def _load_texts(self, task_ids):
+        texts = {}
+        for task_id in task_ids:
+            task = self.task_service.get_task(task_id)
+            if task:
+                texts[task_id] = TaskService.build_embedding_text(task)
+        return texts
+
+    def _embed_with_retry(self, name, texts):
+        """배치 임베딩 (원격 백엔드는 호출 수 제한, 실패 시 지수 백오프 재시도) - 실패 시 None"""
+        remote = self.embedding_service.backends[name].remote
+        for attempt in range(self.config.max_retries + 1):
+            if remote:
+                self.rate_limiter.acquire()
+            try:
+                return self.embedding_service.create_embeddings_batch(texts, name)
+            except Exception as e:
+                if attempt == self.config.max_retries:
+                    logger.error(f"❌ 임베딩 배치 실패 ({name}, {len(texts)}개): 재시도 {attempt}회 후 포기 - {e}")
+                    return None
+                delay = self.config.retry_delay * (2 ** attempt) * (1 + random.random() * 0.2)
+                self.stats["retries"] += 1
+                logger.warning(f"⚠️ 임베딩 배치 실패 ({name}), {delay:.1f}초 후 재시도 ({attempt + 1}/{self.config.max_retries})")
+                time.sleep(delay)
+
+    def backfill(self):
+        """백엔드별 임베딩이 없는 과제를 대기열에 추가 (추가된 과제 수 반환)"""
+        task_ids = [task['task_id'] for task in self.task_service.get_all_tasks(include_sql=False)]
+        missing = set()
+        for name in self.embedding_service.backends:
+            missing.update(self.embedding_service.missing_ids(task_ids, name))
+        if not missing:
+            return 0
+        added = self.enqueue([task_id for task_id in task_ids if task_id in missing], force=True)
+        logger.info(f"임베딩 없는 과제 {added}개 백그라운드 생성 예약")
+        return added
+
+    def reindex(self):
+        """전체 과제 재임베딩 (모델/차원 변경 후)
+
+        새 벡터를 모두 만든 뒤 백엔드별로 파일 잠금 안에서 최신 파일에 다시 계산한 과제만 덮어쓰므로,
+        진행 중에도 기존 벡터로 검색되고 다른 워커가 그동안 저장한 벡터도 유지된다.
+        진행 중 등록된 과제는 대기열에서 이후에 처리되고, 진행 중 삭제된 과제는 건너뛴다 (실패로 세지 않음).
+        """
+        started = time.monotonic()
+        task_ids = [task['task_id'] for task in self.task_service.get_all_tasks(include_sql=False)]
+        backends = list(self.embedding_service.backends)
+        with self._lock:
+            self.reindex_status = {
+                "state": "running", "total": len(task_ids) * len(backends), "done": 0, "failed": 0, "skipped": 0,
+                "started_at": datetime.now().isoformat()
+            }
+        logger.info(f"🔄 전체 과제 재임베딩 시작: {len(task_ids)}개 ({', '.join(backends)})")
+
+        try:
+            skipped = []
+            for name in backends:
+                vectors = {}
+                failed = 0
+                for start in range(0, len(task_ids), self.config.batch_size):
+                    batch = task_ids[start:start + self.config.batch_size]
+                    texts = self._load_texts(batch)
+                    result = self._embed_with_retry(name, list(texts.values())) if texts else []
+                    with self._lock:
+                        self.reindex_status["skipped"] += len(batch) - len(texts)
+                        if result is None:
+                            self.reindex_status["failed"] += len(texts)
+                        else:
+                            self.reindex_status["done"] += len(texts)
+                    if result is None:
+                        failed += len(texts)
+                        continue
+                    vectors.update(zip(texts, result))
+
+                # 일부라도 실패하면 기존 벡터를 유지 (모델이 바뀐 경우 섞이지 않도록)
+                if failed:
+                    skipped.append(name)
+                    logger.error(f"❌ {name} 재임베딩 실패 {failed}개 - 기존 임베딩 유지")
+                    continue
+
+                alive = {task_id: vec for task_id, vec in vectors.items() if self.task_service.task_exists(task_id)}
+                with self._lock:
+                    self.reindex_status["skipped"] += len(vectors) - len(alive)
+                    self.reindex_status["done"] -= len(vectors) - len(alive)
+                if alive:
+                    self.embedding_service.save_many(alive, name)
+
+            with self._lock:
+                self.reindex_status.update({
+                    "state": "failed" if skipped else "done",
+                    "finished_at": datetime.now().isoformat(),
+                    "seconds": round(time.monotonic() - started, 1)
+                })
+                if skipped:
+                    self.reindex_status["error"] = f"재임베딩 실패로 교체하지 않은 백엔드: {', '.join(skipped)}"
+            logger.info(f"전체 과제 재임베딩 종료: {self.reindex_status}")
+        except Exception as e:
+            with self._lock:
+                self.reindex_status.update({"state": "failed", "error": str(e),
+                                            "finished_at": datetime.now().isoformat()})
+            logger.error(f"❌ 전체 과제 재임베딩 오류: {e}")
+        with self._lock:
+            return dict(self.reindex_status)
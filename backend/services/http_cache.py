@@ -0,0 +1,38 @@
+import hashlib
+from datetime import datetime, timezone
+from flask import request, Response
+
+
+def make_etag(*parts):
+    """버전 값들로 ETag 생성 (응답 본문을 만들지 않고 계산)"""
+    return hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=12).hexdigest()
+
+
+def not_modified(etag, last_modified=None):
+    """조건부 요청이 현재 버전과 같으면 304 응답, 아니면 None
+
+    ETag가 있으면 If-None-Match만 비교한다. If-Modified-Since는 초 단위라 같은 초 안의 두 번째 변경을
+    구분하지 못하므로(오래된 304), ETag가 없는 응답에서만 비교한다.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return None
+    if etag is not None:
+        matched = bool(request.if_none_match) and request.if_none_match.contains_weak(etag)
+    elif last_modified is not None and request.if_modified_since is not None:
+        matched = int(last_modified) <= request.if_modified_since.timestamp()
+    else:
+        matched = False
+    if not matched:
+        return None
+    return with_validators(Response(status=304), etag, last_modified)
+
+
+def with_validators(response, etag, last_modified=None):
+    """ETag / Last-Modified 헤더 추가 (브라우저가 매번 재검증하도록 no-cache)"""
+    # 응답 본문의 timestamp 등은 버전과 무관하게 바뀌므로 약한 ETag 사용
+    if etag is not None:
+        response.set_etag(etag, weak=True)
+    if last_modified:
+        response.last_modified = datetime.fromtimestamp(int(last_modified), tz=timezone.utc)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
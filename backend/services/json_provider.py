@@ -0,0 +1,96 @@
+import uuid
+import decimal
+import logging
+from datetime import date, time
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _default(obj):
+    """JSON 기본 타입이 아닌 값 변환 (psycopg2 조회 결과 포함)
+
+    - date / datetime / time: ISO 8601 (Flask 기본의 HTTP 날짜 형식 대신)
+    - Decimal: 문자열 (numeric 정밀도 유지)
+    - set: 리스트, bytes / memoryview: hex 문자열
+    """
+    if isinstance(obj, (date, time)):
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, memoryview):
+        obj = obj.tobytes()
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.hex()
+    # 그 외 (dataclass, __html__ 등)는 Flask 기본 처리
+    return DefaultJSONProvider.default(obj)
+
+
+class StandardJSONProvider(DefaultJSONProvider):
+    """표준 json 모듈 기반 (orjson과 같은 날짜/Decimal 표현)"""
+
+    default = staticmethod(_default)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """orjson 기반 JSON 직렬화 (대용량 행/INSERT문 응답용)
+
+    키 정렬, 디버그 모드 들여쓰기 등 Flask 기본 동작은 그대로 따르고,
+    orjson이 처리할 수 없는 값(64비트 초과 정수 등)은 표준 json 모듈로 대체한다.
+    """
+
+    default = staticmethod(_default)
+
+    def _options(self, pretty=False):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def _dumps_bytes(self, obj, pretty=False):
+        try:
+            return orjson.dumps(obj, default=_default, option=self._options(pretty))
+        except (orjson.JSONEncodeError, TypeError):
+            indent = 2 if pretty else None
+            separators = None if pretty else (",", ":")
+            return super().dumps(obj, indent=indent, separators=separators).encode("utf-8")
+
+    def dumps(self, obj, **kwargs):
+        # json.dumps 전용 인자(cls, indent 등)가 있으면 표준 처리
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(self._dumps_bytes(obj, pretty) + b"\n", mimetype=self.mimetype)
+
+
+def create_json_provider(app, name="auto"):
+    """JSON 제공자 생성 (auto: orjson이 설치되어 있으면 orjson, 아니면 표준 json)"""
+    if name not in ("auto", "orjson", "default"):
+        raise ValueError(f"알 수 없는 JSON_PROVIDER: {name} (auto, orjson, default)")
+    if name == "orjson" and orjson is None:
+        raise ValueError("JSON_PROVIDER=orjson 이지만 orjson이 설치되지 않았습니다.")
+
+    if name != "default" and orjson is not None:
+        logger.info("JSON 직렬화: orjson")
+        return OrjsonProvider(app)
+    return StandardJSONProvider(app)
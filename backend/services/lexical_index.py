@@ -0,0 +1,79 @@
+import re
+import math
+import threading
+from collections import Counter
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def tokenize_text(text):
+    """일반 텍스트를 소문자 단어 토큰으로 분리 (한글 포함)"""
+    return _WORD_RE.findall((text or "").lower())
+
+
+class BM25Index:
+    """증분 갱신 가능한 프로세스 내 역색인 (BM25 점수)"""
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}      # term -> {doc_id: tf}
+        self.doc_terms = {}     # doc_id -> Counter(term -> tf)
+        self.doc_lengths = {}   # doc_id -> 용어 수
+        self.total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.doc_terms)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.doc_terms
+
+    def add(self, doc_id, terms):
+        """문서 색인 (기존 문서는 교체)"""
+        counts = Counter(terms)
+        with self._lock:
+            self._remove(doc_id)
+            self.doc_terms[doc_id] = counts
+            self.doc_lengths[doc_id] = sum(counts.values())
+            self.total_length += self.doc_lengths[doc_id]
+            for term, tf in counts.items():
+                self.postings.setdefault(term, {})[doc_id] = tf
+
+    def remove(self, doc_id):
+        """문서 색인 제거"""
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id):
+        counts = self.doc_terms.pop(doc_id, None)
+        if counts is None:
+            return
+        self.total_length -= self.doc_lengths.pop(doc_id)
+        for term in counts:
+            docs = self.postings.get(term)
+            if docs is not None:
+                docs.pop(doc_id, None)
+                if not docs:
+                    del self.postings[term]
+
+    def search(self, terms, limit=None):
+        """BM25 상위 문서 [(doc_id, score)] 반환 (용어가 하나도 없는 문서는 제외)"""
+        with self._lock:
+            n_docs = len(self.doc_terms)
+            if not n_docs:
+                return []
+            avg_length = self.total_length / n_docs
+
+            scores = {}
+            for term in set(terms):
+                docs = self.postings.get(term)
+                if not docs:
+                    continue
+                idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                for doc_id, tf in docs.items():
+                    norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+        return ranked[:limit] if limit else ranked
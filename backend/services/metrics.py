@@ -0,0 +1,240 @@
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from flask import request, g
+
+# 요청/외부 호출 지연 버킷 (초) - ABC Lab 타임아웃(180초)까지
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 180)
+# 조회 행 수 버킷
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+# 동시 처리 제한 대기 시간 버킷 (초)
+WAIT_BUCKETS = (0, 0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """프로세스 내 메트릭 모음 (Prometheus 텍스트 형식 출력)"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"이미 등록된 메트릭입니다: {metric.name}")
+            self._metrics[metric.name] = metric
+
+    def render(self):
+        """Prometheus 텍스트 형식 (version 0.0.4)"""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+class _Metric:
+    """레이블별 값을 보관하는 메트릭 공통 처리"""
+
+    type = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        (registry or REGISTRY).register(self)
+
+    def _key(self, labels):
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} 레이블이 맞지 않습니다: {sorted(labels)} (필요: {list(self.labelnames)})")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key, extra=()):
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{self._labels(key)} {_format_value(value)}" for key, value in items]
+
+
+class Counter(_Metric):
+    """누적 카운터"""
+
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """현재 값 게이지 (set 또는 출력 시점에 계산하는 함수)"""
+
+    type = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        super().__init__(name, documentation, labelnames, registry)
+        self._function = None
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, function):
+        """출력 시점에 값 계산 (레이블이 있으면 {레이블 값 튜플: 값} 반환)"""
+        self._function = function
+
+    def _samples(self):
+        if self._function is None:
+            return super()._samples()
+        try:
+            values = self._function()
+        except Exception:
+            return []
+        if not self.labelnames:
+            values = {(): values}
+        return [f"{self.name}{self._labels(key)} {_format_value(value)}" for key, value in sorted(values.items())]
+
+
+class Histogram(_Metric):
+    """분포 히스토그램 (버킷별 개수, 합계, 개수)"""
+
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, registry=None):
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [버킷별 개수(+Inf 포함), 합계, 개수]
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """블록 실행 시간 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self):
+        with self._lock:
+            items = sorted((key, ([*counts], total, count)) for key, (counts, total, count) in self._values.items())
+
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{self._labels(key, [('le', _format_value(float(bound)))])} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{self._labels(key)} {count}")
+        return lines
+
+
+# ---------- 애플리케이션 메트릭 ----------
+
+HTTP_REQUEST_DURATION = Histogram(
+    "mzn_http_request_duration_seconds", "HTTP 요청 처리 시간 (라우트별)", ("method", "endpoint", "status"))
+DB_QUERY_DURATION = Histogram(
+    "mzn_db_query_duration_seconds", "PostgreSQL 쿼리 실행 시간", ("operation",))
+DB_QUERY_ROWS = Histogram(
+    "mzn_db_query_rows", "PostgreSQL 쿼리 조회 행 수", ("operation",), buckets=ROW_BUCKETS)
+DB_QUERY_ERRORS = Counter(
+    "mzn_db_query_errors_total", "PostgreSQL 쿼리 오류 수", ("operation",))
+DB_POOL_CONNECTIONS = Gauge(
+    "mzn_db_pool_connections", "PostgreSQL 연결 풀 연결 수 (프로세스 합계)", ("state",))
+ABC_LAB_REQUEST_DURATION = Histogram(
+    "mzn_abc_lab_request_duration_seconds", "ABC Lab API 호출 시간 (HTTP 상태별)", ("status",))
+ABC_LAB_HEDGES = Counter(
+    "mzn_abc_lab_hedges_total", "ABC Lab 검증 중복 요청 (sent: 전송, won: 중복 요청 응답 사용)", ("result",))
+CIRCUIT_STATE = Gauge(
+    "mzn_circuit_state", "차단기 상태 (0: closed, 1: half_open, 2: open)", ("breaker",))
+CIRCUIT_TRANSITIONS = Counter(
+    "mzn_circuit_transitions_total", "차단기 상태 전환 수", ("breaker", "state"))
+CIRCUIT_REJECTED = Counter(
+    "mzn_circuit_rejected_total", "차단기가 열려 보내지 않은 호출 수", ("breaker",))
+EMBEDDING_DURATION = Histogram(
+    "mzn_embedding_duration_seconds", "임베딩 생성 시간", ("backend", "mode", "outcome"))
+EMBEDDING_QUEUE_PENDING = Gauge(
+    "mzn_embedding_queue_pending", "임베딩 대기 과제 수")
+ADMISSION_IN_FLIGHT = Gauge(
+    "mzn_admission_in_flight", "외부 호출 동시 처리 수 (제한 대상별)", ("limiter",))
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "mzn_admission_queue_depth", "외부 호출 대기열 길이 (제한 대상별)", ("limiter",))
+ADMISSION_WAIT = Histogram(
+    "mzn_admission_wait_seconds", "외부 호출 대기 시간 (admitted: 처리, rejected: 거절)", ("limiter", "outcome"),
+    buckets=WAIT_BUCKETS)
+ADMISSION_REJECTED = Counter(
+    "mzn_admission_rejected_total", "동시 처리 제한으로 거절된 요청 수 (queue_full / timeout)", ("limiter", "reason"))
+CACHE_REQUESTS = Counter(
+    "mzn_cache_requests_total", "캐시 조회 수 (hit: 재사용, miss: 재생성)", ("cache", "result"))
+
+
+def record_cache(cache, hit):
+    """캐시 재사용/재생성 기록"""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def render_metrics():
+    """전체 메트릭 텍스트"""
+    return REGISTRY.render()
+
+
+def init_metrics(app):
+    """요청 처리 시간 기록 훅 등록 (라우트 단위, 매칭되지 않은 경로는 unmatched)"""
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def record_request_duration(response):
+        started = g.pop("metrics_started", None)
+        if started is not None:
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                method=request.method,
+                endpoint=request.endpoint or "unmatched",
+                status=response.status_code
+            )
+        return response
@@ -0,0 +1,123 @@
+import re
+import zlib
+import threading
+import numpy as np
+
+# 주석 제거용
+_LINE_COMMENT_RE = re.compile(r"--[^\n]*")
+_BLOCK_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+# 단어 또는 기호 토큰
+_SHINGLE_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+# 2^31 - 1 (해시값 x 계수가 uint64 범위를 넘지 않도록)
+_PRIME = np.uint64((1 << 31) - 1)
+
+
+def normalize_sql(sql):
+    """주석 제거, 소문자 변환 후 토큰 리스트 반환 (공백/줄바꿈 차이 무시)"""
+    sql = _BLOCK_COMMENT_RE.sub(" ", sql or "")
+    sql = _LINE_COMMENT_RE.sub(" ", sql)
+    return _SHINGLE_TOKEN_RE.findall(sql.lower())
+
+
+def shingles(sql, k=5):
+    """정규화된 SQL의 토큰 k-gram 집합"""
+    tokens = normalize_sql(sql)
+    if not tokens:
+        return set()
+    if len(tokens) <= k:
+        return {" ".join(tokens)}
+    return {" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+
+
+class MinHasher:
+    """MinHash 서명 생성 (프로세스 간 동일한 값을 위해 고정 시드 사용)"""
+
+    def __init__(self, num_perm=128, shingle_size=5, seed=1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, int(_PRIME), size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, int(_PRIME), size=num_perm).astype(np.uint64)
+
+    def signature(self, sql):
+        """SQL의 MinHash 서명 (shingle이 없으면 None)"""
+        grams = shingles(sql, self.shingle_size)
+        if not grams:
+            return None
+        hashes = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams),
+                             dtype=np.uint64, count=len(grams)) % _PRIME
+        # (a * x + b) mod p 를 순열별로 계산해 최솟값 선택
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+
+
+def estimate_jaccard(sig_a, sig_b):
+    """두 MinHash 서명의 Jaccard 유사도 추정값"""
+    return float(np.mean(sig_a == sig_b))
+
+
+class MinHashLSH:
+    """MinHash 서명 LSH 색인 (밴드별 버킷 조회로 유사 후보 탐색)
+
+    bands x rows = num_perm 이며, 유사도 (1/bands)^(1/rows) 부근부터 후보로 잡힌다.
+    """
+
+    def __init__(self, num_perm=128, bands=16):
+        if num_perm % bands:
+            raise ValueError(f"num_perm({num_perm})은 bands({bands})로 나누어 떨어져야 합니다.")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.signatures = {}                          # doc_id -> 서명
+        self._buckets = [{} for _ in range(bands)]    # 밴드별 {밴드 해시: {doc_id}}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.signatures
+
+    def _band_keys(self, signature):
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, doc_id, signature):
+        """문서 서명 색인 (기존 문서는 교체)"""
+        with self._lock:
+            self._remove(doc_id)
+            if signature is None:
+                return
+            self.signatures[doc_id] = signature
+            for bucket, key in zip(self._buckets, self._band_keys(signature)):
+                bucket.setdefault(key, set()).add(doc_id)
+
+    def remove(self, doc_id):
+        """문서 서명 제거"""
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id):
+        signature = self.signatures.pop(doc_id, None)
+        if signature is None:
+            return
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            docs = bucket.get(key)
+            if docs is not None:
+                docs.discard(doc_id)
+                if not docs:
+                    del bucket[key]
+
+    def query(self, signature, threshold=0.0, exclude=None):
+        """유사 문서 [(doc_id, 추정 유사도)] (유사도 내림차순)"""
+        if signature is None:
+            return []
+        with self._lock:
+            candidates = set()
+            for bucket, key in zip(self._buckets, self._band_keys(signature)):
+                candidates.update(bucket.get(key, ()))
+            candidates.discard(exclude)
+            scored = [(doc_id, estimate_jaccard(signature, self.signatures[doc_id])) for doc_id in candidates]
+
+        scored = [(doc_id, score) for doc_id, score in scored if score >= threshold]
+        scored.sort(key=lambda x: x[1], reverse=True)
+        return scored
@@ -1,63 +1,110 @@
-import numpy as np
 import logging
+import threading
+from config import rag_config
 from services.embedding_service import EmbeddingService
 from services.task_service import TaskService
+from services.task_metadata import TaskMetadata
+from services.metrics import record_cache
+from services.tracing import span
 
 logger = logging.getLogger(__name__)
 
 
 class RAGService:
-    def __init__(self):
-        self.embedding_service = EmbeddingService()
-        self.task_service = TaskService()
-
-    def find_similar_tasks(self, user_sql, top_k=3):
-        """유사한 과제 검색"""
+    # 추천 결과 SQL 발췌 길이 (include_sql=False 일 때)
+    SNIPPET_CHARS = 200
+
+    def __init__(self, embedding_service=None, task_service=None, embedding_worker=None):
+        self.embedding_service = embedding_service or EmbeddingService()
+        self.task_service = task_service or TaskService(self.embedding_service)
+        self.embedding_worker = embedding_worker
+        self.prefilter_limit = rag_config.prefilter_limit
+        # 필터용 과제 메타데이터 (저장소 세대가 바뀌면 재생성)
+        self._metadata = None
+        self._metadata_generation = None
+        self._metadata_lock = threading.Lock()
+
+    def find_similar_tasks(self, user_sql, top_k=3, min_similarity=None, author=None,
+                           created_after=None, created_before=None, include_sql=True):
+        """유사한 과제 검색
+
+        작성자/등록 기간 조건은 메타데이터 배열 마스크로 계산해 유사도 계산 전에 적용하고,
+        min_similarity(0~1)는 점수 배열에 바로 적용한다.
+        """
         try:
             # 1. 사용자 SQL 전처리 및 임베딩
             processed_sql = self._prepare_sql(user_sql)
-            user_embedding = self.embedding_service.create_embedding(processed_sql)
+            user_embedding = self.embedding_service.create_embeddings(processed_sql)
             logger.info(f"사용자 SQL 임베딩 생성 완료")
 
-            # 2. 모든 과제 로드
-            all_tasks = self.task_service.get_all_tasks()
+            # 2. 과제 메타데이터 (SQL 본문 제외, 캐시)
+            with span("rag.metadata"):
+                metadata = self._get_metadata()
 
-            if not all_tasks:
+            if not len(metadata):
                 logger.warning("등록된 과제가 없습니다")
                 return []
 
-            logger.info(f"총 {len(all_tasks)}개 과제 로드")
-
-            # 3. 각 과제와 유사도 계산
-            similarities = []
-            for task in all_tasks:
-                task_id = task['task_id']
-                task_embedding = self.embedding_service.get_embedding(task_id)
-
-                if not task_embedding:
-                    logger.warning(f"과제 {task_id}의 임베딩이 없습니다")
-                    # 디버깅: embeddings에 어떤 키들이 있는지 출력
-                    logger.debug(f"사용 가능한 키: {list(self.embedding_service.embeddings.keys())[:5]}")
-
-                if task_embedding:
-                    similarity = self._cosine_similarity(user_embedding, task_embedding)
-                    similarities.append({
-                        'task_id': task['task_id'],
-                        'title': task['title'],
-                        'content': task.get('content', ''),
-                        'sql': task['sql'],
-                        'author': task.get('author', ''),
-                        'created_at': task['created_at'],
-                        'similarity': round(similarity * 100, 1)
-                    })
+            # 3. 임베딩 행렬 인덱스로 유사도 계산
+            task_ids = metadata.ids
+
+            # 로컬 백엔드 임베딩은 비용이 낮으므로 없으면 즉시 계산
+            missing_local = self.embedding_service.missing_local_ids(task_ids)
+            if missing_local:
+                texts = {}
+                for task_id in missing_local:
+                    task = self.task_service.get_task(task_id)
+                    if task:
+                        texts[task_id] = TaskService.build_embedding_text(task)
+                self.embedding_service.fill_local_embeddings(texts)
+
+            # 원격 임베딩이 없는 과제는 백그라운드 작업으로 생성 (새로 예약한 경우만 로그)
+            missing = self.embedding_service.missing_ids(task_ids)
+            if missing and self.embedding_worker is not None:
+                queued = self.embedding_worker.enqueue(missing)
+                if queued:
+                    logger.info(f"임베딩이 없는 과제 {queued}개 백그라운드 생성 예약: {missing[:5]}")
+            elif missing:
+                logger.debug(f"임베딩이 없는 과제 {len(missing)}개: {missing[:5]}")
+
+            # 필터 마스크 (작성자, 등록 기간) - 조건이 없어도 등록된 과제만 대상으로 제한
+            mask = metadata.mask(author, created_after, created_before)
+            if mask is not None:
+                allowed = int(mask.sum())
+                logger.info(f"추천 필터 적용: {len(task_ids)}개 → {allowed}개")
+                if allowed == 0:
+                    return []
+            row_filter = metadata.row_filter(mask if mask is not None else metadata.all_mask)
+
+            # SQL 식별자 BM25로 후보를 좁힌 뒤 임베딩 유사도로 재정렬
+            with span("rag.search") as search_span:
+                candidate_ids = self._select_candidates(user_sql, metadata, mask, top_k)
+                ranked = self.embedding_service.search(
+                    user_embedding, top_k=top_k, candidate_ids=candidate_ids,
+                    row_filter=row_filter, min_score=min_similarity
+                )
+                search_span.set(candidates=len(candidate_ids) if candidate_ids is not None else len(task_ids))
+
+            # 4. TOP K 결과 구성 (유사도 높은 순)
+            top_results = []
+            for task_id, similarity in ranked:
+                # SQL 본문은 최종 결과에 대해서만 로드
+                task = self.task_service.get_task(task_id)
+                if not task:
+                    continue
+                result = {
+                    'task_id': task['task_id'],
+                    'title': task['title'],
+                    'content': task.get('content', ''),
+                    'author': task.get('author', ''),
+                    'created_at': task['created_at'],
+                    'similarity': round(similarity * 100, 1)
+                }
+                if include_sql:
+                    result['sql'] = task['sql']
                 else:
-                    logger.warning(f"과제 {task['task_id']}의 임베딩이 없습니다")
-
-            # 4. 유사도 높은 순 정렬
-            similarities.sort(key=lambda x: x['similarity'], reverse=True)
-
-            # 5. TOP K 반환
-            top_results = similarities[:top_k]
+                    result['sql_snippet'] = self._snippet(task['sql'])
+                top_results.append(result)
 
             logger.info(f"유사 과제 검색 완료: {len(top_results)}개")
             for idx, result in enumerate(top_results, 1):
@@ -69,6 +116,55 @@ class RAGService:
             logger.error(f"RAG 검색 오류: {e}")
             raise
 
+    def warmup(self):
+        """과제 메타데이터와 SQL 식별자 색인 미리 적재"""
+        metadata = self._get_metadata()
+        if self.prefilter_limit and len(metadata) > self.prefilter_limit:
+            self.task_service.warmup_indexes("sql")
+
+    def _get_metadata(self):
+        """과제 메타데이터 배열 반환 (저장소 변경 시 재생성)"""
+        generation = self.task_service.store.generation()
+        with self._metadata_lock:
+            stale = self._metadata is None or self._metadata_generation != generation
+            record_cache("task_metadata", not stale)
+            if stale:
+                self._metadata = TaskMetadata(self.task_service.get_all_tasks(include_sql=False))
+                self._metadata_generation = generation
+            return self._metadata
+
+    def _select_candidates(self, user_sql, metadata, mask, top_k):
+        """BM25 사전 필터 후보 선택
+
+        사전 필터가 필요 없거나 후보가 top_k 미만이면 None (필터 마스크를 통과한 전체 과제 대상)
+        """
+        allowed_count = len(metadata) if mask is None else int(mask.sum())
+        if not self.prefilter_limit or allowed_count <= self.prefilter_limit:
+            return None
+
+        if mask is None:
+            lexical = self.task_service.find_lexical_candidates(user_sql, self.prefilter_limit)
+            candidate_ids = [task_id for task_id, _ in lexical]
+        else:
+            # 필터를 통과한 과제 중에서 상위 후보 선택
+            allowed = set(metadata.ids_for(mask))
+            lexical = self.task_service.find_lexical_candidates(user_sql)
+            candidate_ids = [task_id for task_id, _ in lexical if task_id in allowed][:self.prefilter_limit]
+
+        if len(candidate_ids) < top_k:
+            logger.info(f"사전 필터 후보 부족 ({len(candidate_ids)}개), 전체 과제 대상 검색")
+            return None
+
+        logger.info(f"SQL 식별자 사전 필터: {allowed_count}개 → {len(candidate_ids)}개 후보")
+        return candidate_ids
+
+    def _snippet(self, sql):
+        """SQL 앞부분 발췌"""
+        sql = sql or ''
+        if len(sql) <= self.SNIPPET_CHARS:
+            return sql
+        return sql[:self.SNIPPET_CHARS] + "…"
+
     def _prepare_sql(self, sql):
         """SQL 전처리 (글자수 제한)"""
         MAX_CHARS = 10000
@@ -80,17 +176,3 @@ class RAGService:
             return processed
 
         return sql
-
-    def _cosine_similarity(self, vec1, vec2):
-        """코사인 유사도 계산"""
-        vec1 = np.array(vec1)
-        vec2 = np.array(vec2)
-
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
-
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-
-        return dot_product / (norm1 * norm2)
\ No newline at end of file
@@ -0,0 +1,248 @@
+import os
+import time
+import logging
+import threading
+from datetime import datetime
+import httpx
+from flask import current_app
+from services.embedding_service import EmbeddingService
+from services.task_service import TaskService
+from services.rag_service import RAGService
+from services.embedding_worker import EmbeddingWorker
+from services.result_store import ResultStore
+from services.db_service import DatabaseService
+from services.abc_lab_service import ABCLabService
+from services.admission import reset_limiters
+from services.metrics import EMBEDDING_QUEUE_PENDING
+from config import embedding_worker_config
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceRegistry:
+    """애플리케이션 단위 서비스 레지스트리
+
+    HTTP 클라이언트, 임베딩 저장소, 과제 인덱스를 프로세스당 하나만 생성하고
+    모든 Blueprint가 같은 인스턴스를 공유한다.
+    각 서비스는 처음 사용할 때 생성되며, warmup()으로 미리 생성/적재할 수 있다.
+    """
+
+    def __init__(self):
+        self._instances = {}
+        self._lock = threading.RLock()
+        self.warmup_status = {"state": "skipped"}
+        self._retry_thread = None
+        self._retry_stop = None
+
+    def _get(self, name, factory):
+        """서비스 지연 생성 (스레드 간 한 번만 생성)"""
+        instance = self._instances.get(name)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is None:
+                    started = time.perf_counter()
+                    instance = factory()
+                    self._instances[name] = instance
+                    logger.info(f"서비스 생성: {name} ({(time.perf_counter() - started) * 1000:.0f}ms)")
+        return instance
+
+    def is_loaded(self, name):
+        """서비스 생성 여부"""
+        return name in self._instances
+
+    @property
+    def http_client(self):
+        # SSL 검증 비활성화 (회사 프록시 대응)
+        return self._get("http_client", lambda: httpx.Client(timeout=60.0, verify=False))
+
+    @property
+    def embedding_service(self):
+        return self._get("embedding_service", lambda: EmbeddingService(http_client=self.http_client))
+
+    @property
+    def task_service(self):
+        def create():
+            task_service = TaskService(embedding_service=self.embedding_service)
+            # 임베딩 생성은 백그라운드 작업자가 배치/재시도 처리 (과제 서비스와 함께 생성)
+            task_service.embedding_worker = EmbeddingWorker(self.embedding_service, task_service)
+            return task_service
+        return self._get("task_service", create)
+
+    @property
+    def embedding_worker(self):
+        return self.task_service.embedding_worker
+
+    @property
+    def rag_service(self):
+        return self._get("rag_service", lambda: RAGService(
+            embedding_service=self.embedding_service,
+            task_service=self.task_service,
+            embedding_worker=self.embedding_worker
+        ))
+
+    @property
+    def result_store(self):
+        return self._get("result_store", ResultStore)
+
+    # 워밍업 실패 단계 재시도 간격(초, 실패할 때마다 2배, 최대값까지)
+    WARMUP_RETRY_INITIAL = 5.0
+    WARMUP_RETRY_MAX = 300.0
+
+    def _warmup_steps(self):
+        """워밍업 단계 [(이름, 함수, 필수 여부)] - 외부 API 클라이언트는 실패해도 준비 상태를 막지 않음"""
+        return [
+            ("services", lambda: self.rag_service, True),
+            ("embedding_clients", lambda: [backend.client for backend in self.embedding_service.backends.values()
+                                           if backend.remote], False),
+            ("embedding_index", lambda: [store.index() for store in self.embedding_service.stores.values()], True),
+            ("task_metadata", lambda: self.rag_service.warmup(), True),
+        ]
+
+    def _run_warmup_steps(self, names=None):
+        """워밍업 단계를 각각 실행 (한 단계가 실패해도 나머지는 계속) 후 상태 갱신"""
+        status = self.warmup_status
+        for name, step, required in self._warmup_steps():
+            if names is not None and name not in names:
+                continue
+            started = time.perf_counter()
+            try:
+                step()
+                status["steps"][name] = round((time.perf_counter() - started) * 1000, 1)
+                status["errors"].pop(name, None)
+            except Exception as e:
+                status["errors"][name] = {"error": str(e), "required": required}
+                logger.error(f"❌ 워밍업 단계 실패 ({name}): {e}")
+
+        errors = status["errors"]
+        if any(error["required"] for error in errors.values()):
+            state = "failed"
+        elif errors:
+            state = "degraded"
+        else:
+            state = "done"
+        status.update({"state": state, "finished_at": datetime.now().isoformat()})
+        return state
+
+    def warmup(self):
+        """서비스 생성 및 캐시 적재 (HTTP 클라이언트, 임베딩 행렬, 과제 메타데이터, SQL 색인)
+
+        실패한 단계는 백그라운드에서 간격을 늘려 가며 다시 시도한다.
+        """
+        self.warmup_status = {"state": "running", "started_at": datetime.now().isoformat(), "steps": {}, "errors": {}}
+        state = self._run_warmup_steps()
+        if state == "done":
+            logger.info(f"✅ 워밍업 완료: {self.warmup_status['steps']} (ms)")
+        else:
+            logger.warning(f"워밍업 {state}: 실패 단계 {list(self.warmup_status['errors'])} 재시도 예정")
+            self._start_warmup_retry()
+        return self.warmup_status
+
+    def _start_warmup_retry(self):
+        """실패한 워밍업 단계 재시도 스레드 시작 (이미 실행 중이면 무시)"""
+        thread = self._retry_thread
+        if thread is not None and thread.is_alive():
+            return
+        self._retry_stop = threading.Event()
+        self._retry_thread = threading.Thread(target=self._retry_warmup, args=(self._retry_stop,),
+                                              name="warmup-retry", daemon=True)
+        self._retry_thread.start()
+
+    def _retry_warmup(self, stop):
+        delay = self.WARMUP_RETRY_INITIAL
+        while self.warmup_status["errors"] and not stop.wait(delay):
+            failed = list(self.warmup_status["errors"])
+            self.warmup_status["retries"] = self.warmup_status.get("retries", 0) + 1
+            if self._run_warmup_steps(failed) == "done":
+                logger.info(f"✅ 워밍업 재시도 성공: {failed}")
+                return
+            delay = min(delay * 2, self.WARMUP_RETRY_MAX)
+
+    def start_warmup(self):
+        """백그라운드 스레드에서 워밍업 (서버는 바로 요청을 받고, 준비 상태는 /api/v1/ready로 확인)"""
+        self.warmup_status = {"state": "running", "started_at": datetime.now().isoformat(), "steps": {}, "errors": {}}
+        thread = threading.Thread(target=self.warmup, name="warmup", daemon=True)
+        thread.start()
+        return thread
+
+    @property
+    def ready(self):
+        """요청 처리 준비 여부 (워밍업을 하지 않으면 항상 준비, 외부 API 클라이언트만 실패하면 degraded로 준비)"""
+        return self.warmup_status["state"] in ("skipped", "done", "degraded")
+
+    def after_fork(self):
+        """fork 이후 워커 프로세스에서 상속된 연결 폐기
+
+        preload로 마스터에서 적재한 임베딩 행렬/색인은 그대로 공유하고,
+        HTTP 클라이언트, SQLite 연결, DB 연결 풀, ABC Lab 세션, 동시 처리 제한은 워커별로 새로 만든다.
+        상속된 소켓은 부모 프로세스도 사용하므로 닫지 않고 참조만 버린다.
+        """
+        # fork 시점에 다른 스레드(백그라운드 워밍업)가 잡고 있던 잠금은 자식에서 풀리지 않음
+        self._lock = threading.RLock()
+        with self._lock:
+            if self._instances.pop("http_client", None) is not None:
+                embedding_service = self._instances.get("embedding_service")
+                if embedding_service is not None:
+                    for backend in embedding_service.backends.values():
+                        if backend.remote:
+                            backend.reset_client(self.http_client)
+            task_service = self._instances.get("task_service")
+            if task_service is not None:
+                task_service.store.reset_connections()
+
+        DatabaseService.reset_pools()
+        ABCLabService.reset_session()
+        reset_limiters()
+        logger.info(f"워커 프로세스 연결 초기화 (pid {os.getpid()})")
+
+        # 백그라운드 워밍업/재시도 스레드는 fork 되지 않으므로 워커에서 다시 시작
+        self._retry_thread = None
+        if self.warmup_status["state"] == "running":
+            self.start_warmup()
+        elif self.warmup_status["state"] in ("degraded", "failed"):
+            self._start_warmup_retry()
+
+    def close(self):
+        """공유 리소스 정리"""
+        retry_stop = self._retry_stop
+        if retry_stop is not None:
+            retry_stop.set()
+        task_service = self._instances.get("task_service")
+        if task_service is not None:
+            task_service.embedding_worker.stop()
+        client = self._instances.get("http_client")
+        if client is not None:
+            client.close()
+
+
+def init_services(app, warmup=False):
+    """앱에 서비스 레지스트리 등록
+
+    warmup: False (첫 사용 시 생성) | True (즉시 워밍업) | "background" (백그라운드 워밍업)
+    """
+    registry = ServiceRegistry()
+    app.extensions['services'] = registry
+    # 작업자가 아직 생성되지 않았으면 대기 0
+    EMBEDDING_QUEUE_PENDING.set_function(
+        lambda: registry.embedding_worker.status()["pending"] if registry.is_loaded("task_service") else 0
+    )
+
+    if warmup == "background":
+        registry.start_warmup()
+    elif warmup:
+        registry.warmup()
+
+    # 임베딩 없는 과제 채우기는 작업자가 생성된 뒤 첫 요청 시 시작
+    # (리로더 부모 프로세스나 fork 이전 마스터 프로세스에서는 스레드를 만들지 않음)
+    if embedding_worker_config.backfill_on_start:
+        @app.before_request
+        def start_embedding_backfill():
+            if registry.is_loaded("task_service"):
+                registry.embedding_worker.request_backfill()
+
+    return registry
+
+
+def get_services():
+    """현재 앱의 서비스 레지스트리 반환"""
+    return current_app.extensions['services']
@@ -0,0 +1,141 @@
+import os
+import json
+import time
+import uuid
+import secrets
+import logging
+from config import result_store_config
+from services.file_utils import file_lock, atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+
+class ResultStore:
+    """생성 결과(INSERT문) 임시 보관소
+
+    결과를 파일로 저장해 요청 응답과 워커 메모리에서 분리하고, 모든 워커 프로세스가 공유한다.
+    생성 후 보관 기간(ttl)이 지난 결과는 삭제하고, 보관 개수/전체 크기를 넘으면 가장 오래 사용하지 않은
+    결과부터 삭제한다 (LRU, 방금 저장한 결과는 크기가 한도를 넘어도 유지).
+    """
+
+    def __init__(self, results_dir=None, max_entries=None, max_bytes=None, ttl=None):
+        config = result_store_config
+        self.results_dir = results_dir or config.results_dir
+        self.max_entries = max_entries or config.max_entries
+        self.max_bytes = max_bytes or config.max_bytes
+        self.ttl = ttl or config.ttl
+        os.makedirs(self.results_dir, exist_ok=True)
+
+    def _path(self, result_id):
+        return os.path.join(self.results_dir, f"{result_id}.json")
+
+    @staticmethod
+    def _valid_id(result_id):
+        try:
+            return uuid.UUID(result_id).hex == result_id
+        except (ValueError, TypeError, AttributeError):
+            return False
+
+    @staticmethod
+    def _new_id(created_at):
+        """UUIDv7 형식 결과 ID (앞 48비트가 생성 시각 ms라 파일을 읽지 않고 만료 판단)"""
+        value = (int(created_at * 1000) << 80) | secrets.randbits(80)
+        value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+        value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+        return uuid.UUID(int=value).hex
+
+    @staticmethod
+    def _created_at(path):
+        """결과 생성 시각 (UUIDv7 ID는 파일명에서, 이전 형식 ID는 파일 내용에서)"""
+        result_id = os.path.basename(path)[:-len(".json")]
+        try:
+            value = uuid.UUID(result_id)
+        except ValueError:
+            value = None
+        if value is not None and value.version == 7:
+            return (value.int >> 80) / 1000
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f).get("created_at", 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def put(self, result):
+        """결과 저장 후 result_id 반환"""
+        created_at = time.time()
+        result_id = self._new_id(created_at)
+        path = self._path(result_id)
+        atomic_write_json(path, {"created_at": created_at, **result},
+                          ensure_ascii=False, separators=(",", ":"))
+        self._evict(keep=path)
+        return result_id
+
+    def get(self, result_id):
+        """결과 조회 (없거나 만료되면 None)"""
+        if not self._valid_id(result_id):
+            return None
+        path = self._path(result_id)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+        except FileNotFoundError:
+            return None
+
+        if time.time() - result.get("created_at", 0) > self.ttl:
+            self._remove(path)
+            return None
+        # 최근 사용 시각 갱신 (LRU)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return result
+
+    def _entries(self):
+        """[(마지막 사용 시각, 크기, 경로)] 오래 사용하지 않은 순"""
+        entries = []
+        for name in os.listdir(self.results_dir):
+            if not name.endswith(".json") or name.startswith("."):
+                continue
+            path = os.path.join(self.results_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        return entries
+
+    def _evict(self, keep=None):
+        """만료(생성 시각 기준) 결과 삭제 후 개수/크기 초과분을 LRU 순으로 삭제 (keep 경로는 유지)"""
+        with file_lock(os.path.join(self.results_dir, ".results")):
+            expired_before = time.time() - self.ttl
+            entries = []
+            removed = 0
+            for entry in self._entries():
+                if entry[2] != keep and self._created_at(entry[2]) < expired_before:
+                    self._remove(entry[2])
+                    removed += 1
+                else:
+                    entries.append(entry)
+
+            count = len(entries)
+            total = sum(size for _, size, _ in entries)
+            for used_at, size, path in entries:
+                if count <= self.max_entries and total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                self._remove(path)
+                count -= 1
+                total -= size
+                removed += 1
+            if removed:
+                logger.info(f"생성 결과 {removed}개 정리 (보관 {count}개, {total / 1e6:.1f}MB)")
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,75 @@
+import re
+from dataclasses import dataclass, field
+
+
+def map_id(value, source_ne_id, target_ne_id):
+    """ID 값의 기준 NE ID를 신규 NE ID로 치환 (영숫자로 이어지지 않는 위치만, NE1은 NE10을 바꾸지 않음)"""
+    pattern = rf"(?<![0-9A-Za-z]){re.escape(source_ne_id)}(?![0-9A-Za-z])"
+    return re.sub(pattern, lambda _: target_ne_id, value)
+
+
+def map_row(row, colnames, source_ne_id, target_ne_id, id_columns=()):
+    """기준 NE 행 → 신규 NE 기준 값
+
+    값 전체가 기준 NE ID인 문자열은 신규 NE ID로 바꾸고, id_columns 컬럼은 값 안의 기준 NE ID도 바꾼다.
+    그 외 컬럼(경로, 비고 등)은 그대로 둔다.
+    """
+    mapped = []
+    for name, value in zip(colnames, row):
+        if isinstance(value, str):
+            if value == source_ne_id:
+                value = target_ne_id
+            elif name.lower() in id_columns:
+                value = map_id(value, source_ne_id, target_ne_id)
+        mapped.append(value)
+    return tuple(mapped)
+
+
+def parse_columns(text):
+    """쉼표 구분 컬럼 목록 → 소문자 컬럼명 집합"""
+    return {name.strip().lower() for name in (text or "").split(",") if name.strip()}
+
+
+@dataclass
+class TableDiff:
+    """테이블별 비교 결과
+
+    inserts: 신규 NE에 없는 기준 NE 행 (ABC Lab 변환 대상)
+    updates: (신규 NE 기준으로 치환한 행, 값이 다른 컬럼 위치 목록)
+    """
+    key_columns: list
+    inserts: list = field(default_factory=list)
+    updates: list = field(default_factory=list)
+    unchanged: int = 0
+
+
+def diff_rows(colnames, source_rows, target_rows, key_columns, source_ne_id, target_ne_id,
+              ignore_columns=(), id_columns=()):
+    """기준 NE 행을 신규 NE 기준으로 치환해 키(기본키, 없으면 전체 컬럼)로 신규 NE 행과 비교
+
+    키가 같은 행이 없으면 INSERT, 있으면 ignore_columns를 제외한 값이 다른 컬럼만 UPDATE 대상이다.
+    """
+    positions = {name: index for index, name in enumerate(colnames)}
+    key_index = [positions[name] for name in key_columns if name in positions]
+    if not key_index or len(key_index) != len(key_columns):
+        key_index = list(range(len(colnames)))
+    result = TableDiff(key_columns=[colnames[index] for index in key_index])
+
+    existing = {tuple(row[index] for index in key_index): row for row in target_rows}
+    compare_index = [
+        index for index, name in enumerate(colnames)
+        if index not in key_index and name.lower() not in ignore_columns
+    ]
+
+    for row in source_rows:
+        mapped = map_row(row, colnames, source_ne_id, target_ne_id, id_columns)
+        current = existing.get(tuple(mapped[index] for index in key_index))
+        if current is None:
+            result.inserts.append(row)
+            continue
+        changed = [index for index in compare_index if mapped[index] != current[index]]
+        if changed:
+            result.updates.append((mapped, changed))
+        else:
+            result.unchanged += 1
+    return result
@@ -0,0 +1,158 @@
+import re
+import json
+import logging
+from datetime import date, datetime, time
+
+logger = logging.getLogger(__name__)
+
+
+def quote_ident(name):
+    """SQL 식별자 (큰따옴표, 대소문자 그대로)"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def quote_literal(text):
+    """SQL 문자열 리터럴 (작은따옴표 이스케이프)"""
+    return "'" + text.replace("'", "''") + "'"
+
+
+def where_condition(where_clause):
+    """사용자 WHERE 절 → 조건식 (앞의 WHERE 키워드와 끝의 ; 제거, 없으면 빈 문자열)"""
+    where_clause = (where_clause or "").strip().rstrip(";")
+    return re.sub(r"^\s*where\b", "", where_clause, flags=re.I).strip()
+
+
+def _pg_offset(text, offset):
+    """isoformat 시간대(+09:00) → PostgreSQL 표기(+09, 분/초가 있으면 +05:30)"""
+    if offset is None:
+        return text
+    # isoformat은 초 단위 오프셋이면 +HH:MM:SS까지 붙인다
+    seconds = int(offset.total_seconds())
+    suffix_length = 9 if seconds % 60 else 6
+    sign = "-" if seconds < 0 else "+"
+    hours, rest = divmod(abs(seconds), 3600)
+    minutes, secs = divmod(rest, 60)
+    suffix = f"{sign}{hours:02d}"
+    if minutes or secs:
+        suffix += f":{minutes:02d}"
+    if secs:
+        suffix += f":{secs:02d}"
+    return text[:-suffix_length] + suffix
+
+
+def pg_text(value):
+    """psycopg2 값 → PostgreSQL ::text 표현"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime):
+        return _pg_offset(value.isoformat(sep=" "), value.utcoffset())
+    if isinstance(value, time):
+        return _pg_offset(value.isoformat(), value.utcoffset())
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def _numeric(value):
+    return "NULL" if value is None else pg_text(value)
+
+
+def _varchar(value):
+    return "NULL" if value is None else quote_literal(pg_text(value))
+
+
+def _timestamp(value):
+    return "NULL" if value is None else "DATE(" + quote_literal(pg_text(value)) + ")"
+
+
+def _replacer(old, new):
+    def replace(value):
+        if value is None:
+            return "NULL"
+        text = pg_text(value)
+        # PostgreSQL REPLACE와 같이 빈 문자열은 바꾸지 않음
+        return quote_literal(text.replace(old, new) if old else text)
+    return replace
+
+
+def _user_input(column_name, column_type, value):
+    """사용자 입력 값 → 고정 리터럴 (SQL 템플릿 방식과 같은 결과, 문자열은 이스케이프)"""
+    if not value:
+        return "NULL"
+    if column_type == "numeric":
+        try:
+            float(value)  # 유효성 검사
+            return value
+        except ValueError:
+            logger.warning(f"컬럼 {column_name}에 대한 숫자 값이 올바르지 않음: {value}")
+            return "NULL"
+    if column_type == "varchar":
+        return quote_literal(value)
+    if column_type == "timestamp":
+        return "DATE(" + quote_literal(value) + ")"
+    # 그 외 타입은 입력 값을 그대로 사용 (SQL 템플릿 방식과 동일)
+    return value
+
+
+class RowTransformer:
+    """커스텀 SQL 컬럼 옵션을 컬럼별 Python 변환으로 미리 컴파일
+
+    DB에서는 값이 필요한 컬럼만 그대로 조회하고(projection), 옵션 적용과 리터럴 변환은 Python에서 한다.
+    결과 INSERT문은 SQL 템플릿 방식(generate_custom_sql)과 같은 형식이다.
+    """
+
+    DEFAULT_FORMATTERS = {"numeric": _numeric, "varchar": _varchar, "timestamp": _timestamp}
+
+    def __init__(self, schema, table_name, columns, form_data):
+        if not columns:
+            raise ValueError(f"테이블 '{table_name}'에 대해 선택된 컬럼이 없습니다.")
+        self.schema = schema
+        self.table_name = table_name
+        # 조회할 컬럼명 (projection 순서)
+        self.columns = []
+        # 컬럼별 (변환 함수, 조회 위치) 또는 (None, 고정 리터럴)
+        self.plan = []
+
+        for column_name, column_type in columns:
+            option = form_data.get(f"{column_name}_option", "default")
+            if option == "now":
+                self.plan.append((None, "NOW()"))
+            elif option == "user_input":
+                self.plan.append((None, _user_input(column_name, column_type, form_data.get(f"{column_name}_value", ""))))
+            else:
+                if option == "replace":
+                    value1 = form_data.get(f"{column_name}_value1", "")
+                    if not value1:
+                        logger.warning(f"컬럼 {column_name}에 대한 교체할 값이 지정되지 않음")
+                    formatter = _replacer(value1, form_data.get(f"{column_name}_value2", ""))
+                elif option == "default":
+                    formatter = self.DEFAULT_FORMATTERS.get(column_type, _varchar)
+                else:
+                    logger.warning(f"알 수 없는 옵션: {option}")
+                    formatter = _varchar
+                self.plan.append((formatter, len(self.columns)))
+                self.columns.append(column_name)
+
+        self.prefix = f"INSERT INTO {schema}.{table_name} VALUES("
+
+    def query(self, where_clause=""):
+        """값이 필요한 컬럼만 조회하는 SELECT (모든 컬럼이 고정 값이면 행 수만큼 1 조회)"""
+        projection = ", ".join(quote_ident(name) for name in self.columns) or "1"
+        sql = f"SELECT {projection} FROM {quote_ident(self.schema)}.{quote_ident(self.table_name)}"
+        condition = where_condition(where_clause)
+        if condition:
+            sql += f"\nWHERE {condition}"
+        return sql
+
+    def render(self, rows):
+        """조회 행 → INSERT문 목록"""
+        prefix = self.prefix
+        plan = self.plan
+        return [
+            prefix + ",".join([arg if formatter is None else formatter(row[arg]) for formatter, arg in plan]) + ");"
+            for row in rows
+        ]
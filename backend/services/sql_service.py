@@ -1,8 +1,18 @@
+import json
+import base64
 import logging
+from config import ai_sql_config
 from services.db_service import DatabaseService
+from services.row_diff import diff_rows, map_id, parse_columns
+from services.row_transformer import RowTransformer, pg_text, quote_ident, quote_literal, where_condition
+from services.tracing import span
 
 logger = logging.getLogger(__name__)
 
+# AI SQL 생성 대상 테이블 (INSERT문 순서)
+AI_SQL_SCHEMA = "kmznmst"
+AI_SQL_TABLES = ["tb_cdrsend_base_info", "tb_cdrcoll_base_info", "tb_cdrcoll_srvr_info", "tb_wflow_info", "tb_file_fmt_info"]
+
 class SQLService:
     """SQL 생성 관련 서비스"""
 
@@ -87,34 +97,39 @@ class SQLService:
             raise
 
     @staticmethod
-    def generate_custom_sql(schema, table_name, columns, form_data):
-        """커스텀 SQL 생성"""
-        try:
-            field_list = []
-            
-            for idx, (column_name, column_type) in enumerate(columns):
-                option = form_data.get(f"{column_name}_option", "default")
-                field_template = SQLService.generate_field_template(option, column_name, column_type, form_data)
+    def custom_insert_expression(schema, table_name, columns, form_data):
+        """컬럼 옵션 → 행마다 INSERT문 문자열을 만드는 SQL 식"""
+        field_list = []
 
-                if field_template == "404":
-                    raise ValueError(f"컬럼 '{column_name}'의 날짜 형식이 올바르지 않습니다.")
+        for idx, (column_name, column_type) in enumerate(columns):
+            option = form_data.get(f"{column_name}_option", "default")
+            field_template = SQLService.generate_field_template(option, column_name, column_type, form_data)
 
-                if idx < len(columns) - 1:
-                    field_template += "','||\n"
-                field_list.append(field_template)
+            if field_template == "404":
+                raise ValueError(f"컬럼 '{column_name}'의 날짜 형식이 올바르지 않습니다.")
 
-            if not field_list:
-                raise ValueError(f"테이블 '{table_name}'에 대해 선택된 컬럼이 없습니다.")
+            if idx < len(columns) - 1:
+                field_template += "','||\n"
+            field_list.append(field_template)
+
+        if not field_list:
+            raise ValueError(f"테이블 '{table_name}'에 대해 선택된 컬럼이 없습니다.")
+
+        return f"'INSERT INTO {schema}.{table_name} VALUES('||\n{''.join(field_list)}');'"
+
+    @staticmethod
+    def generate_custom_sql(schema, table_name, columns, form_data):
+        """커스텀 SQL 생성"""
+        try:
+            expression = SQLService.custom_insert_expression(schema, table_name, columns, form_data)
 
             # 스키마 포함된 SQL 템플릿 생성
-            sql_template = f"SELECT 'INSERT INTO {schema}.{table_name} VALUES('||\n{''.join(field_list)}');' as sql FROM {schema}.{table_name}"
+            sql_template = f"SELECT {expression} as sql FROM {schema}.{table_name}"
 
             # WHERE 절 처리
-            where_clause = form_data.get("where_clause", "").strip()
-            if where_clause:
-                if not where_clause.upper().startswith("WHERE"):
-                    where_clause = f"WHERE {where_clause}"
-                sql_template += f"\n{where_clause};"
+            condition = where_condition(form_data.get("where_clause"))
+            if condition:
+                sql_template += f"\nWHERE {condition};"
             else:
                 sql_template += ";"
 
@@ -125,6 +140,112 @@ class SQLService:
             logger.error(f"커스텀 SQL 생성 중 오류: {e}")
             raise
 
+    @staticmethod
+    def generate_custom_rows(schema, table_name, columns, form_data):
+        """커스텀 SQL 생성 (python 방식) - 값이 필요한 컬럼만 조회해 Python에서 옵션 적용 후 INSERT문 생성
+
+        반환: (조회 쿼리, [(INSERT문,), ...], ["sql"]) - SQL 템플릿 방식 실행 결과와 같은 형태
+        """
+        try:
+            transformer = RowTransformer(schema, table_name, columns, form_data)
+            query = transformer.query(form_data.get("where_clause", ""))
+            rows, _ = DatabaseService.execute_query(query)
+
+            with span("render.custom_rows", table=table_name, rows=len(rows)):
+                statements = transformer.render(rows)
+
+            logger.info(f"커스텀 SQL 생성 완료 (python): {schema}.{table_name} {len(statements)}건")
+            return query, [(statement,) for statement in statements], ["sql"]
+
+        except Exception as e:
+            logger.error(f"커스텀 SQL 생성 중 오류 (python): {e}")
+            raise
+
+    @staticmethod
+    def _encode_cursor(values):
+        """키 값 → 다음 페이지 커서 (base64url JSON)"""
+        text = json.dumps([pg_text(value) for value in values], ensure_ascii=False, separators=(",", ":"))
+        return base64.urlsafe_b64encode(text.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor, key_columns):
+        """다음 페이지 커서 → 키 값 목록 (잘못된 커서는 ValueError)"""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        except (ValueError, UnicodeError):
+            raise ValueError("after 값이 올바르지 않습니다. (이전 응답의 next_after를 그대로 사용하세요)")
+        if not isinstance(values, list) or len(values) != len(key_columns) or \
+                not all(isinstance(value, str) for value in values):
+            raise ValueError("after 값이 현재 테이블 기본키와 맞지 않습니다.")
+        return values
+
+    @staticmethod
+    def preview_custom_rows(schema, table_name, columns, form_data, engine, limit, after=None):
+        """커스텀 SQL 미리보기 - 기본키 순서로 limit건씩 조회 (after: 이전 페이지의 next_after)
+
+        기본키 조건으로 다음 페이지를 찾으므로 OFFSET 없이 어느 페이지든 limit건만 읽는다.
+        반환: (조회 쿼리, 행 목록, 컬럼명 목록, 페이지 정보)
+        """
+        try:
+            key_columns = DatabaseService.get_primary_key(schema, table_name)
+            if after and not key_columns:
+                raise ValueError(f"기본키가 없는 테이블 '{table_name}'은 다음 페이지(after)를 조회할 수 없습니다.")
+
+            conditions = []
+            condition = where_condition(form_data.get("where_clause"))
+            if condition:
+                conditions.append(f"({condition})")
+            keys = ", ".join(quote_ident(name) for name in key_columns)
+            if after:
+                values = SQLService._decode_cursor(after, key_columns)
+                conditions.append(f"({keys}) > ({', '.join(quote_literal(value) for value in values)})")
+
+            if engine == "python":
+                transformer = RowTransformer(schema, table_name, columns, form_data)
+                select_list = [quote_ident(name) for name in transformer.columns] or ["1"]
+            else:
+                select_list = [f"{SQLService.custom_insert_expression(schema, table_name, columns, form_data)} as sql"]
+            value_count = len(select_list)
+
+            query = f"SELECT {', '.join(select_list + [quote_ident(name) for name in key_columns])}\n" \
+                    f"FROM {quote_ident(schema)}.{quote_ident(table_name)}"
+            if conditions:
+                query += f"\nWHERE {' AND '.join(conditions)}"
+            if key_columns:
+                query += f"\nORDER BY {keys}"
+            # 다음 페이지 여부 확인용으로 1건 더 조회
+            query += f"\nLIMIT {int(limit) + 1}"
+
+            rows, colnames = DatabaseService.execute_query(query)
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+
+            if engine == "python":
+                with span("render.custom_rows", table=table_name, rows=len(rows)):
+                    page_rows = [(statement,) for statement in transformer.render(rows)]
+            else:
+                page_rows = [row[:1] for row in rows]
+
+            next_after = None
+            if has_more and key_columns:
+                next_after = SQLService._encode_cursor(rows[-1][value_count:])
+
+            page = {
+                "limit": limit,
+                "after": after,
+                "next_after": next_after,
+                "has_more": has_more,
+                "key_columns": key_columns,
+                **DatabaseService.estimate_row_count(schema, table_name, condition)
+            }
+            logger.info(f"커스텀 SQL 미리보기 ({engine}): {schema}.{table_name} {len(page_rows)}건, 다음 페이지 {has_more}")
+            return query, page_rows, ["sql"], page
+
+        except Exception as e:
+            logger.error(f"커스텀 SQL 미리보기 중 오류: {e}")
+            raise
+
     @staticmethod
     def execute_and_generate_inserts(query, schema, table_name):
         """쿼리 실행하여 INSERT문 생성"""
@@ -135,7 +256,17 @@ class SQLService:
                 logger.warning(f"테이블 {schema}.{table_name}에서 조회된 데이터가 없습니다.")
                 return []
 
-            insert_statements = []
+            return SQLService.render_inserts(rows, schema, table_name)
+
+        except Exception as e:
+            logger.error(f"INSERT문 생성 중 오류 ({schema}.{table_name}): {e}")
+            raise
+
+    @staticmethod
+    def render_inserts(rows, schema, table_name):
+        """조회 행 → INSERT문 목록"""
+        insert_statements = []
+        with span("render.inserts", table=table_name, rows=len(rows)):
             for row in rows:
                 values = []
                 for value in row:
@@ -151,81 +282,152 @@ class SQLService:
                 insert_sql = f"INSERT INTO {schema}.{table_name} VALUES ({', '.join(values)});"
                 insert_statements.append(insert_sql)
 
-            logger.info(f"테이블 {schema}.{table_name}: {len(insert_statements)}개 INSERT문 생성 완료")
-            return insert_statements
+        logger.info(f"테이블 {schema}.{table_name}: {len(insert_statements)}개 INSERT문 생성 완료")
+        return insert_statements
 
-        except Exception as e:
-            logger.error(f"INSERT문 생성 중 오류 ({schema}.{table_name}): {e}")
-            raise
+    @staticmethod
+    def _sql_value(value):
+        """INSERT문과 같은 규칙의 값 표현"""
+        if value is None:
+            return 'NULL'
+        if isinstance(value, str):
+            escaped_value = value.replace("'", "''")
+            return f"'{escaped_value}'"
+        return str(value)
+
+    @staticmethod
+    def render_updates(changes, colnames, key_columns, schema, table_name):
+        """(신규 NE 기준 행, 변경 컬럼 위치) 목록 → 신규 NE 기본키 조건 UPDATE문 목록
+
+        ABC Lab 변환 없이(원본 사용 시에도) 신규 NE 행만 수정하도록 키와 값은 이미 신규 NE 기준이다.
+        """
+        key_index = [colnames.index(name) for name in key_columns]
+        update_statements = []
+        for row, changed in changes:
+            assignments = ", ".join(f"{colnames[index]} = {SQLService._sql_value(row[index])}" for index in changed)
+            conditions = " AND ".join(
+                f"{colnames[index]} IS NULL" if row[index] is None
+                else f"{colnames[index]} = {SQLService._sql_value(row[index])}"
+                for index in key_index
+            )
+            update_statements.append(f"UPDATE {schema}.{table_name} SET {assignments} WHERE {conditions};")
+        return update_statements
+
+    @staticmethod
+    def _fetch_rows(table_name, where, params):
+        """AI SQL 대상 테이블 조회 → (행 목록, 컬럼명 목록)"""
+        with span(f"fetch.{table_name}"):
+            return DatabaseService.execute_query(
+                f"SELECT * FROM {AI_SQL_SCHEMA}.{table_name} WHERE {where}", params)
 
     @staticmethod
-    def get_ai_sql_tables_data(source_ne_id):
-        """AI SQL 생성을 위한 5개 테이블 데이터 조회"""
+    def fetch_ai_sql_rows(ne_id, wflow_ids=None, fmt_ids=None):
+        """AI SQL 생성 대상 5개 테이블 행 조회 {테이블명: (행 목록, 컬럼명 목록)}
+
+        tb_wflow_info / tb_file_fmt_info는 tb_cdrsend_base_info 행이 참조하는 ID 전체를 한 번에 조회한다.
+        wflow_ids / fmt_ids를 주면 참조 ID 대신 해당 ID로 조회한다.
+        """
+        tables = {}
+        tables["tb_cdrsend_base_info"] = SQLService._fetch_rows(
+            "tb_cdrsend_base_info", "ne_id = %s AND exp_dt > now()", (ne_id,))
+        tables["tb_cdrcoll_base_info"] = SQLService._fetch_rows(
+            "tb_cdrcoll_base_info", "ne_id = %s AND exp_dt > now()", (ne_id,))
+        tables["tb_cdrcoll_srvr_info"] = SQLService._fetch_rows(
+            "tb_cdrcoll_srvr_info", "srvr_id = %s AND exp_dt > now()", (ne_id,))
+
+        if wflow_ids is None or fmt_ids is None:
+            send_wflow_ids, send_fmt_ids = SQLService._referenced_ids(*tables["tb_cdrsend_base_info"])
+            wflow_ids = send_wflow_ids if wflow_ids is None else wflow_ids
+            fmt_ids = send_fmt_ids if fmt_ids is None else fmt_ids
+
+        # 4. tb_wflow_info (연관된 workflow ID 기반)
+        tables["tb_wflow_info"] = SQLService._fetch_rows(
+            "tb_wflow_info", "wflow_inst_id = ANY(%s) AND exp_dt > now()", (list(wflow_ids),)) if wflow_ids else ([], [])
+        # 5. tb_file_fmt_info (연관된 format ID 기반)
+        tables["tb_file_fmt_info"] = SQLService._fetch_rows(
+            "tb_file_fmt_info", "cdr_file_fmt_id = ANY(%s)", (list(fmt_ids),)) if fmt_ids else ([], [])
+        return tables
+
+    @staticmethod
+    def _referenced_ids(rows, colnames):
+        """tb_cdrsend_base_info 행이 참조하는 (workflow ID 목록, format ID 목록)"""
+        if not rows:
+            return [], []
+        wflow_index = colnames.index("wflow_inst_id")
+        fmt_indexes = [colnames.index("origin_fmt_id"), colnames.index("cdr_change_fmt_id")]
+
+        wflow_ids = {}
+        fmt_ids = {}
+        for row in rows:
+            wflow_id = row[wflow_index]
+            if wflow_id and (wflow_id.startswith('C') or wflow_id.startswith('P')):
+                wflow_ids[wflow_id] = None
+            for index in fmt_indexes:
+                if row[index]:
+                    fmt_ids[row[index]] = None
+        return list(wflow_ids), list(fmt_ids)
+
+    @staticmethod
+    def get_ai_sql_tables_data(source_ne_id, target_ne_id=None, diff=False):
+        """AI SQL 생성을 위한 5개 테이블 데이터 조회
+
+        diff=True면 신규 NE의 기존 행과 비교해 없는 행은 INSERT(기준 NE 값, ABC Lab 변환 대상),
+        값이 다른 행은 신규 NE 기준 UPDATE문만 생성한다.
+        (tb_wflow_info / tb_file_fmt_info는 기준 NE가 참조하는 ID를 신규 NE 기준으로 치환해 이미 있는지 확인)
+        """
         try:
             migration_results = {}
             total_insert_count = 0
 
-            # 1. tb_cdrsend_base_info
-            query1 = f"SELECT * FROM kmznmst.tb_cdrsend_base_info WHERE ne_id = '{source_ne_id}' AND exp_dt > now()"
-            insert_statements_1 = SQLService.execute_and_generate_inserts(query1, "kmznmst", "tb_cdrsend_base_info")
-            migration_results["tb_cdrsend_base_info"] = {"count": len(insert_statements_1), "statements": insert_statements_1}
-            total_insert_count += len(insert_statements_1)
-
-            # 2. tb_cdrcoll_base_info
-            query2 = f"SELECT * FROM kmznmst.tb_cdrcoll_base_info WHERE ne_id = '{source_ne_id}' AND exp_dt > now()"
-            insert_statements_2 = SQLService.execute_and_generate_inserts(query2, "kmznmst", "tb_cdrcoll_base_info")
-            migration_results["tb_cdrcoll_base_info"] = {"count": len(insert_statements_2), "statements": insert_statements_2}
-            total_insert_count += len(insert_statements_2)
-
-            # 3. tb_cdrcoll_srvr_info
-            query3 = f"SELECT * FROM kmznmst.tb_cdrcoll_srvr_info WHERE srvr_id = '{source_ne_id}' AND exp_dt > now()"
-            insert_statements_3 = SQLService.execute_and_generate_inserts(query3, "kmznmst", "tb_cdrcoll_srvr_info")
-            migration_results["tb_cdrcoll_srvr_info"] = {"count": len(insert_statements_3), "statements": insert_statements_3}
-            total_insert_count += len(insert_statements_3)
-
-            # 4. tb_wflow_info (연관된 workflow ID 기반)
-            wflow_query = f"SELECT DISTINCT wflow_inst_id FROM kmznmst.tb_cdrsend_base_info WHERE ne_id = '{source_ne_id}' AND exp_dt > now()"
-            wflow_rows, _ = DatabaseService.execute_query(wflow_query)
-            
-            wflow_ids = []
-            for row in wflow_rows:
-                if row[0] and (row[0].startswith('C') or row[0].startswith('P')):
-                    wflow_ids.append(row[0])
-
-            insert_statements_4 = []
-            for wflow_id in wflow_ids:
-                query4 = f"SELECT * FROM kmznmst.tb_wflow_info WHERE wflow_inst_id = '{wflow_id}' AND exp_dt > now()"
-                statements = SQLService.execute_and_generate_inserts(query4, "kmznmst", "tb_wflow_info")
-                insert_statements_4.extend(statements)
-
-            migration_results["tb_wflow_info"] = {"count": len(insert_statements_4), "statements": insert_statements_4}
-            total_insert_count += len(insert_statements_4)
-
-            # 5. tb_file_fmt_info (연관된 format ID 기반)
-            fmt_query = f"SELECT origin_fmt_id, cdr_change_fmt_id FROM kmznmst.tb_cdrsend_base_info WHERE ne_id = '{source_ne_id}' AND exp_dt > now()"
-            fmt_rows, _ = DatabaseService.execute_query(fmt_query)
-            
-            fmt_ids = []
-            for row in fmt_rows:
-                if row[0]:  # origin_fmt_id
-                    fmt_ids.append(row[0])
-                if row[1]:  # cdr_change_fmt_id
-                    fmt_ids.append(row[1])
-            
-            fmt_ids = list(set(fmt_ids))  # 중복 제거
-
-            insert_statements_5 = []
-            for fmt_id in fmt_ids:
-                query5 = f"SELECT * FROM kmznmst.tb_file_fmt_info WHERE cdr_file_fmt_id = '{fmt_id}'"
-                statements = SQLService.execute_and_generate_inserts(query5, "kmznmst", "tb_file_fmt_info")
-                insert_statements_5.extend(statements)
-
-            migration_results["tb_file_fmt_info"] = {"count": len(insert_statements_5), "statements": insert_statements_5}
-            total_insert_count += len(insert_statements_5)
-
-            logger.info(f"AI SQL 생성용 데이터 조회 완료: 총 {total_insert_count}개 INSERT문")
+            source_tables = SQLService.fetch_ai_sql_rows(source_ne_id)
+            if diff:
+                with span("diff.fetch_target"):
+                    wflow_ids, fmt_ids = SQLService._referenced_ids(*source_tables["tb_cdrsend_base_info"])
+                    target_tables = SQLService.fetch_ai_sql_rows(
+                        target_ne_id,
+                        wflow_ids=[map_id(wflow_id, source_ne_id, target_ne_id) for wflow_id in wflow_ids],
+                        fmt_ids=[map_id(fmt_id, source_ne_id, target_ne_id) for fmt_id in fmt_ids])
+                ignore_columns = parse_columns(ai_sql_config.diff_ignore_columns)
+                id_columns = parse_columns(ai_sql_config.diff_id_columns)
+
+            for table_name in AI_SQL_TABLES:
+                rows, colnames = source_tables[table_name]
+                if not diff:
+                    statements = SQLService.render_inserts(rows, AI_SQL_SCHEMA, table_name) if rows else []
+                    migration_results[table_name] = {"count": len(statements), "statements": statements}
+                    total_insert_count += len(statements)
+                    continue
+
+                target_rows, _ = target_tables[table_name]
+                key_columns = DatabaseService.get_primary_key(AI_SQL_SCHEMA, table_name) if rows else []
+                with span("diff.rows", table=table_name, rows=len(rows), target_rows=len(target_rows)):
+                    table_diff = diff_rows(colnames, rows, target_rows, key_columns,
+                                           source_ne_id, target_ne_id, ignore_columns, id_columns)
+                inserts = SQLService.render_inserts(table_diff.inserts, AI_SQL_SCHEMA, table_name) if table_diff.inserts else []
+                updates = SQLService.render_updates(table_diff.updates, colnames, table_diff.key_columns,
+                                                    AI_SQL_SCHEMA, table_name)
+                statements = inserts + updates
+                migration_results[table_name] = {
+                    "count": len(statements),
+                    "statements": statements,
+                    "diff": {
+                        "source_rows": len(rows),
+                        "target_rows": len(target_rows),
+                        "inserts": len(inserts),
+                        "updates": len(updates),
+                        "unchanged": table_diff.unchanged,
+                        "key_columns": table_diff.key_columns
+                    }
+                }
+                total_insert_count += len(statements)
+
+            if diff:
+                logger.info(f"AI SQL 생성용 데이터 비교 완료 ({source_ne_id} -> {target_ne_id}): "
+                            f"총 {total_insert_count}개 INSERT/UPDATE문")
+            else:
+                logger.info(f"AI SQL 생성용 데이터 조회 완료: 총 {total_insert_count}개 INSERT문")
             return migration_results, total_insert_count
 
         except Exception as e:
             logger.error(f"AI SQL 생성용 데이터 조회 중 오류: {e}")
-            raise
\ No newline at end of file
+            raise
@@ -0,0 +1,82 @@
+import re
+
+# 식별자(스키마.테이블 포함) 또는 숫자 토큰
+_TOKEN_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_$]*(?:\.[A-Za-z_][A-Za-z0-9_$]*)*|\d+")
+
+# 유사도 판단에 기여가 적은 SQL 예약어
+SQL_KEYWORDS = frozenset({
+    "select", "insert", "into", "values", "update", "set", "delete", "from", "where",
+    "and", "or", "not", "null", "is", "in", "as", "on", "join", "left", "right", "inner",
+    "outer", "group", "by", "order", "having", "limit", "offset", "distinct", "case",
+    "when", "then", "else", "end", "exists", "between", "like", "union", "all", "asc",
+    "desc", "now", "date", "true", "false", "create", "table", "alter", "drop", "with",
+})
+
+
+def tokenize_sql(text):
+    """SQL 텍스트를 소문자 토큰 리스트로 분리
+
+    `schema.table` 형태는 전체 식별자와 함께 각 구성요소도 토큰으로 추가해
+    스키마 생략 여부와 관계없이 같은 테이블이 매칭되도록 한다.
+    """
+    tokens = []
+    for token in _TOKEN_RE.findall(text or ""):
+        token = token.lower()
+        tokens.append(token)
+        if "." in token:
+            tokens.extend(token.split("."))
+    return tokens
+
+
+# 테이블 참조 위치 (FROM/JOIN/INTO/UPDATE/TABLE 뒤 식별자)
+_TABLE_RE = re.compile(r"\b(?:from|join|into|update|table)\s+([a-z_][\w$]*(?:\.[a-z_][\w$]*)?)", re.IGNORECASE)
+# INSERT 컬럼 목록: INSERT INTO t (a, b, ...)
+_INSERT_COLUMNS_RE = re.compile(r"\binto\s+[\w$.]+\s*\(([^)]*)\)\s*values", re.IGNORECASE)
+# 비교 연산 좌변 컬럼: col = ..., col IN (...), col LIKE ..., col IS ...
+_COMPARE_RE = re.compile(r"\b([a-z_][\w$]*)\s*(?:=|<>|!=|<=|>=|<|>|\s+in\b|\s+like\b|\s+is\b)", re.IGNORECASE)
+# 문자열 리터럴
+_LITERAL_RE = re.compile(r"'((?:[^']|'')*)'")
+# 리터럴 안의 코드값 (F4_LDAP_D, VOVLTE, GURV1 ...)
+_CODE_RE = re.compile(r"[A-Za-z0-9_]{2,}")
+# NE ID 형태: 영문으로 시작하고 숫자를 포함하는 4~12자 코드 (GURV1, P1PUSN02, LTHEHA10)
+_NE_ID_RE = re.compile(r"^[A-Z][A-Z0-9]{2,10}[0-9]$")
+
+
+def extract_sql_identifiers(sql):
+    """SQL에서 유사도 판단용 식별자 추출
+
+    반환 값은 종류 접두어가 붙은 용어 리스트이다 (중복 포함, 빈도 = TF).
+      t:스키마.테이블 / t:테이블, c:컬럼, ne:NE ID, v:리터럴 코드값
+    """
+    sql = sql or ""
+    terms = []
+
+    for table in _TABLE_RE.findall(sql):
+        table = table.lower()
+        terms.append(f"t:{table}")
+        if "." in table:
+            terms.append(f"t:{table.split('.', 1)[1]}")
+
+    for column_list in _INSERT_COLUMNS_RE.findall(sql):
+        for column in column_list.split(","):
+            column = column.strip().strip('"').lower()
+            if column:
+                terms.append(f"c:{column}")
+
+    # 리터럴을 제거한 뒤 비교식에서 컬럼명 추출
+    without_literals = _LITERAL_RE.sub("''", sql)
+    for column in _COMPARE_RE.findall(without_literals):
+        column = column.lower()
+        if column not in SQL_KEYWORDS:
+            terms.append(f"c:{column}")
+
+    for literal in _LITERAL_RE.findall(sql):
+        for code in _CODE_RE.findall(literal):
+            if code.isdigit():
+                continue
+            if _NE_ID_RE.match(code):
+                terms.append(f"ne:{code}")
+            else:
+                terms.append(f"v:{code.lower()}")
+
+    return terms
@@ -0,0 +1,74 @@
+import numpy as np
+
+
+class TaskMetadata:
+    """추천 필터용 과제 메타데이터 배열 (작성자 코드, 등록 시각)
+
+    과제 목록을 한 번 읽어 numpy 배열로 보관하고, 필터 조건을 bool 마스크로 계산한다.
+    마스크는 임베딩 인덱스 행 순서로 정렬해 유사도 계산과 함께 적용한다.
+    """
+
+    def __init__(self, tasks):
+        self.ids = [task['task_id'] for task in tasks]
+        self.positions = {task_id: i for i, task_id in enumerate(self.ids)}
+
+        # 작성자는 정수 코드로 변환해 비교
+        self.author_codes = {}
+        self.authors = np.array(
+            [self.author_codes.setdefault(task.get('author', '') or '', len(self.author_codes)) for task in tasks],
+            dtype=np.int32
+        )
+        self.created_at = np.array([self._parse_time(task.get('created_at')) for task in tasks],
+                                   dtype='datetime64[us]')
+        self.all_mask = np.ones(len(self.ids), dtype=bool)
+        # 인덱스 행 순서 → 메타데이터 위치 캐시 (ids 리스트, 위치 배열)
+        self._aligned = (None, None)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @staticmethod
+    def _parse_time(value):
+        try:
+            return np.datetime64(value, 'us') if value else np.datetime64('NaT')
+        except ValueError:
+            return np.datetime64('NaT')
+
+    def mask(self, author=None, created_after=None, created_before=None):
+        """필터 조건 bool 마스크 (조건이 없으면 None)
+
+        created_after 이상, created_before 미만. 등록 시각을 알 수 없는 과제는 날짜 조건에서 제외된다.
+        """
+        if author is None and created_after is None and created_before is None:
+            return None
+
+        mask = np.ones(len(self.ids), dtype=bool)
+        if author is not None:
+            code = self.author_codes.get(author)
+            if code is None:
+                return np.zeros(len(self.ids), dtype=bool)
+            mask &= self.authors == code
+        if created_after is not None:
+            mask &= self.created_at >= np.datetime64(created_after, 'us')
+        if created_before is not None:
+            mask &= self.created_at < np.datetime64(created_before, 'us')
+        return mask
+
+    def ids_for(self, mask):
+        """마스크에 해당하는 과제 ID 목록"""
+        return [self.ids[i] for i in np.flatnonzero(mask)]
+
+    def row_filter(self, mask):
+        """ids 순서의 bool 마스크를 반환하는 함수 (임베딩 검색용)"""
+        return lambda ids: self.align(ids, mask)
+
+    def align(self, ids, mask):
+        """메타데이터 마스크를 ids 순서로 재배열 (메타데이터에 없는 과제는 False)"""
+        if not len(mask):
+            return np.zeros(len(ids), dtype=bool)
+        aligned_ids, positions = self._aligned
+        if ids is not aligned_ids:
+            positions = np.fromiter((self.positions.get(task_id, -1) for task_id in ids),
+                                    dtype=np.int64, count=len(ids))
+            self._aligned = (ids, positions)
+        return (positions >= 0) & mask[np.maximum(positions, 0)]
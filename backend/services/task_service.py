@@ -1,27 +1,33 @@
-import os
 import json
+import base64
 import logging
 from datetime import datetime
+from config import task_store_config, duplicate_config
 from services.embedding_service import EmbeddingService
+from services.task_store import create_task_store, TASK_FIELDS, SUMMARY_FIELDS
+from services.lexical_index import BM25Index
+from services.sql_terms import extract_sql_identifiers
+from services.minhash import MinHasher, MinHashLSH
+from services.metrics import record_cache
 
 logger = logging.getLogger(__name__)
 
 
 class TaskService:
-    def __init__(self):
-        self.tasks_dir = "data/tasks"
-        self.embedding_service = EmbeddingService()
-        self._ensure_directory()
-
-    def _ensure_directory(self):
-        """디렉터리 생성"""
-        if not os.path.exists(self.tasks_dir):
-            os.makedirs(self.tasks_dir)
-            logger.info(f"과제 디렉터리 생성: {self.tasks_dir}")
+    def __init__(self, embedding_service=None, store=None, embedding_worker=None):
+        self.embedding_service = embedding_service or EmbeddingService()
+        self.store = store or create_task_store(task_store_config)
+        # 백그라운드 임베딩 작업자 (없으면 등록 시 동기 임베딩)
+        self.embedding_worker = embedding_worker
+        # SQL 파생 색인 {이름: 색인} - 첫 사용 시 생성, 과제 등록/삭제 시 증분 갱신
+        #   sql: 식별자(테이블, 컬럼, NE ID) BM25 역색인, duplicate: MinHash LSH
+        # 저장소 세대가 색인 시점과 다르면 저장소 변경 기록으로 다른 워커의 변경을 증분 반영
+        self._indexes = {}
+        self._index_generations = {}
+        self.minhasher = MinHasher(num_perm=duplicate_config.num_perm)
 
     def create_task(self, task_id, title, content, sql, author=""):
-        """과제 생성"""
-        filepath = None
+        """과제 생성 (임베딩은 백그라운드 작업으로 처리)"""
         try:
             # 1. 과제 데이터 구성
             task = {
@@ -34,68 +40,74 @@ class TaskService:
                 "updated_at": datetime.now().isoformat()
             }
 
-            # 2. JSON 파일 저장
-            filepath = os.path.join(self.tasks_dir, f"{task_id}.json")
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(task, f, ensure_ascii=False, indent=2)
-
-            logger.info(f"과제 파일 저장 완료: {filepath}")
-
-            # 3. 임베딩 생성 및 저장
-            # SQL이 너무 길면 잘라서 임베딩 (10,000자 제한)
-            MAX_CHARS = 10000
-            if len(sql) > MAX_CHARS:
-                # 앞 5,000자 + 뒤 5,000자
-                half = MAX_CHARS // 2
-                sql_preview = sql[:half] + "\n...(중략)...\n" + sql[-half:]
-                logger.info(f"⚠️ SQL 길이 제한: {len(sql)}자 → {MAX_CHARS}자")
-            else:
-                sql_preview = sql
+            # 2. 과제 저장
+            self.store.insert(task)
+            logger.info(f"과제 저장 완료: {task_id}")
+
+            # 3. SQL 식별자 / 유사 과제 색인
+            self._update_indexes(task_id, sql)
 
-            embedding_text = f"{title}\n{content}\n{sql_preview}"
-            embedding = self.embedding_service.create_embedding(embedding_text)
-            self.embedding_service.save_embedding(task_id, embedding)
+            # 4. 임베딩 생성 예약 (실패해도 과제는 유지, 재시도/backfill로 보완)
+            self._schedule_embedding(task)
 
             logger.info(f"✅ 과제 생성 완료: {task_id}")
             return task
 
         except Exception as e:
-            # 임베딩 실패 시 저장된 파일 삭제 (롤백)
-            if filepath and os.path.exists(filepath):
-                os.remove(filepath)
-                logger.warning(f"⚠️ 롤백: 파일 삭제됨 - {filepath}")
-
             logger.error(f"❌ 과제 생성 오류: {e}")
             raise
 
-    def get_task(self, task_id):
-        """과제 조회"""
-        filepath = os.path.join(self.tasks_dir, f"{task_id}.json")
+    def _schedule_embedding(self, task):
+        """임베딩 작업 등록 (작업자가 없으면 즉시 생성)"""
+        if self.embedding_worker is not None:
+            self.embedding_worker.enqueue([task['task_id']])
+            return
 
-        if not os.path.exists(filepath):
-            return None
+        try:
+            embedding = self.embedding_service.create_embeddings(self.build_embedding_text(task))
+            self.embedding_service.save_embedding(task['task_id'], embedding)
+        except Exception as e:
+            logger.warning(f"⚠️ 임베딩 생성 실패, 과제는 저장됨 (backfill 필요): {task['task_id']} - {e}")
+
+    @staticmethod
+    def build_embedding_text(task):
+        """임베딩 입력 텍스트 구성"""
+        sql = task.get('sql', '')
+
+        # SQL이 너무 길면 잘라서 임베딩 (10,000자 제한)
+        MAX_CHARS = 10000
+        if len(sql) > MAX_CHARS:
+            # 앞 5,000자 + 뒤 5,000자
+            half = MAX_CHARS // 2
+            sql_preview = sql[:half] + "\n...(중략)...\n" + sql[-half:]
+            logger.info(f"⚠️ SQL 길이 제한: {len(sql)}자 → {MAX_CHARS}자")
+        else:
+            sql_preview = sql
 
+        return f"{task.get('title', '')}\n{task.get('content', '')}\n{sql_preview}"
+
+    def get_task(self, task_id):
+        """과제 조회"""
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return self.store.get(task_id)
         except Exception as e:
             logger.error(f"과제 조회 오류: {e}")
             return None
 
-    def get_all_tasks(self):
-        """모든 과제 조회"""
+    def version(self):
+        """과제 저장소 버전 (세대, 마지막 변경 시각) - 과제 본문을 읽지 않음"""
+        return self.store.version()
+
+    def task_exists(self, task_id):
+        """과제 존재 여부 (본문 로드 없음)"""
+        return self.store.exists(task_id)
+
+    def get_all_tasks(self, include_sql=True):
+        """모든 과제 조회 (최신순)"""
         tasks = []
 
         try:
-            for filename in os.listdir(self.tasks_dir):
-                # JSON 파일만 (embeddings.json 제외)
-                if filename.endswith('.json') and filename != 'embeddings.json':
-                    filepath = os.path.join(self.tasks_dir, filename)
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        tasks.append(json.load(f))
-
-            # 최신순 정렬
-            tasks.sort(key=lambda x: x.get('created_at', ''), reverse=True)
+            tasks = self.store.list_tasks(include_sql=include_sql)
             logger.info(f"과제 목록 조회: {len(tasks)}개")
 
         except Exception as e:
@@ -103,24 +115,180 @@ class TaskService:
 
         return tasks
 
-    def delete_task(self, task_id):
-        """과제 삭제"""
-        filepath = os.path.join(self.tasks_dir, f"{task_id}.json")
+    def list_tasks(self, limit, cursor=None, fields=None, summary=False):
+        """과제 목록 페이지 조회 (created_at, task_id 키셋 페이지네이션)
 
-        if not os.path.exists(filepath):
-            return False
+        fields로 반환 필드를 지정하고, summary=True면 SQL 본문을 읽지 않는다.
+        반환: (tasks, next_cursor) - 마지막 페이지면 next_cursor는 None
+        """
+        fields = self._resolve_fields(fields, summary)
+        after = self.decode_cursor(cursor) if cursor else None
+
+        # 커서 생성을 위해 정렬 키는 항상 조회하고, 다음 페이지 유무 확인을 위해 1건 더 조회
+        query_fields = tuple(dict.fromkeys(fields + ("created_at", "task_id")))
+        rows = self.store.list_page(limit + 1, after, query_fields)
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self.encode_cursor(rows[-1]["created_at"], rows[-1]["task_id"])
+
+        tasks = [{field: row[field] for field in fields} for row in rows]
+        logger.info(f"과제 페이지 조회: {len(tasks)}개 (다음 페이지: {next_cursor is not None})")
+        return tasks, next_cursor
 
+    def search_tasks(self, query, limit, offset=0):
+        """과제 전문 검색 (제목, 내용, SQL) - 반환: (results, total)"""
+        results, total = self.store.search(query, limit, offset)
+        logger.info(f"과제 검색: '{query}' → {total}건 중 {len(results)}건 반환")
+        return results, total
+
+    @staticmethod
+    def _resolve_fields(fields, summary):
+        """반환 필드 검증"""
+        if not fields:
+            return SUMMARY_FIELDS if summary else TASK_FIELDS
+
+        invalid = [field for field in fields if field not in TASK_FIELDS]
+        if invalid:
+            raise ValueError(f"알 수 없는 필드: {', '.join(invalid)} (사용 가능: {', '.join(TASK_FIELDS)})")
+        fields = tuple(dict.fromkeys(fields))
+        if summary:
+            fields = tuple(field for field in fields if field != "sql")
+        return fields
+
+    @staticmethod
+    def encode_cursor(created_at, task_id):
+        """페이지 커서 인코딩"""
+        raw = json.dumps([created_at, task_id], ensure_ascii=False).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """페이지 커서 디코딩"""
         try:
-            # 1. 파일 삭제
-            os.remove(filepath)
-            logger.info(f"과제 파일 삭제: {filepath}")
+            padded = cursor + '=' * (-len(cursor) % 4)
+            created_at, task_id = json.loads(base64.urlsafe_b64decode(padded).decode('utf-8'))
+            return str(created_at), str(task_id)
+        except Exception:
+            raise ValueError("잘못된 페이지 커서입니다.")
+
+    def delete_task(self, task_id):
+        """과제 삭제"""
+        try:
+            # 1. 과제 삭제
+            if not self.store.delete(task_id):
+                return False
+            logger.info(f"과제 삭제: {task_id}")
 
             # 2. 임베딩 삭제
             self.embedding_service.delete_embedding(task_id)
 
+            # 3. SQL 식별자 / 유사 과제 색인 제거
+            self._update_indexes(task_id)
+
             logger.info(f"과제 삭제 완료: {task_id}")
             return True
 
         except Exception as e:
             logger.error(f"과제 삭제 오류: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    def _index_spec(self, name):
+        """색인 이름별 (빈 색인 생성 함수, SQL → 색인 항목 함수)"""
+        if name == "sql":
+            return BM25Index, extract_sql_identifiers
+        if name == "duplicate":
+            return (lambda: MinHashLSH(duplicate_config.num_perm, duplicate_config.bands),
+                    self.minhasher.signature)
+        raise KeyError(name)
+
+    def _update_indexes(self, task_id, sql=None):
+        """생성된 SQL 파생 색인 증분 갱신 (sql=None이면 제거)
+
+        색인 이후 이 워커의 변경 1건만 있었을 때만 바로 반영하고,
+        그 사이 다른 워커의 변경이 있었으면 다음 조회 시 변경 기록으로 함께 반영한다.
+        """
+        if not self._indexes:
+            return
+        generation = self.store.generation()
+        for name, index in list(self._indexes.items()):
+            if generation != self._index_generations[name] + 1:
+                continue
+            if sql is None:
+                index.remove(task_id)
+            else:
+                index.add(task_id, self._index_spec(name)[1](sql))
+            self._index_generations[name] = generation
+
+    def _get_index(self, name):
+        """SQL 파생 색인 반환
+
+        최초 호출 시 전체 과제로 생성하고, 이후 저장소 변경은 변경 기록의 과제만 다시 읽어 반영한다.
+        변경 기록이 모자라면(보관 세대 초과 등) 전체 과제로 재생성한다.
+        """
+        generation = self.store.generation()
+        index = self._indexes.get(name)
+        indexed = self._index_generations.get(name)
+        stale = index is None or indexed != generation
+        record_cache(f"{name}_index", not stale)
+        if stale and index is not None:
+            changes = self.store.changes_since(indexed, generation)
+            if changes is not None:
+                entry = self._index_spec(name)[1]
+                for task_id in changes:
+                    task = self.store.get(task_id)
+                    if task is None:
+                        index.remove(task_id)
+                    else:
+                        index.add(task_id, entry(task.get('sql', '')))
+                self._index_generations[name] = generation
+                logger.info(f"SQL 색인 증분 갱신 ({name}): {len(changes)}개 과제 (세대 {indexed} → {generation})")
+                return index
+        if stale:
+            create, entry = self._index_spec(name)
+            index = create()
+            for task in self.get_all_tasks():
+                index.add(task['task_id'], entry(task.get('sql', '')))
+            self._indexes[name] = index
+            self._index_generations[name] = generation
+            logger.info(f"SQL 색인 생성 ({name}): {len(index)}개 과제 (세대 {generation})")
+        return index
+
+    def warmup_indexes(self, *names):
+        """SQL 파생 색인 미리 생성"""
+        for name in names:
+            self._get_index(name)
+
+    def find_lexical_candidates(self, sql, limit=None):
+        """SQL 식별자(테이블, 컬럼, NE ID) BM25 상위 과제 [(task_id, score)]"""
+        terms = extract_sql_identifiers(sql)
+        if not terms:
+            return []
+        return self._get_index("sql").search(terms, limit)
+
+    def find_near_duplicates(self, sql, threshold=None, exclude=None):
+        """정규화 SQL이 거의 같은 과제 목록 (MinHash LSH, 임베딩 호출 없음)"""
+        threshold = duplicate_config.threshold if threshold is None else threshold
+        signature = self.minhasher.signature(sql)
+        matches = self._get_index("duplicate").query(signature, threshold, exclude)
+
+        duplicates = []
+        for task_id, similarity in matches:
+            task = self.get_task(task_id)
+            if task:
+                duplicates.append({
+                    "task_id": task_id,
+                    "title": task.get('title', ''),
+                    "author": task.get('author', ''),
+                    "created_at": task.get('created_at', ''),
+                    "similarity": round(similarity * 100, 1)
+                })
+        return duplicates
+
+    def find_task_duplicates(self, task_id, threshold=None):
+        """등록된 과제와 거의 같은 과제 목록 (과제가 없으면 None)"""
+        task = self.get_task(task_id)
+        if task is None:
+            return None
+        return self.find_near_duplicates(task.get('sql', ''), threshold, exclude=task_id)
@@ -0,0 +1,569 @@
+import os
+import re
+import json
+import sqlite3
+import logging
+import tempfile
+import threading
+from services.lexical_index import BM25Index, tokenize_text
+from services.file_utils import file_lock, atomic_write_json, read_counter, bump_counter
+
+logger = logging.getLogger(__name__)
+
+# 과제 필드 (목록 조회 시 SQL 본문 제외 가능)
+TASK_FIELDS = ("task_id", "title", "content", "sql", "author", "created_at", "updated_at")
+SUMMARY_FIELDS = tuple(field for field in TASK_FIELDS if field != "sql")
+# 검색 결과 필드 (본문 대신 snippet 반환)
+SEARCH_FIELDS = ("task_id", "title", "author", "created_at")
+# 변경 기록 보관 세대 수 (SQLite 트리거와 같은 값) - 이보다 오래된 색인은 증분 갱신 대신 재생성
+CHANGE_LOG_SIZE = 1000
+
+
+class DuplicateTaskError(ValueError):
+    """이미 존재하는 과제 ID로 저장 시도"""
+
+
+def _collect_changes(changes, generation, until):
+    """세대별 변경 과제 ID {세대: [task_id]} → generation 이후 until까지 변경된 과제 ID (빠진 세대가 있으면 None)"""
+    if len(changes) != until - generation:
+        return None
+    return list(dict.fromkeys(task_id for gen in sorted(changes) for task_id in changes[gen]))
+
+
+def _make_snippet(task, terms, width=60):
+    """검색어 주변 텍스트 발췌 (파일 저장소용)"""
+    for field in ("title", "content", "sql"):
+        text = task.get(field, '') or ''
+        lowered = text.lower()
+        for term in terms:
+            pos = lowered.find(term)
+            if pos >= 0:
+                start = max(0, pos - width // 2)
+                end = min(len(text), pos + len(term) + width // 2)
+                return ("…" if start > 0 else "") + text[start:end] + ("…" if end < len(text) else "")
+    return ""
+
+
+class FileTaskStore:
+    """과제별 JSON 파일 저장소 (기존 방식)
+
+    쓰기는 디렉터리 잠금 안에서 임시 파일 기록 후 rename으로 교체하고,
+    변경마다 세대 카운터(.generation)를 올려 다른 워커가 캐시를 무효화할 수 있게 한다.
+    세대별 변경 과제 ID는 .changes에 남겨 다른 워커가 색인을 재생성하지 않고 증분 갱신할 수 있게 한다.
+    """
+
+    def __init__(self, tasks_dir):
+        self.tasks_dir = tasks_dir
+        os.makedirs(self.tasks_dir, exist_ok=True)
+        self._lock_path = os.path.join(self.tasks_dir, ".tasks")
+        self._generation_path = os.path.join(self.tasks_dir, ".generation")
+        self._changes_path = os.path.join(self.tasks_dir, ".changes")
+        # 전문 검색용 프로세스 내 역색인 (첫 검색 시 생성, 저장/삭제 시 증분 갱신)
+        self._search_index = None
+        self._search_generation = None
+
+    def _path(self, task_id):
+        return os.path.join(self.tasks_dir, f"{task_id}.json")
+
+    def _task_files(self):
+        # JSON 파일만 (embeddings*.json, 임시 파일 제외)
+        for filename in os.listdir(self.tasks_dir):
+            if (filename.endswith('.json') and not filename.startswith('embeddings')
+                    and not filename.startswith('.')):
+                yield os.path.join(self.tasks_dir, filename)
+
+    def reset_connections(self):
+        """fork 이후 정리할 연결 없음 (SQLiteTaskStore와 같은 인터페이스)"""
+
+    def generation(self):
+        """저장소 변경 세대 (다른 워커 변경 감지용)"""
+        return read_counter(self._generation_path)
+
+    def version(self):
+        """(세대, 마지막 변경 시각 epoch초) - 조건부 조회(ETag/Last-Modified)용"""
+        try:
+            modified_at = int(os.stat(self._generation_path).st_mtime)
+        except FileNotFoundError:
+            modified_at = 0
+        return read_counter(self._generation_path), modified_at
+
+    def changes_since(self, generation, until):
+        """generation 이후 until 세대까지 변경(등록/삭제)된 과제 ID (기록이 없거나 모자라면 None)"""
+        if generation is None or until < generation:
+            return None
+        if until == generation:
+            return []
+        changes = {}
+        try:
+            with open(self._changes_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        gen, task_id = json.loads(line)
+                    except ValueError:
+                        continue
+                    if generation < gen <= until:
+                        changes.setdefault(gen, []).append(task_id)
+        except FileNotFoundError:
+            return None
+        return _collect_changes(changes, generation, until)
+
+    def _log_change(self, generation, task_id):
+        """변경 기록 추가 (file_lock 안에서 호출, CHANGE_LOG_SIZE 세대마다 오래된 기록 정리)"""
+        with open(self._changes_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps([generation, task_id], ensure_ascii=False) + "\n")
+        if generation % CHANGE_LOG_SIZE == 0:
+            lines = []
+            with open(self._changes_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        gen, _ = json.loads(line)
+                    except ValueError:
+                        continue
+                    if gen > generation - CHANGE_LOG_SIZE:
+                        lines.append(line)
+            directory = os.path.dirname(self._changes_path)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.writelines(lines)
+            os.replace(tmp_path, self._changes_path)
+
+    def exists(self, task_id):
+        """과제 존재 여부"""
+        return os.path.exists(self._path(task_id))
+
+    def get(self, task_id):
+        """과제 조회"""
+        filepath = self._path(task_id)
+        if not os.path.exists(filepath):
+            return None
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def list_tasks(self, include_sql=True):
+        """전체 과제 목록 (최신순)"""
+        tasks = []
+        for filepath in self._task_files():
+            with open(filepath, 'r', encoding='utf-8') as f:
+                task = json.load(f)
+            if not include_sql:
+                task.pop('sql', None)
+            tasks.append(task)
+
+        tasks.sort(key=lambda x: (x.get('created_at', ''), x.get('task_id', '')), reverse=True)
+        return tasks
+
+    def list_page(self, limit, after=None, fields=TASK_FIELDS):
+        """(created_at, task_id) 내림차순 키셋 페이지 조회
+
+        파일 저장소는 전체 파일을 읽어 정렬한 뒤 잘라낸다.
+        """
+        tasks = self.list_tasks(include_sql="sql" in fields)
+        if after is not None:
+            tasks = [task for task in tasks
+                     if (task.get('created_at', ''), task.get('task_id', '')) < tuple(after)]
+        return [{field: task.get(field, '') for field in fields} for task in tasks[:limit]]
+
+    def count(self):
+        """과제 수"""
+        return sum(1 for _ in self._task_files())
+
+    def insert(self, task):
+        """과제 저장 (중복 ID는 DuplicateTaskError)"""
+        with file_lock(self._lock_path):
+            filepath = self._path(task['task_id'])
+            if os.path.exists(filepath):
+                raise DuplicateTaskError(f"이미 존재하는 과제 ID입니다: {task['task_id']}")
+            atomic_write_json(filepath, task, ensure_ascii=False, indent=2)
+            generation = bump_counter(self._generation_path)
+            self._log_change(generation, task['task_id'])
+        self._apply_search_change(generation, task['task_id'], task)
+
+    def delete(self, task_id):
+        """과제 삭제 (삭제 여부 반환)"""
+        with file_lock(self._lock_path):
+            filepath = self._path(task_id)
+            if not os.path.exists(filepath):
+                return False
+            os.remove(filepath)
+            generation = bump_counter(self._generation_path)
+            self._log_change(generation, task_id)
+        self._apply_search_change(generation, task_id)
+        return True
+
+    def _apply_search_change(self, generation, task_id, task=None):
+        """자기 변경만 있었으면 검색 색인 증분 갱신 (다른 워커 변경이 끼었으면 다음 검색 시 변경 기록으로 반영)"""
+        if self._search_index is None:
+            return
+        if self._search_generation != generation - 1:
+            return
+        if task is None:
+            self._search_index.remove(task_id)
+        else:
+            self._search_index.add(task_id, self._search_terms(task))
+        self._search_generation = generation
+
+    @staticmethod
+    def _search_terms(task):
+        # 제목/내용 가중치를 위해 반복 색인 (title x3, content x2, sql x1)
+        return (tokenize_text(task.get('title', '')) * 3
+                + tokenize_text(task.get('content', '')) * 2
+                + tokenize_text(task.get('sql', '')))
+
+    def search(self, query, limit, offset=0):
+        """전문 검색 (BM25 순위) - 반환: (results, total)"""
+        generation = self.generation()
+        if self._search_index is not None and self._search_generation != generation:
+            # 다른 워커의 변경은 변경 기록으로 증분 반영
+            changes = self.changes_since(self._search_generation, generation)
+            if changes is None:
+                self._search_index = None
+            else:
+                for task_id in changes:
+                    task = self.get(task_id)
+                    if task is None:
+                        self._search_index.remove(task_id)
+                    else:
+                        self._search_index.add(task_id, self._search_terms(task))
+                self._search_generation = generation
+        if self._search_index is None:
+            index = BM25Index()
+            for task in self.list_tasks():
+                index.add(task['task_id'], self._search_terms(task))
+            self._search_index = index
+            self._search_generation = generation
+
+        terms = tokenize_text(query)
+        if not terms:
+            return [], 0
+
+        # 모든 검색어를 포함한 과제만 (AND 검색)
+        ranked = [(task_id, score) for task_id, score in self._search_index.search(terms)
+                  if all(term in self._search_index.doc_terms[task_id] for term in terms)]
+
+        results = []
+        for task_id, score in ranked[offset:offset + limit]:
+            task = self.get(task_id)
+            if task:
+                results.append({
+                    **{field: task.get(field, '') for field in SEARCH_FIELDS},
+                    "snippet": _make_snippet(task, terms),
+                    "score": round(score, 6)
+                })
+        return results, len(ranked)
+
+
+class SQLiteTaskStore:
+    """SQLite(WAL 모드) 과제 저장소
+
+    task_id 고유 인덱스와 (created_at, task_id) 인덱스로 목록/단건/중복 조회를 인덱스 조회로 처리하고,
+    목록 조회 시에는 SQL 본문 컬럼을 읽지 않는다.
+    여러 워커 프로세스가 같은 파일을 공유하며, 변경 시 트리거가 store_meta의 세대 값을 올리고
+    세대별 변경 과제 ID를 task_changes에 남긴다 (최근 CHANGE_LOG_SIZE 세대).
+    """
+
+    # 변경 기록 도입 이전 트리거 (세대만 올림) - 세대 증가와 변경 기록을 한 트리거로 합쳐 교체
+    MIGRATIONS = """
+        DROP TRIGGER IF EXISTS tasks_generation_insert;
+        DROP TRIGGER IF EXISTS tasks_generation_delete;
+        DROP TRIGGER IF EXISTS tasks_generation_update;
+    """
+
+    # id는 rowid 별칭 (전문 검색 색인 content_rowid) - 명시 컬럼이라 VACUUM 후에도 번호가 유지된다
+    TASKS_TABLE = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id         INTEGER PRIMARY KEY,
+            task_id    TEXT NOT NULL UNIQUE,
+            title      TEXT NOT NULL,
+            content    TEXT NOT NULL DEFAULT '',
+            sql        TEXT NOT NULL DEFAULT '',
+            author     TEXT NOT NULL DEFAULT '',
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+    """
+
+    # id 컬럼 도입 이전 tasks 테이블(task_id TEXT 기본키, 암묵적 rowid) 재생성
+    # 기존 rowid를 id로 옮기고, content_rowid는 바꿀 수 없으므로 전문 검색 색인은 삭제 후 다시 만든다.
+    REBUILD_TASKS = f"""
+        DROP TRIGGER IF EXISTS tasks_fts_insert;
+        DROP TRIGGER IF EXISTS tasks_fts_delete;
+        DROP TRIGGER IF EXISTS tasks_fts_update;
+        DROP TABLE IF EXISTS tasks_fts;
+        ALTER TABLE tasks RENAME TO tasks_legacy;
+        {TASKS_TABLE}
+        INSERT INTO tasks (id, {', '.join(TASK_FIELDS)})
+        SELECT rowid, {', '.join(TASK_FIELDS)} FROM tasks_legacy;
+        DROP TABLE tasks_legacy;
+    """
+
+    SCHEMA = TASKS_TABLE + """
+        CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks (created_at DESC, task_id DESC);
+
+        -- 전문 검색 색인 (tasks 테이블을 content로 사용, 트리거로 증분 갱신)
+        CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+            title, content, sql,
+            content='tasks', content_rowid='id',
+            tokenize="unicode61 tokenchars '_'"
+        );
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts (rowid, title, content, sql)
+            VALUES (new.id, new.title, new.content, new.sql);
+        END;
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, content, sql)
+            VALUES ('delete', old.id, old.title, old.content, old.sql);
+        END;
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, content, sql)
+            VALUES ('delete', old.id, old.title, old.content, old.sql);
+            INSERT INTO tasks_fts (rowid, title, content, sql)
+            VALUES (new.id, new.title, new.content, new.sql);
+        END;
+
+        -- 변경 세대 카운터 (워커 간 캐시 무효화용)
+        CREATE TABLE IF NOT EXISTS store_meta (
+            key   TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO store_meta (key, value) VALUES ('generation', 0);
+
+        -- 세대별 변경 과제 ID (프로세스 내 색인 증분 갱신용, 최근 1000세대만 보관)
+        CREATE TABLE IF NOT EXISTS task_changes (
+            generation INTEGER NOT NULL,
+            task_id    TEXT NOT NULL,
+            PRIMARY KEY (generation, task_id)
+        ) WITHOUT ROWID;
+        CREATE TRIGGER IF NOT EXISTS tasks_change_insert AFTER INSERT ON tasks BEGIN
+            UPDATE store_meta SET value = value + 1 WHERE key = 'generation';
+            INSERT INTO task_changes (generation, task_id)
+            SELECT value, new.task_id FROM store_meta WHERE key = 'generation';
+            DELETE FROM task_changes
+            WHERE generation <= (SELECT value FROM store_meta WHERE key = 'generation') - 1000;
+        END;
+        CREATE TRIGGER IF NOT EXISTS tasks_change_delete AFTER DELETE ON tasks BEGIN
+            UPDATE store_meta SET value = value + 1 WHERE key = 'generation';
+            INSERT INTO task_changes (generation, task_id)
+            SELECT value, old.task_id FROM store_meta WHERE key = 'generation';
+            DELETE FROM task_changes
+            WHERE generation <= (SELECT value FROM store_meta WHERE key = 'generation') - 1000;
+        END;
+        CREATE TRIGGER IF NOT EXISTS tasks_change_update AFTER UPDATE ON tasks BEGIN
+            UPDATE store_meta SET value = value + 1 WHERE key = 'generation';
+            INSERT OR IGNORE INTO task_changes (generation, task_id)
+            SELECT value, old.task_id FROM store_meta WHERE key = 'generation'
+            UNION SELECT value, new.task_id FROM store_meta WHERE key = 'generation';
+            DELETE FROM task_changes
+            WHERE generation <= (SELECT value FROM store_meta WHERE key = 'generation') - 1000;
+        END;
+
+        -- 마지막 변경 시각 (epoch초, 조건부 조회 Last-Modified용)
+        CREATE TRIGGER IF NOT EXISTS tasks_modified_insert AFTER INSERT ON tasks BEGIN
+            INSERT OR REPLACE INTO store_meta (key, value) VALUES ('modified_at', CAST(strftime('%s', 'now') AS INTEGER));
+        END;
+        CREATE TRIGGER IF NOT EXISTS tasks_modified_delete AFTER DELETE ON tasks BEGIN
+            INSERT OR REPLACE INTO store_meta (key, value) VALUES ('modified_at', CAST(strftime('%s', 'now') AS INTEGER));
+        END;
+        CREATE TRIGGER IF NOT EXISTS tasks_modified_update AFTER UPDATE ON tasks BEGIN
+            INSERT OR REPLACE INTO store_meta (key, value) VALUES ('modified_at', CAST(strftime('%s', 'now') AS INTEGER));
+        END;
+    """
+
+    # bm25() 컬럼 가중치 (title, content, sql)
+    SEARCH_WEIGHTS = (5.0, 2.0, 1.0)
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._local = threading.local()
+
+        conn = self._conn()
+        # 여러 워커가 동시에 시작해도 스키마 확인/변경은 한 번에 하나씩
+        with file_lock(db_path):
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(tasks)")}
+            rebuild = bool(columns) and "id" not in columns
+            fts_exists = not rebuild and conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'"
+            ).fetchone() is not None
+            if rebuild:
+                logger.info("과제 테이블 재생성: id 정수 기본키 추가, 전문 검색 색인 재생성")
+            # 다른 워커가 트리거 교체 중간 상태에서 쓰지 않도록 한 트랜잭션으로 적용
+            conn.executescript("BEGIN IMMEDIATE;" + (self.REBUILD_TASKS if rebuild else "")
+                               + self.MIGRATIONS + self.SCHEMA + "COMMIT;")
+            # 전문 검색 색인 도입 이전에 생성된 DB 또는 테이블을 재생성한 DB는 기존 과제로 색인 재생성
+            if not fts_exists and self.count() > 0:
+                self.rebuild_search_index()
+
+    def reset_connections(self):
+        """fork 이후 상속된 스레드별 연결 폐기 (부모 프로세스 연결은 닫지 않음)"""
+        self._local = threading.local()
+
+    def _conn(self):
+        """스레드별 연결 반환"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def exists(self, task_id):
+        """과제 존재 여부"""
+        row = self._conn().execute("SELECT 1 FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return row is not None
+
+    def get(self, task_id):
+        """과제 조회"""
+        row = self._conn().execute(
+            f"SELECT {', '.join(TASK_FIELDS)} FROM tasks WHERE task_id = ?", (task_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def list_tasks(self, include_sql=True):
+        """전체 과제 목록 (최신순)"""
+        fields = TASK_FIELDS if include_sql else SUMMARY_FIELDS
+        rows = self._conn().execute(
+            f"SELECT {', '.join(fields)} FROM tasks ORDER BY created_at DESC, task_id DESC"
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def list_page(self, limit, after=None, fields=TASK_FIELDS):
+        """(created_at, task_id) 내림차순 키셋 페이지 조회 (요청 필드만 읽음)"""
+        columns = ', '.join(fields)
+        if after is None:
+            rows = self._conn().execute(
+                f"SELECT {columns} FROM tasks ORDER BY created_at DESC, task_id DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        else:
+            rows = self._conn().execute(
+                f"SELECT {columns} FROM tasks WHERE (created_at, task_id) < (?, ?) "
+                f"ORDER BY created_at DESC, task_id DESC LIMIT ?",
+                (after[0], after[1], limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self):
+        """과제 수"""
+        return self._conn().execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def generation(self):
+        """저장소 변경 세대 (다른 워커 변경 감지용)"""
+        row = self._conn().execute("SELECT value FROM store_meta WHERE key = 'generation'").fetchone()
+        return row[0] if row else 0
+
+    def changes_since(self, generation, until):
+        """generation 이후 until 세대까지 변경(등록/삭제)된 과제 ID (기록이 모자라면 None)"""
+        if generation is None or until < generation:
+            return None
+        rows = self._conn().execute(
+            "SELECT generation, task_id FROM task_changes WHERE generation > ? AND generation <= ?",
+            (generation, until)
+        ).fetchall()
+        changes = {}
+        for gen, task_id in rows:
+            changes.setdefault(gen, []).append(task_id)
+        return _collect_changes(changes, generation, until)
+
+    def version(self):
+        """(세대, 마지막 변경 시각 epoch초) - 조건부 조회(ETag/Last-Modified)용"""
+        meta = dict(self._conn().execute(
+            "SELECT key, value FROM store_meta WHERE key IN ('generation', 'modified_at')"
+        ).fetchall())
+        return meta.get('generation', 0), meta.get('modified_at', 0)
+
+    def insert(self, task):
+        """과제 저장 (중복 ID는 DuplicateTaskError)"""
+        conn = self._conn()
+        try:
+            with conn:
+                conn.execute(
+                    f"INSERT INTO tasks ({', '.join(TASK_FIELDS)}) VALUES ({', '.join('?' for _ in TASK_FIELDS)})",
+                    tuple(task.get(field, '') for field in TASK_FIELDS)
+                )
+        except sqlite3.IntegrityError:
+            raise DuplicateTaskError(f"이미 존재하는 과제 ID입니다: {task['task_id']}")
+
+    def delete(self, task_id):
+        """과제 삭제 (삭제 여부 반환)"""
+        conn = self._conn()
+        with conn:
+            cursor = conn.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+        return cursor.rowcount > 0
+
+    def search(self, query, limit, offset=0):
+        """전문 검색 (FTS5 bm25 순위) - 반환: (results, total)"""
+        match = self._match_expression(query)
+        if not match:
+            return [], 0
+
+        conn = self._conn()
+        total = conn.execute("SELECT COUNT(*) FROM tasks_fts WHERE tasks_fts MATCH ?", (match,)).fetchone()[0]
+        rows = conn.execute(
+            f"""
+            SELECT {', '.join(f't.{field}' for field in SEARCH_FIELDS)},
+                   snippet(tasks_fts, -1, '[', ']', '…', 16) AS snippet,
+                   bm25(tasks_fts, {', '.join(str(w) for w in self.SEARCH_WEIGHTS)}) AS rank
+            FROM tasks_fts
+            JOIN tasks t ON t.id = tasks_fts.rowid
+            WHERE tasks_fts MATCH ?
+            ORDER BY rank
+            LIMIT ? OFFSET ?
+            """,
+            (match, limit, offset)
+        ).fetchall()
+
+        results = []
+        for row in rows:
+            result = dict(row)
+            # bm25()는 낮을수록 관련도가 높으므로 부호 반전
+            result["score"] = round(-result.pop("rank"), 6)
+            results.append(result)
+        return results, total
+
+    @staticmethod
+    def _match_expression(query):
+        """사용자 검색어를 FTS5 MATCH 식으로 변환 (단어별 접두어 AND 검색)"""
+        terms = re.findall(r"\w+", query or "")
+        return " ".join(f'"{term}"*' for term in terms)
+
+    def rebuild_search_index(self):
+        """전문 검색 색인 재생성"""
+        conn = self._conn()
+        with conn:
+            conn.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+        logger.info("과제 전문 검색 색인 재생성 완료")
+
+    def import_from_directory(self, tasks_dir):
+        """과제 JSON 파일을 가져오기 (이미 있는 과제는 건너뜀)"""
+        if not os.path.isdir(tasks_dir):
+            return 0
+
+        tasks = FileTaskStore(tasks_dir).list_tasks()
+        conn = self._conn()
+        with conn:
+            # rowcount는 tasks 행만 센다 (total_changes는 검색 색인/세대/변경 기록 트리거 쓰기까지 포함)
+            cursor = conn.executemany(
+                f"INSERT OR IGNORE INTO tasks ({', '.join(TASK_FIELDS)}) VALUES ({', '.join('?' for _ in TASK_FIELDS)})",
+                [tuple(task.get(field, '') for field in TASK_FIELDS) for task in tasks]
+            )
+            imported = max(cursor.rowcount, 0)
+
+        logger.info(f"과제 JSON 파일 가져오기 완료: {imported}개 / {len(tasks)}개 ({tasks_dir})")
+        return imported
+
+
+def create_task_store(config):
+    """설정에 따른 과제 저장소 생성"""
+    if config.backend == "file":
+        return FileTaskStore(config.tasks_dir)
+
+    if config.backend == "sqlite":
+        store = SQLiteTaskStore(config.db_path)
+        # 최초 실행 시 기존 JSON 파일 자동 마이그레이션
+        if store.count() == 0:
+            store.import_from_directory(config.tasks_dir)
+        return store
+
+    raise ValueError(f"알 수 없는 과제 저장소: {config.backend} (file, sqlite 중 선택)")
@@ -0,0 +1,217 @@
+import re
+import json
+import time
+import random
+import logging
+import functools
+import contextvars
+from contextlib import contextmanager
+from flask import request, g
+from config import tracing_config
+
+logger = logging.getLogger(__name__)
+
+# 현재 요청의 열린 구간 (요청 밖이나 백그라운드 스레드에서는 None → 기록하지 않음)
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+# Server-Timing 메트릭 이름에 허용되는 문자 외에는 '_'로 치환
+_TOKEN_RE = re.compile(r"[^A-Za-z0-9_.\-]")
+
+
+class Span:
+    """처리 구간 (시작/종료 시각, 속성, 하위 구간)"""
+
+    __slots__ = ("name", "attrs", "started", "ended", "children", "trace")
+
+    def __init__(self, name, trace, attrs=None):
+        self.name = name
+        self.trace = trace
+        self.attrs = attrs or {}
+        self.started = time.perf_counter()
+        self.ended = None
+        self.children = []
+
+    def set(self, **attrs):
+        """구간 속성 추가 (행 수, 상태 코드 등)"""
+        self.attrs.update(attrs)
+
+    def finish(self):
+        if self.ended is None:
+            self.ended = time.perf_counter()
+
+    @property
+    def duration_ms(self):
+        end = self.ended if self.ended is not None else time.perf_counter()
+        return (end - self.started) * 1000
+
+    def to_dict(self):
+        data = {"name": self.name, "start_ms": round((self.started - self.trace.root.started) * 1000, 2),
+                "duration_ms": round(self.duration_ms, 2)}
+        if self.attrs:
+            data["attrs"] = self.attrs
+        if self.children:
+            data["children"] = [child.to_dict() for child in self.children]
+        return data
+
+
+class _NullSpan:
+    """추적 중이 아닐 때 반환되는 빈 구간"""
+
+    def set(self, **attrs):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Trace:
+    """요청 하나의 구간 트리"""
+
+    def __init__(self, name, max_spans=None):
+        self.root = Span(name, self)
+        self.max_spans = max_spans or tracing_config.max_spans
+        self.span_count = 1
+        self.dropped = 0
+
+    def walk(self):
+        """루트를 제외한 모든 구간 (깊이 우선)"""
+        stack = list(reversed(self.root.children))
+        while stack:
+            span = stack.pop()
+            yield span
+            stack.extend(reversed(span.children))
+
+    def server_timing(self):
+        """Server-Timing 헤더 값 (같은 이름의 구간은 합산, 설명에 횟수)"""
+        totals = {}
+        for span in self.walk():
+            total, count = totals.get(span.name, (0.0, 0))
+            totals[span.name] = (total + span.duration_ms, count + 1)
+
+        entries = [f"total;dur={self.root.duration_ms:.1f}"]
+        for name, (total, count) in totals.items():
+            entry = f"{_TOKEN_RE.sub('_', name)};dur={total:.1f}"
+            if count > 1:
+                entry += f';desc="x{count}"'
+            entries.append(entry)
+        return ", ".join(entries)
+
+    def render(self):
+        """로그용 들여쓰기 트리"""
+        lines = []
+
+        def add(span, depth):
+            attrs = " ".join(f"{key}={value}" for key, value in span.attrs.items())
+            lines.append(f"{'  ' * depth}{span.name} {span.duration_ms:.1f}ms {attrs}".rstrip())
+            for child in span.children:
+                add(child, depth + 1)
+
+        add(self.root, 0)
+        if self.dropped:
+            lines.append(f"(구간 {self.dropped}개 생략)")
+        return "\n".join(lines)
+
+    def to_dict(self):
+        data = self.root.to_dict()
+        if self.dropped:
+            data["dropped"] = self.dropped
+        return data
+
+
+@contextmanager
+def span(name, **attrs):
+    """처리 구간 기록 (추적 중인 요청 안에서만 기록, 그 외에는 빈 구간)
+
+        with span("db.query", table=table_name) as s:
+            rows = ...
+            s.set(rows=len(rows))
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield _NULL_SPAN
+        return
+
+    trace = parent.trace
+    if trace.span_count >= trace.max_spans:
+        trace.dropped += 1
+        yield _NULL_SPAN
+        return
+
+    current = Span(name, trace, attrs)
+    trace.span_count += 1
+    parent.children.append(current)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except Exception as e:
+        current.set(error=type(e).__name__)
+        raise
+    finally:
+        current.finish()
+        _current_span.reset(token)
+
+
+def traced(name=None):
+    """함수 실행을 구간으로 기록하는 데코레이터 (이름 생략 시 함수 이름)"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_trace():
+    """현재 요청의 추적 (없으면 None)"""
+    current = _current_span.get()
+    return current.trace if current is not None else None
+
+
+def _debug_requested():
+    return request.args.get("trace") == "1" or request.headers.get("X-Debug-Trace") == "1"
+
+
+def init_tracing(app, config=None):
+    """요청별 추적 시작/종료 훅 등록
+
+    응답에 Server-Timing 헤더를 붙이고, 허용된 경우 JSON 응답에 구간 트리를 추가하며,
+    느린 요청은 구간 트리를 로그로 남긴다.
+    """
+    config = config or tracing_config
+    if not config.enabled:
+        return
+
+    @app.before_request
+    def start_trace():
+        trace = Trace(f"{request.method} {request.path}", config.max_spans)
+        g.trace = trace
+        g.trace_token = _current_span.set(trace.root)
+
+    @app.after_request
+    def finish_trace(response):
+        trace = g.pop("trace", None)
+        token = g.pop("trace_token", None)
+        if trace is None:
+            return response
+        trace.root.finish()
+        if token is not None:
+            _current_span.reset(token)
+
+        trace.root.set(status=response.status_code)
+        if config.server_timing:
+            response.headers["Server-Timing"] = trace.server_timing()
+            # 프론트엔드(다른 origin)에서도 개발자 도구에 표시되도록
+            response.headers["Timing-Allow-Origin"] = "*"
+
+        if config.debug_response and response.is_json and _debug_requested():
+            data = response.get_json(silent=True)
+            if isinstance(data, dict):
+                data["trace"] = trace.to_dict()
+                response.set_data(json.dumps(data, ensure_ascii=False, default=str))
+
+        if trace.root.duration_ms >= config.slow_ms and random.random() < config.slow_sample_rate:
+            logger.warning(f"🐢 느린 요청 ({trace.root.duration_ms:.0f}ms)\n{trace.render()}")
+        return response
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# backend/ 디렉터리 기준 import (python -m pytest를 어디서 실행해도 services, config를 찾도록)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
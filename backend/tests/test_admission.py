@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+from services.admission import ConcurrencyLimiter, Saturated
+
+
+def _wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "시간 초과"
+        time.sleep(0.005)
+
+
+def test_unlimited():
+    limiter = ConcurrencyLimiter("test", 0)
+    with limiter.acquire(), limiter.acquire():
+        assert limiter.in_flight == 2
+    assert limiter.in_flight == 0
+
+
+def test_queue_full_rejects_immediately():
+    limiter = ConcurrencyLimiter("test", 1, queue_size=0, queue_timeout=5, retry_after=3)
+    with limiter.acquire():
+        with pytest.raises(Saturated) as error:
+            with limiter.acquire():
+                pass
+    assert error.value.reason == "queue_full"
+    assert error.value.retry_after == 3
+
+
+def test_queue_timeout():
+    limiter = ConcurrencyLimiter("test", 1, queue_size=1, queue_timeout=0.05)
+    with limiter.acquire():
+        with pytest.raises(Saturated) as error:
+            with limiter.acquire():
+                pass
+    assert error.value.reason == "timeout"
+    assert limiter.waiting == 0
+    assert limiter.in_flight == 0
+
+
+def test_released_slot_goes_to_queue_in_order():
+    """반납된 슬롯은 먼저 기다린 요청부터 넘겨받는다"""
+    limiter = ConcurrencyLimiter("test", 1, queue_size=10, queue_timeout=5)
+    order = []
+
+    def worker(name):
+        with limiter.acquire():
+            order.append(name)
+
+    threads = []
+    with limiter.acquire():
+        for i in range(3):
+            thread = threading.Thread(target=worker, args=(i,))
+            thread.start()
+            threads.append(thread)
+            _wait_until(lambda: limiter.waiting == i + 1)
+    for thread in threads:
+        thread.join(2)
+
+    assert order == [0, 1, 2]
+    assert limiter.in_flight == 0
+    assert limiter.waiting == 0
+
+
+def test_new_caller_does_not_take_handed_off_slot():
+    """슬롯은 반납 즉시 대기 요청 몫이 되어, 대기 요청이 깨어나기 전에 온 새 요청이 가져가지 못한다"""
+    limiter = ConcurrencyLimiter("test", 1, queue_size=10, queue_timeout=5)
+    admitted = threading.Event()
+    proceed = threading.Event()
+
+    def waiter():
+        with limiter.acquire():
+            admitted.set()
+            proceed.wait(2)
+
+    thread = threading.Thread(target=waiter)
+    with limiter.acquire():
+        thread.start()
+        _wait_until(lambda: limiter.waiting == 1)
+
+    assert limiter.in_flight == 1
+    assert limiter.waiting == 0
+    limiter.queue_timeout = 0.01
+    with pytest.raises(Saturated):
+        with limiter.acquire():
+            pass
+    proceed.set()
+    thread.join(2)
+    assert admitted.is_set()
+    assert limiter.in_flight == 0
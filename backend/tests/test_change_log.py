@@ -0,0 +1,78 @@
+import pytest
+
+from services import task_store
+from services.task_store import FileTaskStore, SQLiteTaskStore
+
+
+def _task(task_id, title="과제"):
+    return {
+        "task_id": task_id, "title": title, "content": "", "sql": "SELECT 1",
+        "author": "tester", "created_at": "2026-01-01T00:00:00", "updated_at": "2026-01-01T00:00:00",
+    }
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def make_store(request, tmp_path):
+    """같은 저장 위치를 여는 저장소 생성 함수 (워커 프로세스 여러 개를 흉내)"""
+    if request.param == "file":
+        return lambda: FileTaskStore(str(tmp_path / "tasks"))
+    return lambda: SQLiteTaskStore(str(tmp_path / "tasks.db"))
+
+
+def test_changes_since_lists_changed_tasks(make_store):
+    store = make_store()
+    start = store.generation()
+    store.insert(_task("DR-2026-00001"))
+    store.insert(_task("DR-2026-00002"))
+    store.delete("DR-2026-00001")
+    end = store.generation()
+
+    assert end == start + 3
+    assert store.changes_since(start, end) == ["DR-2026-00001", "DR-2026-00002"]
+    assert store.changes_since(start + 2, end) == ["DR-2026-00001"]
+    assert store.changes_since(end, end) == []
+
+
+def test_changes_since_invalid_range(make_store):
+    store = make_store()
+    store.insert(_task("DR-2026-00001"))
+    assert store.changes_since(None, store.generation()) is None
+    assert store.changes_since(store.generation(), 0) is None
+
+
+def test_search_catches_up_with_other_worker(make_store):
+    """다른 워커의 등록/삭제가 검색 결과에 반영된다"""
+    worker_a, worker_b = make_store(), make_store()
+    worker_a.insert(_task("DR-2026-00001", title="과금 정보"))
+    assert worker_a.search("과금", limit=10)[1] == 1
+
+    worker_b.insert(_task("DR-2026-00002", title="과금 서버"))
+    worker_b.delete("DR-2026-00001")
+
+    results, total = worker_a.search("과금", limit=10)
+    assert total == 1
+    assert results[0]["task_id"] == "DR-2026-00002"
+
+
+def test_file_log_trimmed_returns_none(tmp_path, monkeypatch):
+    """보관 세대를 넘은 오래된 세대는 None (전체 재생성 필요)"""
+    monkeypatch.setattr(task_store, "CHANGE_LOG_SIZE", 3)
+    store = FileTaskStore(str(tmp_path))
+    for i in range(6):
+        store.insert(_task(f"DR-2026-0000{i}"))
+    end = store.generation()
+
+    assert store.changes_since(0, end) is None
+    assert store.changes_since(end - 2, end) == ["DR-2026-00004", "DR-2026-00005"]
+
+
+def test_sqlite_missing_generation_returns_none(tmp_path):
+    store = SQLiteTaskStore(str(tmp_path / "tasks.db"))
+    for i in range(3):
+        store.insert(_task(f"DR-2026-0000{i}"))
+    conn = store._conn()
+    with conn:
+        conn.execute("DELETE FROM task_changes WHERE generation = 2")
+
+    assert store.changes_since(0, 3) is None
+    assert store.changes_since(2, 3) == ["DR-2026-00002"]
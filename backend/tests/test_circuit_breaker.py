@@ -0,0 +1,89 @@
+import pytest
+
+from services.circuit_breaker import CircuitBreaker, CircuitOpen, CLOSED, HALF_OPEN, OPEN
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("test", window=4, min_calls=4, failure_rate=0.5, slow_call=2.0, open_seconds=10, clock=clock)
+
+
+def _trip(breaker):
+    for success in (True, True, False, False):
+        breaker.allow()
+        breaker.record(success)
+
+
+def test_opens_at_failure_rate(breaker):
+    for success in (True, True, False):
+        breaker.record(success)
+    assert breaker.state == CLOSED
+
+    breaker.record(False)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpen) as error:
+        breaker.allow()
+    assert error.value.retry_after == 10
+
+
+def test_slow_success_counts_as_failure(breaker):
+    for _ in range(4):
+        breaker.record(True, duration=2.5)
+    assert breaker.state == OPEN
+
+
+def test_per_call_slow_threshold(breaker):
+    """호출별 slow_call 기준을 주면 기본 기준 대신 사용"""
+    for _ in range(4):
+        breaker.record(True, duration=2.5, slow_call=5.0)
+    assert breaker.state == CLOSED
+
+
+def test_half_open_allows_single_trial(breaker, clock):
+    _trip(breaker)
+    clock.now += 10
+
+    breaker.allow()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.allow()
+
+    breaker.record(True)
+    assert breaker.state == CLOSED
+    breaker.allow()
+
+
+def test_failed_trial_reopens(breaker, clock):
+    _trip(breaker)
+    clock.now += 10
+    breaker.allow()
+    breaker.record(False)
+
+    assert breaker.state == OPEN
+    clock.now += 5
+    with pytest.raises(CircuitOpen) as error:
+        breaker.allow()
+    assert error.value.retry_after == 5
+
+
+def test_cancel_returns_trial(breaker, clock):
+    _trip(breaker)
+    clock.now += 10
+    breaker.allow()
+    breaker.cancel()
+
+    breaker.allow()
+    assert breaker.state == HALF_OPEN
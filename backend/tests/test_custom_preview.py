@@ -0,0 +1,92 @@
+import sqlite3
+
+import pytest
+
+from services.db_service import DatabaseService
+from services.row_transformer import where_condition
+from services.sql_service import SQLService
+
+COLUMNS = [("ne_id", "varchar"), ("seq", "numeric"), ("whereabouts", "varchar")]
+
+
+@pytest.fixture
+def database(monkeypatch):
+    """sch.tbl 테이블을 가진 SQLite DB로 DatabaseService 조회를 대신한다 (실행한 쿼리/추정 조건 기록)"""
+    conn = sqlite3.connect(":memory:")
+    conn.execute("ATTACH DATABASE ':memory:' AS sch")
+    conn.execute("CREATE TABLE sch.tbl (ne_id TEXT, seq INTEGER, whereabouts TEXT, PRIMARY KEY (ne_id, seq))")
+    conn.executemany("INSERT INTO sch.tbl VALUES (?, ?, ?)",
+                     [("NE1", seq, "서울" if seq % 2 else "부산") for seq in range(1, 8)])
+    calls = {"queries": [], "estimates": []}
+
+    def execute_query(query, params=None):
+        calls["queries"].append(query)
+        cursor = conn.execute(query)
+        return cursor.fetchall(), [column[0] for column in cursor.description]
+
+    def estimate_row_count(schema, table_name, condition=""):
+        calls["estimates"].append(condition)
+        return {"estimated_total": None, "estimate_source": None}
+
+    monkeypatch.setattr(DatabaseService, "get_primary_key", staticmethod(lambda schema, table: ["ne_id", "seq"]))
+    monkeypatch.setattr(DatabaseService, "execute_query", staticmethod(execute_query))
+    monkeypatch.setattr(DatabaseService, "estimate_row_count", staticmethod(estimate_row_count))
+    return calls
+
+
+def _pages(form, limit):
+    pages, after = [], None
+    while True:
+        _, rows, _, page = SQLService.preview_custom_rows("sch", "tbl", COLUMNS, form, "python", limit, after)
+        pages.append([row[0] for row in rows])
+        after = page["next_after"]
+        if not page["has_more"]:
+            assert after is None
+            return pages
+
+
+def test_pages_follow_primary_key(database):
+    """next_after로 이어 조회하면 빠짐/중복 없이 기본키 순서로 모든 행을 읽는다"""
+    pages = _pages({}, limit=3)
+    assert [len(page) for page in pages] == [3, 3, 1]
+    statements = [statement for page in pages for statement in page]
+    assert statements[0] == "INSERT INTO sch.tbl VALUES('NE1',1,'서울');"
+    assert statements[-1] == "INSERT INTO sch.tbl VALUES('NE1',7,'서울');"
+    assert all("OFFSET" not in query for query in database["queries"])
+
+
+def test_where_clause_keeps_column_named_where(database):
+    """WHERE로 시작하는 컬럼명(whereabouts)은 키워드로 잘리지 않고, 건수 추정도 같은 조건을 쓴다"""
+    pages = _pages({"where_clause": "whereabouts = '부산';"}, limit=2)
+    assert [len(page) for page in pages] == [2, 1]
+    assert set(database["estimates"]) == {"whereabouts = '부산'"}
+    assert "WHERE (whereabouts = '부산')" in database["queries"][0]
+
+
+@pytest.mark.parametrize("values", [["NE1", "3"], ["가'나", ""], ["a,b", "=="]])
+def test_cursor_round_trip(values):
+    cursor = SQLService._encode_cursor(values)
+    assert "=" not in cursor
+    assert SQLService._decode_cursor(cursor, ["ne_id", "seq"]) == values
+
+
+@pytest.mark.parametrize("cursor", ["!!!", SQLService._encode_cursor(["NE1"]), "e30"])
+def test_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        SQLService._decode_cursor(cursor, ["ne_id", "seq"])
+
+
+@pytest.mark.parametrize("clause, expected", [
+    ("whereabouts = 'x'", "whereabouts = 'x'"),
+    ("  WHERE ne_id = 'NE1';", "ne_id = 'NE1'"),
+    ("where\n(a = 1)", "(a = 1)"),
+    ("", ""),
+    (None, ""),
+])
+def test_where_condition(clause, expected):
+    assert where_condition(clause) == expected
+
+
+def test_generate_custom_sql_where():
+    sql = SQLService.generate_custom_sql("sch", "tbl", [("seq", "numeric")], {"where_clause": "whereabouts = 'x'"})
+    assert sql.endswith("FROM sch.tbl\nWHERE whereabouts = 'x';")
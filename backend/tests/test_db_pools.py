@@ -0,0 +1,71 @@
+import pytest
+
+from services import db_service
+from services.db_service import DatabaseService
+
+
+class FakeConnection:
+    closed = 0
+
+    def rollback(self):
+        pass
+
+
+class FakePool:
+    """ThreadedConnectionPool 대체 (연결 없이 생성/종료만 기록)"""
+
+    def __init__(self, minconn, maxconn, host, **kwargs):
+        self.host = host
+        self.closed = False
+
+    def getconn(self):
+        return FakeConnection()
+
+    def putconn(self, conn, close=False):
+        pass
+
+    def closeall(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pools(monkeypatch):
+    monkeypatch.setattr(db_service, "ThreadedConnectionPool", FakePool)
+    monkeypatch.setattr(db_service.db_config, "pool_min", 1)
+    monkeypatch.setattr(db_service.db_config, "pool_max", 4)
+    monkeypatch.setattr(db_service.db_config, "pool_max_profiles", 2)
+    monkeypatch.setattr(DatabaseService, "_pools", {})
+
+
+def _use(monkeypatch, host):
+    params = (host, 5432, "db", "user", "pass")
+    monkeypatch.setattr(DatabaseService, "_connection_params", staticmethod(lambda: params))
+    return DatabaseService.connection()
+
+
+def test_evicts_least_recently_used_pool(pools, monkeypatch):
+    for host in ("a", "b", "a"):
+        with _use(monkeypatch, host):
+            pass
+    evicted = DatabaseService._pools[("b", 5432, "db", "user", "pass")].pool
+
+    with _use(monkeypatch, "c"):
+        pass
+
+    assert [params[0] for params in DatabaseService._pools] == ["a", "c"]
+    assert evicted.closed
+
+
+def test_pool_in_use_is_not_evicted(pools, monkeypatch):
+    with _use(monkeypatch, "a"):
+        with _use(monkeypatch, "b"):
+            with _use(monkeypatch, "c"):
+                assert len(DatabaseService._pools) == 3
+                assert DatabaseService.pool_usage()[("in_use",)] == 3
+    assert not any(profile.pool.closed for profile in DatabaseService._pools.values())
+
+
+def test_pool_usage_counts_checkouts(pools, monkeypatch):
+    with _use(monkeypatch, "a"):
+        assert DatabaseService.pool_usage() == {("in_use",): 1, ("idle",): 0, ("max",): 4}
+    assert DatabaseService.pool_usage() == {("in_use",): 0, ("idle",): 1, ("max",): 4}
@@ -0,0 +1,84 @@
+import pytest
+from flask import Flask, jsonify
+
+from services.http_cache import make_etag, not_modified, with_validators
+
+
+@pytest.fixture
+def version():
+    return {"generation": 1, "modified_at": 1_800_000_000}
+
+
+@pytest.fixture
+def client(version):
+    """과제 목록처럼 (세대, 변경 시각)으로 조건부 응답하는 앱"""
+    app = Flask(__name__)
+
+    @app.route("/items", methods=["GET", "POST"])
+    def items():
+        etag = make_etag("items", version["generation"])
+        cached = not_modified(etag, version["modified_at"])
+        if cached is not None:
+            return cached
+        return with_validators(jsonify({"generation": version["generation"]}), etag, version["modified_at"])
+
+    @app.route("/columns")
+    def columns():
+        cached = not_modified(None, version["modified_at"])
+        if cached is not None:
+            return cached
+        return with_validators(jsonify({}), make_etag("columns"), version["modified_at"])
+
+    return app.test_client()
+
+
+def test_etag_round_trip(client):
+    first = client.get("/items")
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"] == "no-cache"
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    second = client.get("/items", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.headers["ETag"] == etag
+    assert second.data == b""
+
+
+def test_change_in_same_second_is_not_304(client, version):
+    """같은 초 안에 바뀌어도 ETag가 다르면 If-Modified-Since와 상관없이 200"""
+    first = client.get("/items")
+    version["generation"] += 1
+
+    second = client.get("/items", headers={
+        "If-None-Match": first.headers["ETag"],
+        "If-Modified-Since": first.headers["Last-Modified"],
+    })
+    assert second.status_code == 200
+    assert second.get_json() == {"generation": 2}
+
+
+def test_if_modified_since_alone_is_ignored_with_etag(client):
+    first = client.get("/items")
+    second = client.get("/items", headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert second.status_code == 200
+
+
+def test_if_modified_since_without_etag(client, version):
+    first = client.get("/columns")
+    last_modified = first.headers["Last-Modified"]
+    assert client.get("/columns", headers={"If-Modified-Since": last_modified}).status_code == 304
+
+    version["modified_at"] += 1
+    assert client.get("/columns", headers={"If-Modified-Since": last_modified}).status_code == 200
+
+
+def test_only_get_and_head(client):
+    etag = client.get("/items").headers["ETag"]
+    assert client.head("/items", headers={"If-None-Match": etag}).status_code == 304
+    assert client.post("/items", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_make_etag_depends_on_parts():
+    assert make_etag("tasks", 1) == make_etag("tasks", 1)
+    assert make_etag("tasks", 1) != make_etag("tasks", 2)
@@ -0,0 +1,89 @@
+import os
+import time
+import uuid
+
+import pytest
+
+from services import result_store
+from services.result_store import ResultStore
+
+
+class Clock:
+    """services.result_store의 time.time() 대체 (초 단위로 진행)"""
+
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = Clock(1_800_000_000.0)
+    monkeypatch.setattr(result_store, "time", fake)
+    return fake
+
+
+def _touch(store, result_id, used_at):
+    os.utime(store._path(result_id), (used_at, used_at))
+
+
+def test_put_and_get(tmp_path, clock):
+    store = ResultStore(str(tmp_path), max_entries=10, max_bytes=10**6, ttl=60)
+    result_id = store.put({"rows": ["INSERT ..."]})
+
+    assert uuid.UUID(result_id).version == 7
+    assert ResultStore._created_at(store._path(result_id)) == pytest.approx(clock.now, abs=0.001)
+    assert store.get(result_id)["rows"] == ["INSERT ..."]
+
+
+@pytest.mark.parametrize("result_id", ["../etc/passwd", "없음", None, uuid.uuid4().hex.upper()])
+def test_get_invalid_id(tmp_path, clock, result_id):
+    assert ResultStore(str(tmp_path), ttl=60).get(result_id) is None
+
+
+def test_get_expired(tmp_path, clock):
+    store = ResultStore(str(tmp_path), max_entries=10, max_bytes=10**6, ttl=60)
+    result_id = store.put({"rows": []})
+    clock.now += 61
+
+    assert store.get(result_id) is None
+    assert not os.path.exists(store._path(result_id))
+
+
+def test_expired_by_created_at_even_if_recently_used(tmp_path, clock):
+    """만료는 생성 시각 기준 (최근 조회로 mtime이 갱신되어도 삭제)"""
+    store = ResultStore(str(tmp_path), max_entries=10, max_bytes=10**6, ttl=60)
+    old_id = store.put({"rows": []})
+    clock.now += 61
+    _touch(store, old_id, time.time())
+
+    new_id = store.put({"rows": []})
+
+    assert not os.path.exists(store._path(old_id))
+    assert os.path.exists(store._path(new_id))
+
+
+def test_evicts_least_recently_used(tmp_path, clock):
+    store = ResultStore(str(tmp_path), max_entries=2, max_bytes=10**6, ttl=3600)
+    first = store.put({"rows": [1]})
+    second = store.put({"rows": [2]})
+    _touch(store, first, clock.now + 10)
+    _touch(store, second, clock.now)
+
+    third = store.put({"rows": [3]})
+
+    assert os.path.exists(store._path(first))
+    assert not os.path.exists(store._path(second))
+    assert os.path.exists(store._path(third))
+
+
+def test_keeps_just_written_result_over_size_limit(tmp_path, clock):
+    """크기 한도를 넘는 결과도 방금 저장한 결과는 유지하고 나머지를 정리"""
+    store = ResultStore(str(tmp_path), max_entries=10, max_bytes=100, ttl=3600)
+    small = store.put({"rows": ["a"]})
+    large = store.put({"rows": ["x" * 500]})
+
+    assert not os.path.exists(store._path(small))
+    assert store.get(large)["rows"] == ["x" * 500]
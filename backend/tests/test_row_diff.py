@@ -0,0 +1,80 @@
+import pytest
+
+from services.row_diff import diff_rows, map_id, map_row, parse_columns
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("NE1", "NE9"),
+    ("NE1_COLL", "NE9_COLL"),
+    ("SRV-NE1-01", "SRV-NE9-01"),
+    ("NE10", "NE10"),
+    ("NE10_COLL", "NE10_COLL"),
+    ("XNE1", "XNE1"),
+    ("NE1,NE10", "NE9,NE10"),
+])
+def test_map_id_replaces_whole_ne_id_only(value, expected):
+    """NE1은 NE10, XNE1 같은 다른 식별자의 일부를 바꾸지 않는다"""
+    assert map_id(value, "NE1", "NE9") == expected
+
+
+def test_map_row_only_maps_id_columns():
+    colnames = ["ne_id", "coll_id", "file_path"]
+    row = ("NE1", "NE1_COLL", "/data/NE1/cdr")
+    assert map_row(row, colnames, "NE1", "NE9", id_columns={"coll_id"}) == ("NE9", "NE9_COLL", "/data/NE1/cdr")
+
+
+def test_parse_columns():
+    assert parse_columns(" Coll_ID, ,file_path ") == {"coll_id", "file_path"}
+    assert parse_columns(None) == set()
+
+
+def test_diff_rows_by_primary_key():
+    colnames = ["ne_id", "seq", "name", "updated_at"]
+    source = [
+        ("NE1", 1, "수집", "2026-01-01"),
+        ("NE1", 2, "전송", "2026-01-01"),
+        ("NE1", 3, "신규", "2026-01-01"),
+    ]
+    target = [
+        ("NE9", 1, "수집", "2025-12-31"),
+        ("NE9", 2, "전송(구)", "2025-12-31"),
+    ]
+
+    diff = diff_rows(colnames, source, target, ["ne_id", "seq"], "NE1", "NE9", ignore_columns={"updated_at"})
+
+    assert diff.key_columns == ["ne_id", "seq"]
+    assert diff.inserts == [("NE1", 3, "신규", "2026-01-01")]
+    # UPDATE 행은 신규 NE 기준 값, 변경 컬럼은 ignore_columns 제외
+    assert diff.updates == [(("NE9", 2, "전송", "2026-01-01"), [2])]
+    assert diff.unchanged == 1
+
+
+def test_diff_rows_without_key_compares_whole_row():
+    colnames = ["ne_id", "name"]
+    source = [("NE1", "a"), ("NE1", "b")]
+    target = [("NE9", "a")]
+
+    diff = diff_rows(colnames, source, target, [], "NE1", "NE9")
+
+    assert diff.key_columns == colnames
+    assert diff.inserts == [("NE1", "b")]
+    assert diff.updates == []
+    assert diff.unchanged == 1
+
+
+def test_diff_rows_missing_key_column_falls_back_to_whole_row():
+    diff = diff_rows(["ne_id", "name"], [("NE1", "a")], [("NE9", "a")], ["ne_id", "seq"], "NE1", "NE9")
+    assert diff.key_columns == ["ne_id", "name"]
+    assert diff.unchanged == 1
+
+
+def test_diff_rows_id_columns_match_mapped_keys():
+    """id_columns의 기준 NE ID를 치환한 값으로 신규 NE 행을 찾는다"""
+    colnames = ["coll_id", "ne_id", "host"]
+    source = [("NE1_COLL", "NE1", "10.0.0.1"), ("NE10_COLL", "NE10", "10.0.0.2")]
+    target = [("NE9_COLL", "NE9", "10.0.0.9")]
+
+    diff = diff_rows(colnames, source, target, ["coll_id"], "NE1", "NE9", id_columns={"coll_id"})
+
+    assert diff.updates == [(("NE9_COLL", "NE9", "10.0.0.1"), [2])]
+    assert diff.inserts == [("NE10_COLL", "NE10", "10.0.0.2")]
@@ -0,0 +1,99 @@
+import sqlite3
+from datetime import date, datetime, time, timedelta, timezone
+
+import pytest
+
+from services.row_transformer import RowTransformer, pg_text, quote_ident, quote_literal
+from services.sql_service import SQLService
+
+COLUMNS = [("ne_id", "varchar"), ("seq", "numeric"), ("path", "varchar"), ("exp_dt", "timestamp"),
+           ("reg_dt", "timestamp"), ("memo", "text"), ("owner", "varchar"), ("rate", "numeric")]
+
+FORM = {
+    "ne_id_option": "default",
+    "seq_option": "default",
+    "path_option": "replace", "path_value1": "NE1", "path_value2": "NE9",
+    "exp_dt_option": "default",
+    "reg_dt_option": "now",
+    "memo_option": "default",
+    "owner_option": "user_input", "owner_value": "admin",
+    "rate_option": "user_input", "rate_value": "1.5",
+}
+
+ROWS = [
+    ("NE1", 1, "/data/NE1/cdr", "2026-01-02 03:04:05", "", "비고", "x", 0),
+    ("NE1", 2.5, None, None, None, None, None, None),
+    ("NE1", None, "", "2026-01-02", None, "", None, None),
+]
+
+
+def _render_sql_template(columns, form, rows):
+    """SQL 템플릿 방식 식을 SQLite로 평가 (PostgreSQL ::text 캐스트만 제거, 값은 ::text 표기 문자열)"""
+    expression = SQLService.custom_insert_expression("sch", "tbl", columns, form).replace("::text", "")
+    conn = sqlite3.connect(":memory:")
+    conn.execute(f"CREATE TABLE tbl ({', '.join(name for name, _ in columns)})")
+    conn.executemany(f"INSERT INTO tbl VALUES ({', '.join('?' for _ in columns)})", rows)
+    return [row[0] for row in conn.execute(f"SELECT {expression} FROM tbl ORDER BY rowid")]
+
+
+def test_render_matches_sql_template():
+    """python 방식 INSERT문은 SQL 템플릿 방식과 같다"""
+    transformer = RowTransformer("sch", "tbl", COLUMNS, FORM)
+    positions = [name for name, _ in COLUMNS]
+    projected = [tuple(row[positions.index(name)] for name in transformer.columns) for row in ROWS]
+
+    assert transformer.render(projected) == _render_sql_template(COLUMNS, FORM, ROWS)
+
+
+def test_projection_skips_fixed_columns():
+    transformer = RowTransformer("sch", "tbl", COLUMNS, FORM)
+    assert transformer.columns == ["ne_id", "seq", "path", "exp_dt", "memo"]
+    assert transformer.query("WHERE ne_id = 'NE1';") == (
+        'SELECT "ne_id", "seq", "path", "exp_dt", "memo" FROM "sch"."tbl"\nWHERE ne_id = \'NE1\''
+    )
+
+
+def test_all_fixed_columns_selects_constant():
+    form = {"reg_dt_option": "now"}
+    transformer = RowTransformer("sch", "tbl", [("reg_dt", "timestamp")], form)
+    assert transformer.query() == 'SELECT 1 FROM "sch"."tbl"'
+    assert transformer.render([(1,), (1,)]) == ["INSERT INTO sch.tbl VALUES(NOW());"] * 2
+
+
+def test_render_escapes_quotes():
+    form = {"name_option": "user_input", "name_value": "O'Brien"}
+    transformer = RowTransformer("sch", "tbl", [("memo", "varchar"), ("name", "varchar")], form)
+    assert transformer.render([("it's",)]) == ["INSERT INTO sch.tbl VALUES('it''s','O''Brien');"]
+
+
+def test_invalid_numeric_input_is_null():
+    form = {"seq_option": "user_input", "seq_value": "abc"}
+    transformer = RowTransformer("sch", "tbl", [("seq", "numeric")], form)
+    assert transformer.render([()]) == ["INSERT INTO sch.tbl VALUES(NULL);"]
+
+
+def test_no_columns():
+    with pytest.raises(ValueError):
+        RowTransformer("sch", "tbl", [], {})
+
+
+@pytest.mark.parametrize("value, expected", [
+    (True, "true"),
+    ({"a": "가"}, '{"a": "가"}'),
+    (date(2026, 1, 2), "2026-01-02"),
+    (time(1, 2, 3), "01:02:03"),
+    (datetime(2026, 1, 2, 3, 4, 5), "2026-01-02 03:04:05"),
+    (datetime(2026, 1, 2, 3, 4, 5, 120000), "2026-01-02 03:04:05.120000"),
+    (datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=9))), "2026-01-02 03:04:05+09"),
+    (datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc), "2026-01-02 03:04:05+00"),
+    (datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone(-timedelta(hours=5, minutes=30))), "2026-01-02 03:04:05-05:30"),
+    (time(1, 2, 3, tzinfo=timezone(timedelta(hours=9))), "01:02:03+09"),
+])
+def test_pg_text(value, expected):
+    """PostgreSQL ::text 표기 (timestamptz 시간대는 +09, 분이 있으면 +05:30)"""
+    assert pg_text(value) == expected
+
+
+def test_quote_helpers():
+    assert quote_ident('a"b') == '"a""b"'
+    assert quote_literal("a'b") == "'a''b'"
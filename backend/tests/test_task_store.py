@@ -0,0 +1,96 @@
+import json
+import sqlite3
+
+import pytest
+
+from services.task_store import FileTaskStore, SQLiteTaskStore, DuplicateTaskError
+
+
+def _task(task_id, title="과제", sql="SELECT 1", created_at="2026-01-01T00:00:00"):
+    return {
+        "task_id": task_id, "title": title, "content": f"{title} 내용", "sql": sql,
+        "author": "tester", "created_at": created_at, "updated_at": created_at,
+    }
+
+
+@pytest.fixture
+def sqlite_store(tmp_path):
+    return SQLiteTaskStore(str(tmp_path / "tasks.db"))
+
+
+def _write_task_files(directory, tasks):
+    directory.mkdir(exist_ok=True)
+    for task in tasks:
+        (directory / f"{task['task_id']}.json").write_text(json.dumps(task, ensure_ascii=False), encoding="utf-8")
+
+
+def test_import_counts_only_new_tasks(sqlite_store, tmp_path):
+    """가져온 과제 수는 tasks 행 수만 센다 (검색 색인/세대 트리거 쓰기 제외)"""
+    _write_task_files(tmp_path / "json", [_task(f"DR-2026-0000{i}") for i in range(3)])
+
+    assert sqlite_store.import_from_directory(str(tmp_path / "json")) == 3
+    assert sqlite_store.import_from_directory(str(tmp_path / "json")) == 0
+    assert sqlite_store.count() == 3
+
+
+def test_import_missing_directory(sqlite_store, tmp_path):
+    assert sqlite_store.import_from_directory(str(tmp_path / "없음")) == 0
+
+
+def test_duplicate_insert(sqlite_store):
+    sqlite_store.insert(_task("DR-2026-00001"))
+    with pytest.raises(DuplicateTaskError):
+        sqlite_store.insert(_task("DR-2026-00001"))
+
+
+def test_search_after_delete_and_reinsert(sqlite_store):
+    """삭제 후 다시 등록해도 검색 색인이 tasks 행과 맞는다 (content_rowid=id)"""
+    sqlite_store.insert(_task("DR-2026-00001", title="가입자 과금"))
+    sqlite_store.insert(_task("DR-2026-00002", title="수집 서버"))
+    assert sqlite_store.delete("DR-2026-00001")
+    sqlite_store.insert(_task("DR-2026-00003", title="가입자 정보"))
+
+    results, total = sqlite_store.search("가입자", limit=10)
+    assert total == 1
+    assert [result["task_id"] for result in results] == ["DR-2026-00003"]
+
+
+def test_legacy_table_is_rebuilt(tmp_path):
+    """id 컬럼이 없는 이전 tasks 테이블은 rowid를 id로 옮겨 재생성한다"""
+    db_path = str(tmp_path / "tasks.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE tasks (task_id TEXT PRIMARY KEY, title TEXT NOT NULL, content TEXT NOT NULL DEFAULT '',
+                            sql TEXT NOT NULL DEFAULT '', author TEXT NOT NULL DEFAULT '',
+                            created_at TEXT NOT NULL, updated_at TEXT NOT NULL)
+    """)
+    task = _task("DR-2026-00001", title="레거시 과제")
+    conn.execute("INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?)", tuple(task.values()))
+    conn.commit()
+    conn.close()
+
+    store = SQLiteTaskStore(db_path)
+    assert store.get("DR-2026-00001")["title"] == "레거시 과제"
+    results, total = store.search("레거시", limit=10)
+    assert total == 1 and results[0]["task_id"] == "DR-2026-00001"
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("가입자 과금", '"가입자"* "과금"*'),
+    ('tb_cdr" OR 1', '"tb_cdr"* "OR"* "1"*'),
+    ("NEAR(a b)", '"NEAR"* "a"* "b"*'),
+    ("  ", ""),
+    (None, ""),
+])
+def test_match_expression_quotes_terms(query, expected):
+    """검색어는 단어별로 큰따옴표로 감싸 FTS5 연산자로 해석되지 않는다"""
+    assert SQLiteTaskStore._match_expression(query) == expected
+
+
+def test_file_store_roundtrip(tmp_path):
+    store = FileTaskStore(str(tmp_path))
+    store.insert(_task("DR-2026-00001"))
+    assert store.exists("DR-2026-00001")
+    assert store.count() == 1
+    assert store.delete("DR-2026-00001")
+    assert not store.exists("DR-2026-00001")
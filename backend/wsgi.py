@@ -0,0 +1,11 @@
+"""프로덕션 WSGI 진입점
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+gunicorn.conf.py는 preload_app으로 마스터 프로세스에서 앱을 한 번 적재하고
+(기본 APP_WARMUP=true), 워커 fork 후 post_fork 훅에서 연결만 새로 만든다.
+"""
+from app import create_app, warmup_option
+from config import app_config
+
+app = create_app(warmup=warmup_option(app_config.warmup))
@@ -64,9 +64,16 @@ const AiSqlGenerator = () => {
           steps.map(step => ({ ...step, status: 'completed' }))
         );
 
-        toast.success(
-          `AI SQL 생성이 완료되었습니다! (총 ${result.data.final_insert_count}개 INSERT문)`
-        );
+        if (result.data.converted === false) {
+          // ABC Lab 변환 실패 시 원본 INSERT문 반환
+          toast.error(
+            `ABC Lab 변환에 실패해 원본 INSERT문을 반환했습니다. (총 ${result.data.final_insert_count}개)`
+          );
+        } else {
+          toast.success(
+            `AI SQL 생성이 완료되었습니다! (총 ${result.data.final_insert_count}개 INSERT문)`
+          );
+        }
       }
     } catch (error) {
       // 에러 시 모든 단계를 실패로 표시
@@ -84,7 +84,8 @@ const AiSqlResults = ({ results, sourceNeId, targetNeId, onBackToForm }) => {
     setIsLoadingRecommend(true);
     try {
       const response = await axios.post('/api/v1/tasks/recommend', {
-        sql: getFullSql()
+        sql: getFullSql(),
+        include_sql: true
       });
       
       if (response.data.success) {